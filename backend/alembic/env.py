@@ -21,6 +21,16 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 # SQLModel metadata hedefi (autogenerate bunu kullanır)
 target_metadata = SQLModel.metadata
 
+# Migration'la yönetilen, modelde karşılığı olmayan arama nesneleri
+# (bkz. versions/e71b0d4c5a93_task_search_index.py); autogenerate bunları silmeye kalkmasın
+_UNMODELED = {"search_vector", "ix_tasks_search_vector"}
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if reflected and compare_to is None:
+        if name in _UNMODELED or (type_ == "table" and name.startswith("tasks_fts")):
+            return False
+    return True
+
 def run_migrations_offline() -> None:
     """DB bağlantısı açmadan SQL script üretmek için."""
     url = config.get_main_option("sqlalchemy.url")
@@ -29,6 +39,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         compare_type=True,  # tip değişikliklerini de karşılaştır
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -45,6 +56,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,  # tip değişikliklerini de karşılaştır
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
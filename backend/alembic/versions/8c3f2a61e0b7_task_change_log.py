@@ -0,0 +1,41 @@
+"""task change log
+
+Revision ID: 8c3f2a61e0b7
+Revises: 5b1e0c7d9a42
+Create Date: 2026-10-18 15:21:09.442871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # AutoString için gerekli
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f2a61e0b7'
+down_revision: Union[str, Sequence[str], None] = '5b1e0c7d9a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Değişiklik akışı (GET /tasks/changes): task başına en fazla bir satır (sıkıştırılmış)
+    op.create_table(
+        'task_changes',
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True,
+    )
+    op.create_index(op.f('ix_task_changes_task_id'), 'task_changes', ['task_id'], unique=False)
+    # Mevcut task'ler de akışta görünsün (ilk senkron since=0 ile tüm tabloyu alır)
+    op.execute('INSERT INTO task_changes (task_id) SELECT id FROM tasks ORDER BY id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_changes_task_id'), table_name='task_changes')
+    op.drop_table('task_changes')
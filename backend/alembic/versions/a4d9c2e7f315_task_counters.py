@@ -0,0 +1,48 @@
+"""task counters
+
+Revision ID: a4d9c2e7f315
+Revises: 8c3f2a61e0b7
+Create Date: 2026-10-18 17:02:44.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # AutoString için gerekli
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9c2e7f315'
+down_revision: Union[str, Sequence[str], None] = '8c3f2a61e0b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GET /tasks/stats: (assignee, status) başına sayaç; atanmamışlar assignee_key=0
+    # taskstatus enum'u tasks tablosuyla birlikte zaten oluşturuldu (Postgres'te tekrar yaratma)
+    status_type = sa.Enum('TODO', 'IN_PROGRESS', 'DONE', name='taskstatus').with_variant(
+        postgresql.ENUM('TODO', 'IN_PROGRESS', 'DONE', name='taskstatus', create_type=False),
+        'postgresql',
+    )
+    op.create_table(
+        'task_counters',
+        sa.Column('assignee_key', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('status', status_type, nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('assignee_key', 'status'),
+    )
+    # Mevcut task'lerden ilk değerler (sonrasında repository'ler artımlı günceller)
+    op.execute(
+        'INSERT INTO task_counters (assignee_key, status, count) '
+        'SELECT COALESCE(assignee_id, 0), status, COUNT(*) FROM tasks '
+        'GROUP BY COALESCE(assignee_id, 0), status'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_counters')
@@ -0,0 +1,36 @@
+"""task change cursor position
+
+Revision ID: b3e8d5f1c2a6
+Revises: e71b0d4c5a93
+Create Date: 2026-10-18 21:05:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # AutoString için gerekli
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d5f1c2a6'
+down_revision: Union[str, Sequence[str], None] = 'e71b0d4c5a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL'de değişiklik akışının cursor'u: yazan transaction'ın id'si
+    # (bkz. src/worktracker/repositories/changes.py); SQLite'ta boş kalır
+    op.add_column('task_changes', sa.Column('cursor_pos', sa.BigInteger(), nullable=True))
+    op.create_index(op.f('ix_task_changes_cursor_pos'), 'task_changes', ['cursor_pos'], unique=False)
+    if op.get_context().dialect.name == 'postgresql':
+        # Mevcut satırlar bitmiş transaction'lardan: konumları seq (yeni konumların hepsinden küçük)
+        op.execute('UPDATE task_changes SET cursor_pos = seq')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_changes_cursor_pos'), table_name='task_changes')
+    op.drop_column('task_changes', 'cursor_pos')
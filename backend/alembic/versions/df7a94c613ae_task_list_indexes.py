@@ -0,0 +1,35 @@
+"""task list indexes
+
+Revision ID: df7a94c613ae
+Revises: 407cf202b5fa
+Create Date: 2026-10-18 10:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # AutoString için gerekli
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'df7a94c613ae'
+down_revision: Union[str, Sequence[str], None] = '407cf202b5fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset paginasyon "WHERE ... AND id > :cursor ORDER BY id" yaptığı için
+    # her index'in sonunda id var; böylece filtre + sıralama tek index taramasıyla biter.
+    op.create_index('ix_tasks_assignee_id_id', 'tasks', ['assignee_id', 'id'], unique=False)
+    op.create_index('ix_tasks_status_id', 'tasks', ['status', 'id'], unique=False)
+    op.create_index('ix_tasks_assignee_id_status_id', 'tasks', ['assignee_id', 'status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assignee_id_status_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_id', table_name='tasks')
+    op.drop_index('ix_tasks_assignee_id_id', table_name='tasks')
@@ -0,0 +1,79 @@
+"""task search index
+
+Revision ID: e71b0d4c5a93
+Revises: a4d9c2e7f315
+Create Date: 2026-10-18 18:40:12.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # AutoString için gerekli
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71b0d4c5a93'
+down_revision: Union[str, Sequence[str], None] = 'a4d9c2e7f315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GET /tasks/search index'leri (bkz. src/worktracker/repositories/search.py).
+# Modelde karşılıkları yok; env.py autogenerate'in bunları silmeye kalkmasını engeller.
+
+# title ağırlığı A, description B; 'simple' repositories/search.py'deki TS_CONFIG ile aynı
+_TSVECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+_SQLITE_UP = [
+    # External-content FTS5: metin tasks'ta kalır, sadece index tutulur
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    # Sadece metin değişince (status/assignee update'leri index'e dokunmaz)
+    "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    # Mevcut task'leri index'le
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        # STORED generated kolon: her yazmada DB hesaplar, uygulama kodu dokunmaz
+        op.add_column(
+            'tasks',
+            sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(_TSVECTOR, persisted=True)),
+        )
+        op.create_index(
+            'ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False, postgresql_using='gin'
+        )
+    elif dialect == 'sqlite':
+        for stmt in _SQLITE_UP:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_tasks_search_vector', table_name='tasks')
+        op.drop_column('tasks', 'search_vector')
+    elif dialect == 'sqlite':
+        for trigger in ('tasks_fts_au', 'tasks_fts_ad', 'tasks_fts_ai'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS tasks_fts')
@@ -0,0 +1,10 @@
+"""
+Performans benchmark'ları (uygulama paketine dahil değil; backend/ dizininden çalıştırılır):
+
+    PYTHONPATH=src python -m benchmarks.http_load --help    # REST API yük/gecikme
+    PYTHONPATH=src python -m benchmarks.ws_fanout --help    # WebSocket fan-out ölçeklenmesi
+    PYTHONPATH=src python -m benchmarks.report new.json baseline.json
+
+Sonuçlar benchmarks/results/ altına JSON olarak yazılır (git'e girmez); karşılaştırma
+için saklanan baseline'lar benchmarks/baselines/ altındadır.
+"""
@@ -0,0 +1,429 @@
+"""
+REST API yük ve gecikme benchmark'ı (backend/ dizininde):
+
+    PYTHONPATH=src python -m benchmarks.http_load --db sqlite --users 200 --tasks 20000 \\
+        --mix mixed --concurrency 32 --duration 30
+
+Her koşuda hedef veritabanı sıfırlanıp sabit seed'le doldurulur (bkz. seed.py), gerçek
+uygulama (worktracker.main:app) ayağa kaldırılır ve eşzamanlı istemciler seçilen
+operasyon karışımını uygular. Sonuç JSON olarak benchmarks/results/ altına yazılır;
+aynı senaryonun baseline'ı varsa karşılaştırılır ve regresyonda 1 ile çıkılır.
+
+  --server uvicorn  (varsayılan) ayrı süreçte uvicorn, gerçek HTTP/TCP; --workers N
+  --server asgi     süreç içi (httpx.ASGITransport): ağ yok, yük üretici ile uygulama aynı
+                    event loop'u paylaşır; sadece hızlı karşılaştırma/CI için
+  --rate R          açık döngü: saniyede R istek sabit hızla; gecikme planlanan başlangıçtan
+                    ölçülür (sunucu geride kalırsa bekleme de gecikmeye dahil)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .report import RESULT_VERSION, check_against_baseline, environment, write_result
+from .seed import BACKEND_DIR, database_url, seed_database, task_status, task_title
+from .stats import latency_summary
+
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+BASELINES_DIR = BACKEND_DIR / "benchmarks" / "baselines"
+
+# Operasyon karışımları (ağırlıklar); --mix "get_task=5,update_task=1" ile özel karışım da verilebilir
+MIXES: Dict[str, Dict[str, int]] = {
+    "read": {"get_task": 45, "list_tasks": 25, "get_user": 15, "list_user_tasks": 15},
+    "write": {"create_task": 35, "update_task": 45, "create_user": 10, "update_user": 10},
+    "mixed": {
+        "get_task": 30,
+        "list_tasks": 20,
+        "get_user": 10,
+        "list_user_tasks": 10,
+        "update_task": 15,
+        "create_task": 10,
+        "create_user": 3,
+        "update_user": 2,
+    },
+}
+
+PAGE_SIZE = 50
+
+# (method, path, json gövdesi)
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+@dataclass
+class LoadState:
+    """Koşu boyunca bilinen id aralıkları (create'ler büyütür)."""
+
+    users: int
+    tasks: int
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    created_users: int = 0
+
+    def user_id(self, rng: random.Random) -> int:
+        return rng.randint(1, self.users)
+
+    def task_id(self, rng: random.Random) -> int:
+        return rng.randint(1, self.tasks)
+
+
+def _get_task(state: LoadState, rng: random.Random) -> Request:
+    return "GET", f"/tasks/{state.task_id(rng)}", None
+
+
+def _list_tasks(state: LoadState, rng: random.Random) -> Request:
+    # Filtresiz, status'a ya da assignee'ye göre ilk sayfa
+    choice = rng.random()
+    query = f"?limit={PAGE_SIZE}"
+    if choice < 0.3:
+        query += f"&status={task_status(rng).value}"
+    elif choice < 0.6:
+        query += f"&assignee_id={state.user_id(rng)}"
+    return "GET", f"/tasks{query}", None
+
+
+def _get_user(state: LoadState, rng: random.Random) -> Request:
+    return "GET", f"/users/{state.user_id(rng)}", None
+
+
+def _list_user_tasks(state: LoadState, rng: random.Random) -> Request:
+    return "GET", f"/users/{state.user_id(rng)}/tasks?limit={PAGE_SIZE}", None
+
+
+def _create_task(state: LoadState, rng: random.Random) -> Request:
+    body: Dict[str, Any] = {"title": task_title(rng), "status": task_status(rng).value}
+    if rng.random() < 0.9:
+        body["assignee_id"] = state.user_id(rng)
+    return "POST", "/tasks", body
+
+
+def _update_task(state: LoadState, rng: random.Random) -> Request:
+    # If-Match'siz (koşulsuz) update: çakışma 412'leri ölçümü bozmasın
+    body: Dict[str, Any] = {"status": task_status(rng).value}
+    if rng.random() < 0.3:
+        body["assignee_id"] = state.user_id(rng)
+    return "PATCH", f"/tasks/{state.task_id(rng)}", body
+
+
+def _create_user(state: LoadState, rng: random.Random) -> Request:
+    state.created_users += 1
+    email = f"new-{state.run_id}-{state.created_users}@bench.example.com"
+    return "POST", "/users", {"email": email, "full_name": "Bench New User"}
+
+
+def _update_user(state: LoadState, rng: random.Random) -> Request:
+    return "PATCH", f"/users/{state.user_id(rng)}", {"full_name": f"Bench User {rng.randint(1, 10**6)}"}
+
+
+OPERATIONS: Dict[str, Callable[[LoadState, random.Random], Request]] = {
+    "get_task": _get_task,
+    "list_tasks": _list_tasks,
+    "get_user": _get_user,
+    "list_user_tasks": _list_user_tasks,
+    "create_task": _create_task,
+    "update_task": _update_task,
+    "create_user": _create_user,
+    "update_user": _update_user,
+}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    if value in MIXES:
+        return dict(MIXES[value])
+    mix: Dict[str, int] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r} (known: {', '.join(OPERATIONS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+@dataclass
+class Sample:
+    op: str
+    seconds: float
+    ok: bool
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    state: LoadState,
+    mix: Dict[str, int],
+    rng: random.Random,
+    *,
+    record_from: float,
+    deadline: float,
+    interval: Optional[float],
+    samples: List[Sample],
+) -> None:
+    names, weights = list(mix), list(mix.values())
+    next_start = time.perf_counter()
+    while True:
+        if interval is not None:
+            # Açık döngü: bir sonraki planlanan zamana kadar bekle (gerideysek beklemeden gönder)
+            delay = next_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            start = next_start
+            next_start += interval
+        else:
+            start = time.perf_counter()
+        if start >= deadline:
+            return
+        op = rng.choices(names, weights)[0]
+        method, path, body = OPERATIONS[op](state, rng)
+        try:
+            response = await client.request(method, path, json=body)
+            ok = response.status_code < 400
+            if ok and op == "create_task":
+                state.tasks = max(state.tasks, response.json()["id"])
+        except httpx.HTTPError:
+            ok = False
+        if start >= record_from:
+            samples.append(Sample(op, time.perf_counter() - start, ok))
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    state: LoadState,
+    mix: Dict[str, int],
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    rate: Optional[float],
+    seed: int,
+) -> List[Sample]:
+    """concurrency istemciyi warmup + duration boyunca koşturur; sadece ölçüm penceresini kaydeder."""
+    samples: List[Sample] = []
+    begin = time.perf_counter()
+    record_from = begin + warmup
+    deadline = record_from + duration
+    interval = concurrency / rate if rate else None
+    workers = [
+        _worker(
+            client,
+            state,
+            mix,
+            random.Random(seed * 1000 + i),
+            record_from=record_from,
+            deadline=deadline,
+            interval=interval,
+            samples=samples,
+        )
+        for i in range(concurrency)
+    ]
+    await asyncio.gather(*workers)
+    return samples
+
+
+def summarize(samples: List[Sample], duration: float) -> Dict[str, Any]:
+    def section(items: List[Sample]) -> Dict[str, Any]:
+        return {
+            "requests": len(items),
+            "errors": sum(1 for s in items if not s.ok),
+            "throughput_rps": round(len(items) / duration, 2),
+            "latency_ms": latency_summary([s.seconds for s in items]),
+        }
+
+    by_op: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_op.setdefault(sample.op, []).append(sample)
+    return {
+        "summary": section(samples),
+        "operations": {op: section(items) for op, items in sorted(by_op.items())},
+    }
+
+
+# ---------- uygulamayı ayağa kaldırma ----------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_client(
+    app_env: Dict[str, str], *, workers: int, concurrency: int
+) -> AsyncIterator[httpx.AsyncClient]:
+    port = _free_port()
+    env = dict(os.environ, **app_env)
+    env["PYTHONPATH"] = str(BACKEND_DIR / "src")
+    command = [
+        sys.executable, "-m", "uvicorn", "worktracker.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--no-access-log", "--log-level", "warning",
+    ]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30
+        ) as client:
+            await _wait_ready(client, server)
+            yield client
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+async def _wait_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+@asynccontextmanager
+async def asgi_client(app_env: Dict[str, str]) -> AsyncIterator[httpx.AsyncClient]:
+    # Settings import anında okunur: ortam uygulama import edilmeden önce kurulmalı
+    os.environ.update(app_env)
+    from worktracker.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30) as client:
+            yield client
+
+
+# ---------- CLI ----------
+
+
+def _parse_env(values: List[str]) -> Dict[str, str]:
+    env = {}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--app-env expects KEY=VALUE, got {value!r}")
+        env[key] = val
+    return env
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="benchmarks.http_load", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--mix", default="mixed", help=f"{', '.join(MIXES)} or op=weight,...")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before measuring")
+    parser.add_argument("--rate", type=float, default=None, help="open-loop requests per second")
+    parser.add_argument("--server", choices=("uvicorn", "asgi"), default="uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra application settings, e.g. CACHE_ENABLED=false")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help="baseline to compare with (default: baselines/http-<db>-<mix>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    return parser
+
+
+async def _run(args: argparse.Namespace, mix: Dict[str, int], app_env: Dict[str, str]) -> List[Sample]:
+    state = LoadState(users=args.users, tasks=args.tasks)
+    options = dict(
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        rate=args.rate,
+        seed=args.seed,
+    )
+    if args.server == "asgi":
+        async with asgi_client(app_env) as client:
+            return await run_load(client, state, mix, **options)
+    async with uvicorn_client(app_env, workers=args.workers, concurrency=args.concurrency) as client:
+        return await run_load(client, state, mix, **options)
+
+
+def _print_table(result: Dict[str, Any]) -> None:
+    print(f"{'operation':<18} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(result["operations"].items()) + [("TOTAL", result["summary"])]
+    for name, s in rows:
+        lat = s["latency_ms"]
+        print(
+            f"{name:<18} {s['requests']:>9} {s['errors']:>7} {s['throughput_rps']:>9.1f} "
+            f"{lat['p50']:>9.2f} {lat['p95']:>9.2f} {lat['p99']:>9.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    mix = parse_mix(args.mix)
+    work_dir = Path(tempfile.mkdtemp(prefix="worktracker-bench-"))
+    url = database_url(args.db, work_dir)
+
+    print(f"seeding {args.db}: {args.users} users x {args.tasks} tasks", file=sys.stderr)
+    seed_database(url, users=args.users, tasks=args.tasks, seed=args.seed)
+
+    app_env = {"DATABASE_URL": url, **_parse_env(args.app_env)}
+    print(f"running {args.mix} for {args.duration}s (+{args.warmup}s warmup), "
+          f"concurrency={args.concurrency}", file=sys.stderr)
+    samples = asyncio.run(_run(args, mix, app_env))
+
+    result = {
+        "benchmark": "http",
+        "version": RESULT_VERSION,
+        "environment": environment(),
+        "config": {
+            "db": args.db,
+            "users": args.users,
+            "tasks": args.tasks,
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "rate": args.rate,
+            "server": args.server,
+            "workers": args.workers,
+            "seed": args.seed,
+            "app_env": {k: v for k, v in app_env.items() if k != "DATABASE_URL"},
+        },
+        **summarize(samples, args.duration),
+    }
+    _print_table(result)
+
+    scenario = f"http-{args.db}-{args.mix if args.mix in MIXES else 'custom'}"
+    output = args.output or RESULTS_DIR / f"{scenario}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_result(output, result)
+    print(f"result written to {output}", file=sys.stderr)
+
+    baseline = args.baseline or BASELINES_DIR / f"{scenario}.json"
+    if args.save_baseline:
+        write_result(baseline, result)
+        print(f"baseline stored at {baseline}", file=sys.stderr)
+        return 0
+    return check_against_baseline(result, baseline, threshold=args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
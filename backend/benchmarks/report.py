@@ -0,0 +1,168 @@
+"""
+Benchmark sonuç dosyaları ve baseline karşılaştırması.
+
+    PYTHONPATH=src python -m benchmarks.report new.json baseline.json --threshold 10
+
+Aynı senaryonun iki koşusunu karşılaştırır: throughput/teslim oranı düşüşü ya da p95/p99,
+bağlantı başına bellek/CPU artışı eşiği (%) aşan satırlar REGRESSION olarak işaretlenir ve komut 1 ile çıkar (CI'da kullanılabilir).
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Sonuç dosyası şeması; alanlar değişirse artırılır (eski baseline'larla karşılaştırma uyarır)
+RESULT_VERSION = 1
+
+# Yüksek olması iyi olan metrikler (diğerleri gecikmedir: düşük iyi)
+_HIGHER_IS_BETTER = {"throughput_rps", "delivered_ratio"}
+# Karşılaştırılan metrikler (her sonuç dosyasında olmayabilir)
+_COMPARED = (
+    "throughput_rps", "p95", "p99", "delivered_ratio", "bytes_per_connection", "cpu_ms_per_connection",
+)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def environment() -> Dict[str, Any]:
+    """Sonucun üretildiği ortam: karşılaştırmada farklı makine/sürüm uyarısı için."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def write_result(path: Path, result: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_result(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _metrics(section: Dict[str, Any]) -> Dict[str, float]:
+    # {"throughput_rps": .., "latency_ms": {"p95": ..}} -> düz metrik sözlüğü
+    flat = {k: v for k, v in section.items() if isinstance(v, (int, float))}
+    flat.update(section.get("latency_ms", {}))
+    return {k: v for k, v in flat.items() if k in _COMPARED}
+
+
+def _sections(result: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    yield "summary", result.get("summary", {})
+    for name, section in sorted(result.get("operations", {}).items()):
+        yield name, section
+    # ws_fanout: istemci sayısı adımları ("clients=1000")
+    for name, section in result.get("steps", {}).items():
+        yield name, section
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], *, threshold: float = 10.0
+) -> List[Dict[str, Any]]:
+    """
+    Bölüm (summary, operasyon, adım) ve metrik başına değişim (%). regression: metrik
+    kötü yönde threshold yüzdesinden fazla değişmiş.
+    """
+    base_sections = dict(_sections(baseline))
+    rows = []
+    for name, section in _sections(current):
+        base = base_sections.get(name)
+        if base is None:
+            continue
+        base_metrics = _metrics(base)
+        for metric, value in _metrics(section).items():
+            old = base_metrics.get(metric)
+            if old is None:
+                continue
+            change = (value - old) / old * 100 if old else 0.0
+            worse = -change if metric in _HIGHER_IS_BETTER else change
+            rows.append(
+                {
+                    "section": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": value,
+                    "change_pct": round(change, 1),
+                    "regression": worse > threshold,
+                }
+            )
+    return rows
+
+
+def config_mismatch(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Farklı senaryo ayarları: karşılaştırma anlamlı olmayabilir."""
+    cur, base = current.get("config", {}), baseline.get("config", {})
+    warnings = [
+        f"config.{key}: baseline={base.get(key)!r} current={cur.get(key)!r}"
+        for key in sorted(cur.keys() | base.keys())
+        if cur.get(key) != base.get(key)
+    ]
+    if current.get("version") != baseline.get("version"):
+        warnings.append("result file versions differ")
+    cur_env, base_env = current.get("environment", {}), baseline.get("environment", {})
+    if cur_env.get("platform") != base_env.get("platform"):
+        warnings.append("results come from different platforms")
+    return warnings
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'section':<24} {'metric':<22} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['section']:<24} {row['metric']:<22} {row['baseline']:>12.3f} "
+            f"{row['current']:>12.3f} {row['change_pct']:>+7.1f}%{flag}"
+        )
+    return "\n".join(lines)
+
+
+def check_against_baseline(
+    result: Dict[str, Any], baseline_path: Optional[Path], *, threshold: float
+) -> int:
+    """Koşu sonunda baseline varsa karşılaştırır, tabloyu yazar; regresyon varsa 1."""
+    if baseline_path is None or not baseline_path.exists():
+        return 0
+    baseline = load_result(baseline_path)
+    for warning in config_mismatch(result, baseline):
+        print(f"warning: {warning}", file=sys.stderr)
+    rows = compare(result, baseline, threshold=threshold)
+    print(format_comparison(rows))
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {threshold}% vs {baseline_path}", file=sys.stderr)
+        return 1
+    print(f"no regressions over {threshold}% vs {baseline_path}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.report", description="Compare two benchmark results")
+    parser.add_argument("current", type=Path)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed change in percent")
+    args = parser.parse_args(argv)
+    return check_against_baseline(load_result(args.current), args.baseline, threshold=args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
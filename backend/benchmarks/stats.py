@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Sequence
+
+# Gecikme özetleri: yüzdelikler en yakın sıra (nearest-rank) yöntemiyle hesaplanır;
+# interpolasyon yok, raporlanan her değer gerçekten ölçülmüş bir örnektir.
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Sıralı örneklerde q. yüzdelik (0 < q <= 100); örnek yoksa 0."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def latency_summary(seconds: Sequence[float]) -> Dict[str, float]:
+    """Saniye cinsinden örneklerden ms cinsinden özet: p50/p95/p99, ortalama, en büyük."""
+    values = sorted(seconds)
+    summary = {f"p{q}": round(percentile(values, q) * 1000, 3) for q in PERCENTILES}
+    summary["mean"] = round(sum(values) / len(values) * 1000, 3) if values else 0.0
+    summary["max"] = round(values[-1] * 1000, 3) if values else 0.0
+    return summary
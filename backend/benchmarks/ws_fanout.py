@@ -0,0 +1,391 @@
+"""
+WebSocket fan-out ölçeklenme benchmark'ı (backend/ dizininde):
+
+    PYTHONPATH=src python -m benchmarks.ws_fanout --clients 100,1000,10000 --rate 20 --duration 10 \\
+        --slow-fraction 0.05 --slow-delay-ms 100
+
+Her adımda yeni bir WebSocketHub kurulur ve N simüle istemci gerçek endpoint fonksiyonlarına
+(ws_public / ws_user_room) bağlanır; bir kısmı kullanıcı odalarına, --slow-fraction kadarı
+her frame'i --slow-delay-ms geç okuyan yavaş istemcidir. Ardından TaskService.create sabit
+hızla çağrılır (geçici SQLite veritabanı, dış servis yok) ve her istemcinin aldığı event'ler
+eşlenir:
+
+  - uçtan uca gecikme: create çağrısının başından istemcinin frame'i okumasına (p50/p95/p99)
+  - teslim oranı: istemcinin alması gereken event'lerden aldıkları (hızlı ve yavaş ayrı)
+  - bellek/bağlantı: bağlanma sırasında tracemalloc ile ölçülen artış / N
+  - CPU/bağlantı: yayın süresince süreç CPU'su, istemcisiz kalibrasyon adımı çıkarılarak / N
+
+Simüle soketler ağ/kernel maliyeti taşımaz; ölçülen, hub + bağlantı writer'ları + istemci
+tarafının Python maliyetidir (istemci tarafı frame başına bir dict erişimi kadar hafiftir).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from worktracker.realtime.connection import SLOW_CONSUMER_DROP_OLDEST, SLOW_CONSUMER_POLICIES
+
+from .report import RESULT_VERSION, check_against_baseline, environment, write_result
+from .seed import database_url, seed_database, task_title
+from .stats import latency_summary
+
+# WebSocketHub varsayılanları (Settings.WS_* ile aynı)
+DEFAULT_CLIENT_BUFFER = 256
+DEFAULT_SEND_TIMEOUT = 5.0
+# Kullanıcı odasına bağlanan istemci başına oda sayısı (ör. 0.1: 10 istemci bir odayı paylaşır)
+ROOMS_PER_USER_CLIENT = 0.1
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+@lru_cache(maxsize=4096)
+def _task_id(frame: str) -> Optional[int]:
+    # Aynı Frame tüm alıcılarda aynı str nesnesidir: bir kez parse edilir
+    message = json.loads(frame)
+    return message.get("task_id") if message.get("type") == "task_created" else None
+
+
+class SimulatedSocket:
+    """
+    ws_public/ws_user_room'un beklediği WebSocket arayüzü. send_text istemcinin frame'i
+    okumasıdır: yavaş istemci her frame'de read_delay bekler (TCP geri basıncı gibi,
+    bağlantının writer'ı da bekler).
+    """
+
+    def __init__(self, *, read_delay: float = 0.0) -> None:
+        self.scope: Dict[str, Any] = {"type": "websocket", "subprotocols": []}
+        self.read_delay = read_delay
+        self.closed_by_server = False
+        # Okunan task_created event'leri ve okunma anları; gecikme adım sonunda
+        # publish anlarıyla eşlenir (event, create() dönmeden önce bile gelebilir)
+        self.task_ids = array("q")
+        self.arrivals = array("d")
+        self._disconnected = asyncio.Event()
+
+    @property
+    def received(self) -> int:
+        return len(self.task_ids)
+
+    async def accept(self, subprotocol: Optional[str] = None) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        if self.read_delay:
+            await asyncio.sleep(self.read_delay)
+        task_id = _task_id(data)
+        if task_id is not None:
+            self.task_ids.append(task_id)
+            self.arrivals.append(time.perf_counter())
+
+    async def send_bytes(self, data: bytes) -> None:
+        raise AssertionError("simulated clients negotiate JSON only")
+
+    async def close(self, code: int = 1000) -> None:
+        # Sunucu kapattı (ör. disconnect politikasıyla yavaş istemci)
+        self.closed_by_server = True
+        self._disconnected.set()
+
+    async def receive(self) -> Dict[str, Any]:
+        # İstemci hiç mesaj göndermez; kopana kadar bekler
+        await self._disconnected.wait()
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    def disconnect(self) -> None:
+        self._disconnected.set()
+
+
+class Client:
+    def __init__(self, socket: SimulatedSocket, *, room: Optional[int], slow: bool) -> None:
+        self.socket = socket
+        self.room = room
+        self.slow = slow
+        self.task: Optional[asyncio.Task] = None
+
+
+async def _publish(
+    hub,
+    *,
+    rate: float,
+    duration: float,
+    rooms: int,
+    published: Dict[int, float],
+    rng: random.Random,
+) -> Dict[Optional[int], int]:
+    """TaskService.create'i sabit hızla çağırır; oda başına yayın sayısını döner."""
+    from worktracker.schemas.task import TaskCreate
+
+    per_room: Dict[Optional[int], int] = {}
+    interval = 1 / rate
+    start = time.perf_counter()
+    for k in range(int(rate * duration)):
+        delay = start + k * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        assignee = (k % rooms) + 1 if rooms else None
+        begun = time.perf_counter()
+        async with task_service(hub) as svc:
+            task = await svc.create(TaskCreate(title=task_title(rng), assignee_id=assignee))
+        published[task.id] = begun
+        per_room[assignee] = per_room.get(assignee, 0) + 1
+    return per_room
+
+
+def _group(clients: List[Client], expected: Dict[Client, int], published: Dict[int, float]) -> Dict[str, Any]:
+    want = sum(expected[c] for c in clients)
+    got = sum(min(c.socket.received, expected[c]) for c in clients)
+    latencies = array("d")
+    for client in clients:
+        for task_id, arrived in zip(client.socket.task_ids, client.socket.arrivals):
+            latencies.append(arrived - published[task_id])
+    return {
+        "clients": len(clients),
+        "expected": want,
+        "delivered": got,
+        "delivered_ratio": round(got / want, 4) if want else 1.0,
+        "disconnected": sum(1 for c in clients if c.socket.closed_by_server),
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+async def run_step(n_clients: int, args: argparse.Namespace) -> Dict[str, Any]:
+    from worktracker.api.routers.ws import ws_public, ws_user_room
+    from worktracker.realtime.hub import WebSocketHub
+
+    rng = random.Random(args.seed + n_clients)
+    hub = WebSocketHub(
+        client_buffer_size=args.client_buffer,
+        slow_consumer_policy=args.slow_policy,
+        send_timeout=args.send_timeout,
+        batch_window=0,
+        replay_buffer_size=0,
+    )
+    await hub.start()
+
+    published: Dict[int, float] = {}
+    n_user = int(n_clients * args.user_fraction)
+    rooms = max(int(n_user * ROOMS_PER_USER_CLIENT), 1) if n_user else 0
+
+    gc.collect()
+    tracemalloc.start()
+    mem_before = tracemalloc.get_traced_memory()[0]
+    clients: List[Client] = []
+    for i in range(n_clients):
+        slow = rng.random() < args.slow_fraction
+        socket = SimulatedSocket(read_delay=args.slow_delay_ms / 1000 if slow else 0.0)
+        client = Client(socket, room=(i % rooms) + 1 if i < n_user else None, slow=slow)
+        if client.room is None:
+            client.task = asyncio.create_task(ws_public(socket, hub))
+        else:
+            client.task = asyncio.create_task(ws_user_room(client.room, socket, hub))
+        clients.append(client)
+    while hub.stats()["connections"] < n_clients:
+        await asyncio.sleep(0.01)
+    mem_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    per_room = await _publish(
+        hub,
+        rate=args.rate,
+        duration=args.duration,
+        rooms=rooms,
+        published=published,
+        rng=rng,
+    )
+    expected = {
+        c: sum(per_room.values()) if c.room is None else per_room.get(c.room, 0) for c in clients
+    }
+    # Hızlı istemcilerin hepsini alması (ya da drain süresinin dolması) beklenir
+    fast = [c for c in clients if not c.slow]
+    drain_deadline = time.perf_counter() + args.drain
+    while time.perf_counter() < drain_deadline and any(
+        c.socket.received < expected[c] for c in fast
+    ):
+        await asyncio.sleep(0.01)
+    cpu_seconds = time.process_time() - cpu_start
+    wall_seconds = time.perf_counter() - wall_start
+    stats = hub.stats()
+
+    for client in clients:
+        client.socket.disconnect()
+    await asyncio.gather(*(c.task for c in clients if c.task is not None), return_exceptions=True)
+    await hub.stop()
+
+    slow_clients = [c for c in clients if c.slow]
+    fanouts = hub.fanout_seconds.count()
+    return {
+        "clients": n_clients,
+        "user_room_clients": n_user,
+        "rooms": rooms,
+        "published": len(published),
+        "wall_seconds": round(wall_seconds, 3),
+        "cpu_seconds": round(cpu_seconds, 3),
+        "memory_bytes": mem_after - mem_before,
+        "fast": _group(fast, expected, published),
+        "slow": _group(slow_clients, expected, published),
+        "hub": {
+            key: stats[key]
+            for key in ("dispatched", "dropped", "client_frames_dropped", "slow_disconnects",
+                        "send_failures", "dead_evictions")
+        },
+        "fanout_ms": {
+            "count": hub.fanout_seconds.count(),
+            "mean": round(hub.fanout_seconds.sum() * 1000 / fanouts, 4) if fanouts else 0.0,
+        },
+    }
+
+
+def _finalize(step: Dict[str, Any], calibration: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Karşılaştırılabilir özet alanları: hızlı istemci gecikmesi/teslimi, bağlantı başına maliyet."""
+    n = step["clients"]
+    base_cpu = calibration["cpu_seconds"] if calibration else 0.0
+    step["latency_ms"] = step["fast"]["latency_ms"]
+    step["delivered_ratio"] = step["fast"]["delivered_ratio"]
+    step["bytes_per_connection"] = round(step["memory_bytes"] / n, 1) if n else 0.0
+    step["cpu_ms_per_connection"] = round(max(step["cpu_seconds"] - base_cpu, 0) * 1000 / n, 4) if n else 0.0
+    return step
+
+
+@asynccontextmanager
+async def task_service(hub) -> AsyncIterator[Any]:
+    """İstek başına olduğu gibi: yeni session, repository'ler ve hub'a yayın yapan AsyncTaskService."""
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from worktracker.core.db import async_engine
+    from worktracker.repositories.async_sqlmodel_task_repo import AsyncSQLModelTaskRepository
+    from worktracker.repositories.async_sqlmodel_user_repo import AsyncSQLModelUserRepository
+    from worktracker.services.async_task_service import AsyncTaskService
+
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield AsyncTaskService(
+            AsyncSQLModelTaskRepository(session),
+            AsyncSQLModelUserRepository(session),
+            ws_publisher=hub,
+        )
+
+
+async def _run(args: argparse.Namespace, steps: List[int]) -> Dict[str, Any]:
+    from worktracker.core.db import start_db, stop_db
+
+    await start_db()
+    try:
+        calibration = _finalize(await run_step(0, args), None) if args.calibrate else None
+        results = {}
+        for n in steps:
+            print(f"step: {n} clients", file=sys.stderr)
+            results[f"clients={n}"] = _finalize(await run_step(n, args), calibration)
+        return {"calibration": calibration, "steps": results}
+    finally:
+        await stop_db()
+
+
+# ---------- CLI ----------
+
+
+def _parse_steps(value: str) -> List[int]:
+    try:
+        steps = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma separated client counts, got {value!r}")
+    if not steps or any(n <= 0 for n in steps):
+        raise argparse.ArgumentTypeError("client counts must be positive")
+    return steps
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="benchmarks.ws_fanout", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=_parse_steps, default=[100, 1000, 10000],
+                        help="comma separated socket counts, one step each")
+    parser.add_argument("--user-fraction", type=float, default=0.5,
+                        help="share of clients on /ws/users/{id} instead of /ws")
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--slow-delay-ms", type=float, default=100)
+    parser.add_argument("--rate", type=float, default=20, help="TaskService.create calls per second")
+    parser.add_argument("--duration", type=float, default=10, help="publishing seconds per step")
+    parser.add_argument("--drain", type=float, default=10,
+                        help="max seconds to wait for fast clients after publishing")
+    parser.add_argument("--client-buffer", type=int, default=DEFAULT_CLIENT_BUFFER)
+    parser.add_argument("--slow-policy", choices=SLOW_CONSUMER_POLICIES, default=SLOW_CONSUMER_DROP_OLDEST)
+    parser.add_argument("--send-timeout", type=float, default=DEFAULT_SEND_TIMEOUT)
+    parser.add_argument("--no-calibrate", dest="calibrate", action="store_false",
+                        help="skip the zero-client step used to isolate per-connection CPU")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help="baseline to compare with (default: baselines/ws-fanout.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    return parser
+
+
+def _print_table(steps: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'clients':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'delivered':>10} "
+          f"{'slow dlv':>9} {'B/conn':>9} {'cpu ms/conn':>12}")
+    for step in steps.values():
+        lat = step["latency_ms"]
+        print(
+            f"{step['clients']:>8} {lat['p50']:>9.2f} {lat['p95']:>9.2f} {lat['p99']:>9.2f} "
+            f"{step['delivered_ratio']:>10.2%} {step['slow']['delivered_ratio']:>9.2%} "
+            f"{step['bytes_per_connection']:>9.0f} {step['cpu_ms_per_connection']:>12.4f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    work_dir = Path(tempfile.mkdtemp(prefix="worktracker-ws-bench-"))
+    url = database_url("sqlite", work_dir)
+    max_rooms = max(max(int(n * args.user_fraction * ROOMS_PER_USER_CLIENT), 1) for n in args.clients)
+    seed_database(url, users=max_rooms, tasks=0, seed=args.seed)
+
+    # Settings import anında okunur: uygulama modülleri bundan sonra import edilmeli
+    os.environ["DATABASE_URL"] = url
+    os.environ["CACHE_ENABLED"] = "false"
+    result = {
+        "benchmark": "ws_fanout",
+        "version": RESULT_VERSION,
+        "environment": environment(),
+        "config": {
+            "clients": args.clients,
+            "user_fraction": args.user_fraction,
+            "slow_fraction": args.slow_fraction,
+            "slow_delay_ms": args.slow_delay_ms,
+            "rate": args.rate,
+            "duration": args.duration,
+            "client_buffer": args.client_buffer,
+            "slow_policy": args.slow_policy,
+            "send_timeout": args.send_timeout,
+            "seed": args.seed,
+        },
+        **asyncio.run(_run(args, args.clients)),
+    }
+    _print_table(result["steps"])
+
+    output = args.output or RESULTS_DIR / f"ws-fanout-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_result(output, result)
+    print(f"result written to {output}", file=sys.stderr)
+
+    baseline = args.baseline or BASELINES_DIR / "ws-fanout.json"
+    if args.save_baseline:
+        write_result(baseline, result)
+        print(f"baseline stored at {baseline}", file=sys.stderr)
+        return 0
+    return check_against_baseline(result, baseline, threshold=args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import math
+
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Okumaları primary'ye sabitleyen işaretler: yazma sonrası otomatik cookie ya da
+# istemcinin açıkça gönderdiği başlık (cookie tutmayan istemciler için)
+READ_PRIMARY_COOKIE = "wt_read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def reads_from_primary(request: Request) -> bool:
+    """İstek replica yerine primary'den mi okumalı? (kendi yazmasını hemen okuyan istemci)"""
+    if READ_PRIMARY_COOKIE in request.cookies:
+        return True
+    return request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes")
+
+
+class ReadYourWritesMiddleware:
+    """
+    Başarılı her yazma cevabına kısa ömürlü wt_read_primary cookie'si ekler; tarayıcı
+    bu süre boyunca okumalarını primary'ye yönlendirir (replica henüz yetişmemiş olabilir).
+    Saf ASGI: gövdeye dokunmaz, StreamingResponse'ları da tamponlamaz.
+    """
+
+    def __init__(self, app: ASGIApp, *, seconds: float) -> None:
+        self.app = app
+        self._cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={max(math.ceil(seconds), 1)}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = list(message.get("headers", ()))
+                headers.append((b"set-cookie", self._cookie))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,12 +1,17 @@
 # backend/src/worktracker/api/deps.py
 from __future__ import annotations
 
-from typing import Annotated
-from fastapi import Depends
+import logging
+from typing import Annotated, AsyncIterator
+from fastapi import Depends, Request
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
 
 # --- DB Session provider ---
 from ..core.db import get_session  # Session(engine) açan generator
+from ..core.db import get_async_session  # AsyncSession(async_engine) açan async generator
 
 
 def get_db(session: Session = Depends(get_session)) -> Session:
@@ -17,7 +22,30 @@ def get_db(session: Session = Depends(get_session)) -> Session:
     return session
 
 
+async def get_async_db(session: AsyncSession = Depends(get_async_session)) -> AsyncSession:
+    """get_db'nin async karşılığı: istek başına bir AsyncSession."""
+    return session
+
+
+# --- Okuma session'ı (replica'lar; bkz. core/db.py ReplicaSet) ---
+from ..core.db import open_read_session
+from .consistency import reads_from_primary
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    GET endpoint'leri için AsyncSession: round-robin sıradaki sağlıklı replica, yoksa primary.
+    Kendi yazmasını okuyan istemci (wt_read_primary cookie'si / X-Read-Primary) primary'de kalır.
+    """
+    session = await open_read_session(primary=reads_from_primary(request))
+    async with session:
+        yield session
+
+
 # --- WebSocket Hub provider (singleton benzeri) ---
+from ..core.config import settings
+from ..core.db import async_engine, replicas
+from ..realtime.backplane import BACKPLANE_POSTGRES, create_backplane
 from ..realtime.hub import WebSocketHub
 
 _ws_hub_singleton: WebSocketHub | None = None
@@ -26,11 +54,57 @@ _ws_hub_singleton: WebSocketHub | None = None
 def get_ws_hub() -> WebSocketHub:
     global _ws_hub_singleton
     if _ws_hub_singleton is None:
-        _ws_hub_singleton = WebSocketHub()
+        _ws_hub_singleton = WebSocketHub(
+            queue_size=settings.WS_EVENT_QUEUE_SIZE,
+            overflow=settings.WS_EVENT_OVERFLOW,
+            client_buffer_size=settings.WS_CLIENT_BUFFER_SIZE,
+            slow_consumer_policy=settings.WS_SLOW_CONSUMER_POLICY,
+            send_timeout=settings.WS_SEND_TIMEOUT,
+            # --workers N ile çalışırken event'ler diğer worker'ların soketlerine de ulaşsın
+            backplane=create_backplane(settings.WS_BACKPLANE, async_engine),
+            batch_window=settings.WS_BATCH_WINDOW_MS / 1000,
+            batch_max_latency=settings.WS_BATCH_MAX_LATENCY_MS / 1000,
+            batch_max_events=settings.WS_BATCH_MAX_EVENTS,
+            max_topics_per_connection=settings.WS_MAX_TOPICS_PER_CONNECTION,
+            replay_buffer_size=settings.WS_REPLAY_BUFFER_SIZE,
+        )
     return _ws_hub_singleton
 
 
+# --- Entity cache provider (singleton; CACHE_ENABLED=false ise None) ---
+from ..repositories.cache import EntityCache
+
+CACHE_CHANNEL = "worktracker_cache"
+
+_entity_cache_singleton: EntityCache | None = None
+
+
+def get_entity_cache() -> EntityCache | None:
+    global _entity_cache_singleton
+    if not settings.CACHE_ENABLED:
+        return None
+    if _entity_cache_singleton is None:
+        if settings.CACHE_BACKPLANE != BACKPLANE_POSTGRES:
+            # memory kanalı süreç içidir: diğer worker'lara invalidation ulaşmaz
+            logger.warning(
+                "CACHE_ENABLED with CACHE_BACKPLANE=%s: safe only with a single worker; "
+                "other workers' writes stay invisible for up to %ss",
+                settings.CACHE_BACKPLANE,
+                settings.CACHE_TTL_SECONDS,
+            )
+        _entity_cache_singleton = EntityCache(
+            max_size=settings.CACHE_MAX_SIZE,
+            ttl=settings.CACHE_TTL_SECONDS,
+            # Diğer worker'ların cache'leri de yazmalardan haberdar olsun
+            backplane=create_backplane(settings.CACHE_BACKPLANE, async_engine, channel=CACHE_CHANNEL),
+            # Replica'lar varsa yazılan id'ler bir süre replica okumalarından doldurulmaz
+            write_hold=settings.READ_YOUR_WRITES_SECONDS if replicas else 0.0,
+        )
+    return _entity_cache_singleton
+
+
 # --- User: repository & service providers ---
+from ..repositories.cache import CachedTaskRepository, CachedUserRepository
 from ..repositories.ports import UserRepositoryPort
 from ..repositories.sqlmodel_user_repo import SQLModelUserRepository
 from ..services.ports import UserServicePort
@@ -40,8 +114,10 @@ from ..services.user_service import UserService
 def get_user_repository(
     db: Annotated[Session, Depends(get_db)],
 ) -> UserRepositoryPort:
-    """SQLModel tabanlı User repository'sini üretir (istek başına)."""
-    return SQLModelUserRepository(db)
+    """SQLModel tabanlı User repository'sini üretir (istek başına; cache açıksa sarılı)."""
+    repo = SQLModelUserRepository(db)
+    cache = get_entity_cache()
+    return CachedUserRepository(repo, cache) if cache is not None else repo
 
 
 def get_user_service(
@@ -65,7 +141,9 @@ from ..services.task_service import TaskService
 def get_task_repository(
     db: Annotated[Session, Depends(get_db)],
 ) -> TaskRepositoryPort:
-    return SQLModelTaskRepository(db)
+    repo = SQLModelTaskRepository(db)
+    cache = get_entity_cache()
+    return CachedTaskRepository(repo, cache) if cache is not None else repo
 
 
 def get_task_service(
@@ -76,11 +154,104 @@ def get_task_service(
     return TaskService(task_repo, user_repo, ws_publisher=ws_hub)
 
 
+# --- Async repository & service providers (router'lar bunları kullanır) ---
+# Not: provider'lar da "async def"; sync def dependency'ler FastAPI'de threadpool'da koşar.
+from ..repositories.ports import AsyncTaskRepositoryPort, AsyncUserRepositoryPort
+from ..repositories.async_sqlmodel_task_repo import AsyncSQLModelTaskRepository
+from ..repositories.async_sqlmodel_user_repo import AsyncSQLModelUserRepository
+from ..repositories.cache import AsyncCachedTaskRepository, AsyncCachedUserRepository
+from ..services.ports import AsyncTaskServicePort, AsyncUserServicePort
+from ..services.async_task_service import AsyncTaskService
+from ..services.async_user_service import AsyncUserService
+
+
+async def get_async_user_repository(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> AsyncUserRepositoryPort:
+    repo = AsyncSQLModelUserRepository(db)
+    cache = get_entity_cache()
+    return AsyncCachedUserRepository(repo, cache) if cache is not None else repo
+
+
+async def get_async_user_service(
+    repo: Annotated[AsyncUserRepositoryPort, Depends(get_async_user_repository)],
+    ws_hub: WebSocketHub = Depends(get_ws_hub),
+) -> AsyncUserServicePort:
+    return AsyncUserService(repo, ws_publisher=ws_hub)
+
+
+async def get_async_task_repository(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> AsyncTaskRepositoryPort:
+    repo = AsyncSQLModelTaskRepository(db)
+    cache = get_entity_cache()
+    return AsyncCachedTaskRepository(repo, cache) if cache is not None else repo
+
+
+async def get_async_task_service(
+    task_repo: Annotated[AsyncTaskRepositoryPort, Depends(get_async_task_repository)],
+    user_repo: Annotated[AsyncUserRepositoryPort, Depends(get_async_user_repository)],
+    ws_hub: WebSocketHub = Depends(get_ws_hub),
+) -> AsyncTaskServicePort:
+    return AsyncTaskService(task_repo, user_repo, ws_publisher=ws_hub)
+
+
+# --- Okuma (GET) provider'ları: aynı servisler, replica'ya bağlı session üzerinde ---
+# Bu servislerle yazma yapılmaz; WS publisher'a da gerek yok.
+
+def _on_replica(db: AsyncSession) -> bool:
+    return db.bind is not async_engine
+
+
+async def get_async_read_user_repository(
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+) -> AsyncUserRepositoryPort:
+    repo = AsyncSQLModelUserRepository(db)
+    cache = get_entity_cache()
+    if cache is None:
+        return repo
+    return AsyncCachedUserRepository(repo, cache, lagging=_on_replica(db))
+
+
+async def get_async_read_task_repository(
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+) -> AsyncTaskRepositoryPort:
+    repo = AsyncSQLModelTaskRepository(db)
+    cache = get_entity_cache()
+    if cache is None:
+        return repo
+    return AsyncCachedTaskRepository(repo, cache, lagging=_on_replica(db))
+
+
+async def get_async_read_user_service(
+    repo: Annotated[AsyncUserRepositoryPort, Depends(get_async_read_user_repository)],
+) -> AsyncUserServicePort:
+    return AsyncUserService(repo)
+
+
+async def get_async_read_task_service(
+    task_repo: Annotated[AsyncTaskRepositoryPort, Depends(get_async_read_task_repository)],
+    user_repo: Annotated[AsyncUserRepositoryPort, Depends(get_async_read_user_repository)],
+) -> AsyncTaskServicePort:
+    return AsyncTaskService(task_repo, user_repo)
+
+
 __all__ = (
     "get_db",
+    "get_async_db",
+    "get_async_read_db",
     "get_ws_hub",
+    "get_entity_cache",
     "get_user_repository",
     "get_user_service",
     "get_task_repository",
     "get_task_service",
+    "get_async_user_repository",
+    "get_async_user_service",
+    "get_async_task_repository",
+    "get_async_task_service",
+    "get_async_read_user_repository",
+    "get_async_read_task_repository",
+    "get_async_read_user_service",
+    "get_async_read_task_service",
 )
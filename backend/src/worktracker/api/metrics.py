@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable, List
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.db import db_pool_stats, profiler
+from ..core.instrumentation import track_queries
+from ..core.metrics import Counter, DEFAULT_BUCKETS, Gauge, registry
+from ..realtime.hub import WebSocketHub
+
+# HTTP, DB havuzu ve WebSocket hub metrikleri (GET /metrics, bkz. core/metrics.py)
+
+# Route bulunamayan istekler (404) tek etiket altında toplanır (path'ler etiket olmasın)
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUESTS = registry.counter(
+    "worktracker_http_requests_total", "HTTP requests", ("method", "route", "status")
+)
+HTTP_SECONDS = registry.histogram(
+    "worktracker_http_request_duration_seconds",
+    "HTTP request latency until the response is complete",
+    ("method", "route"),
+    buckets=DEFAULT_BUCKETS,
+)
+REQUEST_QUERIES = registry.histogram(
+    "worktracker_http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+REQUEST_DB_SECONDS = registry.histogram(
+    "worktracker_http_request_db_seconds",
+    "Time spent in SQL per HTTP request",
+    ("method", "route"),
+    buckets=DEFAULT_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """
+    İstek başına süre, durum kodu ve DB sorgu sayısı/süresi. route etiketi path
+    şablonudur (/tasks/{task_id}); böylece id'ler ayrı seri üretmez. Saf ASGI:
+    StreamingResponse'larda süre son gövde parçası gönderilince biter.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - start
+                route = scope.get("route")
+                path = getattr(route, "path", None) or UNMATCHED_ROUTE
+                method = scope["method"]
+                HTTP_REQUESTS.inc(method=method, route=path, status=status)
+                HTTP_SECONDS.observe(elapsed, method=method, route=path)
+                REQUEST_QUERIES.observe(queries.count, method=method, route=path)
+                REQUEST_DB_SECONDS.observe(queries.seconds, method=method, route=path)
+
+
+def _pool_metrics() -> List:
+    """Havuz doluluğu: checkout bekleyen istekler varsa saturation 1'e yaklaşır."""
+    size = Gauge("worktracker_db_pool_size", "Persistent connections per pool", ("pool",))
+    max_overflow = Gauge("worktracker_db_pool_max_overflow", "Allowed overflow connections", ("pool",))
+    checked_out = Gauge("worktracker_db_pool_checked_out", "Connections in use", ("pool",))
+    overflow = Gauge("worktracker_db_pool_overflow", "Open overflow connections", ("pool",))
+    saturation = Gauge(
+        "worktracker_db_pool_saturation", "checked_out / (size + max_overflow)", ("pool",)
+    )
+    checkouts = Counter("worktracker_db_pool_checkouts_total", "Pool checkouts", ("pool",))
+    timeouts = Counter(
+        "worktracker_db_pool_timeouts_total", "Checkouts that hit DB_POOL_TIMEOUT", ("pool",)
+    )
+    wait = Counter(
+        "worktracker_db_pool_wait_seconds_total", "Time spent waiting for a connection", ("pool",)
+    )
+
+    stats = db_pool_stats()
+    pools = [("primary", stats["primary"]), ("primary_sync", stats["primary_sync"])]
+    pools += [(f"replica{i}", s) for i, s in enumerate(stats["replicas"])]
+    for name, pool in pools:
+        if "size" not in pool:
+            continue  # QueuePool olmayan havuz (SQLite :memory:)
+        capacity = pool["size"] + max(pool["max_overflow"], 0)
+        size.set(pool["size"], pool=name)
+        max_overflow.set(pool["max_overflow"], pool=name)
+        checked_out.set(pool["checked_out"], pool=name)
+        overflow.set(pool["overflow"], pool=name)
+        saturation.set(pool["checked_out"] / capacity if capacity else 0.0, pool=name)
+        if "checkouts" in pool:
+            checkouts.set_total(pool["checkouts"], pool=name)
+            timeouts.set_total(pool["timeouts"], pool=name)
+            wait.set_total(pool["wait_total_ms"] / 1000, pool=name)
+    return [size, max_overflow, checked_out, overflow, saturation, checkouts, timeouts, wait]
+
+
+def hub_collector(hub: WebSocketHub):
+    """WebSocketHub için scrape anında metrik üreten collector."""
+
+    def collect() -> Iterable:
+        connections = Gauge("worktracker_ws_connections", "Connected WebSocket clients", ("room",))
+        for room, n in hub.connection_counts().items():
+            connections.set(n, room=room)
+        user_rooms = Gauge("worktracker_ws_user_rooms", "User rooms with at least one socket")
+        user_rooms.set(hub.user_room_count())
+
+        stats = hub.stats()
+        queue_depth = Gauge("worktracker_ws_queue_depth", "Events waiting for the hub dispatcher")
+        queue_depth.set(stats["queue_depth"])
+        counters = []
+        for key, name, doc in (
+            ("dispatched", "worktracker_ws_events_dispatched_total", "Events fanned out"),
+            ("dropped", "worktracker_ws_events_dropped_total", "Events dropped on queue overflow"),
+            ("send_failures", "worktracker_ws_send_failures_total", "Failed or timed out socket sends"),
+            ("dead_evictions", "worktracker_ws_dead_evictions_total", "Closed or failed sockets evicted from the hub"),
+            ("slow_disconnects", "worktracker_ws_slow_disconnects_total", "Slow consumers disconnected"),
+            ("client_frames_dropped", "worktracker_ws_client_frames_dropped_total", "Frames dropped for slow consumers"),
+            ("backplane_failures", "worktracker_ws_backplane_failures_total", "Events that could not be published to the backplane"),
+            ("dispatch_errors", "worktracker_ws_dispatch_errors_total", "Events that failed during local dispatch"),
+        ):
+            counter = Counter(name, doc)
+            counter.set_total(stats[key])
+            counters.append(counter)
+        return [connections, user_rooms, queue_depth, *counters, hub.fanout_seconds]
+
+    return collect
+
+
+def _profiler_metrics() -> List:
+    if profiler is None:
+        return []
+    stats = profiler.stats()
+    slow = Counter(
+        "worktracker_db_slow_queries_total", "Statements over SLOW_QUERY_MS (QUERY_PROFILER_ENABLED)"
+    )
+    slow.set_total(stats["slow_queries"])
+    explained = Counter(
+        "worktracker_db_slow_queries_explained_total", "Slow statements with a captured plan"
+    )
+    explained.set_total(stats["explained"])
+    return [slow, explained]
+
+
+registry.add_collector(_pool_metrics)
+registry.add_collector(_profiler_metrics)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.instrumentation import track_queries
+
+logger = logging.getLogger("worktracker.sql.budget")
+
+# İstekte çalışan sorgu sayısı ve toplam DB süresi (QUERY_COUNT_HEADER=true)
+QUERY_COUNT_HEADER = "x-query-count"
+QUERY_TIME_HEADER = "x-query-time-ms"
+
+
+class QueryBudgetMiddleware:
+    """
+    İstek başına sorgu bütçesi: budget'tan fazla SQL çalıştıran istek route ile
+    birlikte uyarı loglar (N+1 gerilemeleri). header=True ise sayı ve süre cevap
+    başlıklarına yazılır; testler bunlarla sorgu sayısını doğrulayabilir.
+    Sayılan sorgular cevap başlatılana kadar çalışanlardır (StreamingResponse
+    gövdesinde çalışanlar başlığa giremez, uyarıya girer).
+    """
+
+    def __init__(self, app: ASGIApp, *, budget: int = 0, header: bool = False) -> None:
+        self.app = app
+        self.budget = budget
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as queries:
+
+            async def send_with_count(message: Message) -> None:
+                if self.header and message["type"] == "http.response.start":
+                    headers = list(message.get("headers", ()))
+                    headers.append((QUERY_COUNT_HEADER.encode(), str(queries.count).encode()))
+                    headers.append(
+                        (QUERY_TIME_HEADER.encode(), f"{queries.seconds * 1000:.2f}".encode())
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_count)
+            finally:
+                if self.budget and queries.count > self.budget:
+                    route = getattr(scope.get("route"), "path", scope["path"])
+                    logger.warning(
+                        "%s %s ran %d queries (budget %d, %.1f ms in DB)",
+                        scope["method"],
+                        route,
+                        queries.count,
+                        self.budget,
+                        queries.seconds * 1000,
+                    )
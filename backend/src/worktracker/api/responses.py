@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(
+    adapter: TypeAdapter[Any],
+    value: Any,
+    *,
+    etag: Optional[str] = None,
+    status_code: int = 200,
+) -> Response:
+    """
+    Okuma fast path'i: değeri önceden kurulmuş TypeAdapter ile tek seferde JSON bytes'a
+    çevirip ham Response döner. FastAPI'nin response_model üzerinden ikinci kez
+    doğrulama + jsonable_encoder adımı atlanır (response_model yine OpenAPI sözleşmesidir).
+    """
+    headers = {"ETag": etag} if etag else None
+    return Response(
+        content=adapter.dump_json(value),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
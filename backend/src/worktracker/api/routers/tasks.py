@@ -1,22 +1,44 @@
 from __future__ import annotations
 
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated, Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 
-from ...schemas.task import TaskCreate, TaskUpdate, TaskRead
-from ...services.ports import TaskServicePort
-from ..deps import get_task_service
+from ...models.task import TaskStatus
+from ...schemas.task import (
+    TaskBatchCreate,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskChangesPage,
+    TaskCreate,
+    TaskPage,
+    TaskRead,
+    TaskSearchPage,
+    TaskStats,
+    TaskUpdate,
+    TASK_CHANGES_ADAPTER,
+    TASK_PAGE_ADAPTER,
+    TASK_READ_ADAPTER,
+    TASK_SEARCH_ADAPTER,
+    TASK_STATS_ADAPTER,
+)
+from ...services.ports import AsyncTaskServicePort
+from ..deps import get_async_read_task_service, get_async_task_service
+from ..responses import json_response
 from ...services.task_service import NotFoundError, AssigneeNotFoundError
+from ...services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from ...services.export import EXPORT_FORMATS
+from ...services.etag import NotModifiedError, PreconditionFailedError, entity_etag, page_etag
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @router.post("", response_model=TaskRead, status_code=201)
-def create_task(
+async def create_task(
     data: TaskCreate,
-    svc: Annotated[TaskServicePort, Depends(get_task_service)],
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_task_service)],
 ):
     try:
-        return svc.create(data)
+        return await svc.create(data)
     except AssigneeNotFoundError:
         # Geçersiz assignee_id (kullanıcı yok / FK ihlali)
         raise HTTPException(status_code=400, detail="Assignee user not found")
@@ -24,31 +46,137 @@ def create_task(
         # Beklenmeyen/iş kuralı ihlalleri vs.
         raise HTTPException(status_code=400, detail=str(ex))
 
+# Not: /batch rotaları /{task_id}'den ÖNCE tanımlanmalı, yoksa "batch" task_id sanılır (422)
+@router.post("/batch", response_model=TaskBatchResult)
+async def create_tasks_batch(
+    data: TaskBatchCreate,
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_task_service)],
+):
+    # Kalem bazlı hatalar cevapta döner; burada sadece tüm batch'i düşüren hatalar var
+    try:
+        return await svc.create_many(data)
+    except AssigneeNotFoundError:
+        raise HTTPException(status_code=400, detail="Assignee user not found")
+
+@router.patch("/batch", response_model=TaskBatchResult)
+async def update_tasks_batch(
+    data: TaskBatchUpdate,
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_task_service)],
+):
+    try:
+        return await svc.update_many(data)
+    except AssigneeNotFoundError:
+        raise HTTPException(status_code=400, detail="Assignee user not found")
+
+# /changes, /search, /stats ve /export da /{task_id}'den önce olmalı
+@router.get("/changes", response_model=TaskChangesPage)
+async def list_task_changes(
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_read_task_service)],
+    since: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+    # Yeniden bağlanan / WS kullanmayan istemciler için: sadece since'ten sonra değişenler
+    page = await svc.changes(since, limit=limit)
+    return json_response(TASK_CHANGES_ADAPTER, page)
+
+
+@router.get("/search", response_model=TaskSearchPage)
+async def search_tasks(
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_read_task_service)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+):
+    # Tam metin index'i üzerinden (Postgres tsvector/GIN, SQLite FTS5); tasks taranmaz
+    try:
+        page = await svc.search(q, limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return json_response(TASK_SEARCH_ADAPTER, page)
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_task_stats(
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_read_task_service)],
+    assignee_id: Optional[int] = None,
+):
+    # Dashboard sayaçları: her poll'da GROUP BY yerine sayaç tablosu okunur
+    stats = await svc.stats(assignee_id=assignee_id)
+    return json_response(TASK_STATS_ADAPTER, stats)
+
+
+@router.get("/export")
+async def export_tasks(
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_read_task_service)],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+):
+    # Tüm tablo tek istekte; gövde server-side cursor'dan parti parti akar (sabit bellek)
+    media_type, ext = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        svc.export(format, status=status, assignee_id=assignee_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{ext}"'},
+    )
+
 @router.get("/{task_id}", response_model=TaskRead)
-def get_task(
+async def get_task(
     task_id: int,
-    svc: Annotated[TaskServicePort, Depends(get_task_service)],
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_read_task_service)],
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
     try:
-        return svc.get(task_id)
+        task = await svc.get(task_id, if_none_match=if_none_match)
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Task not found")
+    except NotModifiedError as e:
+        # Değişmedi: gövde üretmeden 304
+        return Response(status_code=304, headers={"ETag": e.etag})
+    return json_response(
+        TASK_READ_ADAPTER, task, etag=entity_etag("task", task.id, task.version)
+    )
 
-@router.get("", response_model=list[TaskRead])
-def list_tasks(
-    svc: Annotated[TaskServicePort, Depends(get_task_service)],
+@router.get("", response_model=TaskPage)
+async def list_tasks(
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_read_task_service)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    status: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    return svc.list()
+    try:
+        page = await svc.list(
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            assignee_id=assignee_id,
+            if_none_match=if_none_match,
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except NotModifiedError as e:
+        return Response(status_code=304, headers={"ETag": e.etag})
+    etag = page_etag(((t.id, t.version) for t in page.items), page.next_cursor is not None)
+    return json_response(TASK_PAGE_ADAPTER, page, etag=etag)
 
 @router.patch("/{task_id}", response_model=TaskRead)
-def update_task(
+async def update_task(
     task_id: int,
     data: TaskUpdate,
-    svc: Annotated[TaskServicePort, Depends(get_task_service)],
+    response: Response,
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_task_service)],
+    if_match: Annotated[Optional[str], Header()] = None,
 ):
+    # If-Match: ETag ya da çıplak sürüm; tutmazsa 412 (önce GET atmaya gerek yok)
     try:
-        return svc.update(task_id, data)
+        task = await svc.update(task_id, data, if_match=if_match)
     except NotFoundError:
         raise HTTPException(status_code=404, detail="Task not found")
     except AssigneeNotFoundError:
         raise HTTPException(status_code=400, detail="Assignee user not found")
+    except PreconditionFailedError:
+        raise HTTPException(status_code=412, detail="Task version mismatch")
+    response.headers["ETag"] = entity_etag("task", task.id, task.version)
+    return task
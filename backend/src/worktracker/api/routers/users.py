@@ -1,22 +1,28 @@
 from __future__ import annotations
 
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
-from ...schemas.user import UserCreate, UserRead, UserUpdate
-from ...services.ports import UserServicePort
-from ..deps import get_user_service
+from ...models.task import TaskStatus
+from ...schemas.task import TaskPage, TASK_PAGE_ADAPTER
+from ...schemas.user import UserCreate, UserRead, UserUpdate, USER_READ_ADAPTER
+from ...services.ports import AsyncTaskServicePort, AsyncUserServicePort
+from ..deps import get_async_read_task_service, get_async_read_user_service, get_async_user_service
+from ..responses import json_response
 from ...services.user_service import NotFoundError, DuplicateEmailError
+from ...services.task_service import AssigneeNotFoundError
+from ...services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from ...services.etag import NotModifiedError, PreconditionFailedError, entity_etag, page_etag
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.post("", response_model=UserRead, status_code=201)
-def create_user(
+async def create_user(
     data: UserCreate,
-    svc: Annotated[UserServicePort, Depends(get_user_service)],
+    svc: Annotated[AsyncUserServicePort, Depends(get_async_user_service)],
 ):
     try:
-        return svc.create(data)
+        return await svc.create(data)
     except DuplicateEmailError:
         # email UNIQUE ihlali
         raise HTTPException(status_code=409, detail="Email already exists")
@@ -25,24 +31,58 @@ def create_user(
         raise HTTPException(status_code=400, detail=str(ex))
 
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(
+async def get_user(
     user_id: int,
-    svc: Annotated[UserServicePort, Depends(get_user_service)],
+    svc: Annotated[AsyncUserServicePort, Depends(get_async_read_user_service)],
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
     try:
-        return svc.get(user_id)
+        user = await svc.get(user_id, if_none_match=if_none_match)
     except NotFoundError:
         raise HTTPException(status_code=404, detail="User not found")
+    except NotModifiedError as e:
+        return Response(status_code=304, headers={"ETag": e.etag})
+    return json_response(
+        USER_READ_ADAPTER, user, etag=entity_etag("user", user.id, user.version)
+    )
+
+@router.get("/{user_id}/tasks", response_model=TaskPage)
+async def list_user_tasks(
+    user_id: int,
+    svc: Annotated[AsyncTaskServicePort, Depends(get_async_read_task_service)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    status: Optional[TaskStatus] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    try:
+        page = await svc.list_by_assignee(
+            user_id, limit=limit, cursor=cursor, status=status, if_none_match=if_none_match
+        )
+    except AssigneeNotFoundError:
+        raise HTTPException(status_code=404, detail="User not found")
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except NotModifiedError as e:
+        return Response(status_code=304, headers={"ETag": e.etag})
+    etag = page_etag(((t.id, t.version) for t in page.items), page.next_cursor is not None)
+    return json_response(TASK_PAGE_ADAPTER, page, etag=etag)
 
 @router.patch("/{user_id}", response_model=UserRead)
-def update_user(
+async def update_user(
     user_id: int,
     data: UserUpdate,
-    svc: Annotated[UserServicePort, Depends(get_user_service)],
+    response: Response,
+    svc: Annotated[AsyncUserServicePort, Depends(get_async_user_service)],
+    if_match: Annotated[Optional[str], Header()] = None,
 ):
     try:
-        return svc.update(user_id, data)
+        user = await svc.update(user_id, data, if_match=if_match)
     except NotFoundError:
         raise HTTPException(status_code=404, detail="User not found")
     except DuplicateEmailError:
         raise HTTPException(status_code=409, detail="Email already exists")
+    except PreconditionFailedError:
+        raise HTTPException(status_code=412, detail="User version mismatch")
+    response.headers["ETag"] = entity_etag("user", user.id, user.version)
+    return user
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, WebSocket
 
 from ..deps import get_ws_hub
@@ -12,10 +12,17 @@ router = APIRouter(tags=["ws"])
 async def ws_public(
     ws: WebSocket,
     hub: Annotated[WebSocketHub, Depends(get_ws_hub)],
+    batch: bool = False,
+    last_seq: Optional[int] = None,
+    last_epoch: Optional[str] = None,
 ):
-    await hub.connect_public(ws)
+    # batch=true: event'ler kısa pencerede toplanıp {"type": "batch", ...} frame'i olarak gelir
+    # {"op": "subscribe", "topics": [...]} gönderen istemci firehose yerine sadece konularını alır
+    # last_seq=N&last_epoch=E: yeniden bağlanırken seq > N olan kaçırılmış event'ler önce
+    # gönderilir (E son event'teki epoch; farklıysa resync gelir)
+    await hub.connect_public(ws, batch=batch, last_seq=last_seq, last_epoch=last_epoch)
     try:
-        await hold_connection(ws)
+        await hold_connection(ws, hub)
     finally:
         await hub.disconnect_public(ws)
 
@@ -24,9 +31,12 @@ async def ws_user_room(
     user_id: int,
     ws: WebSocket,
     hub: Annotated[WebSocketHub, Depends(get_ws_hub)],
+    batch: bool = False,
+    last_seq: Optional[int] = None,
+    last_epoch: Optional[str] = None,
 ):
-    await hub.connect_user(user_id, ws)
+    await hub.connect_user(user_id, ws, batch=batch, last_seq=last_seq, last_epoch=last_epoch)
     try:
-        await hold_connection(ws)
+        await hold_connection(ws, hub)
     finally:
         await hub.disconnect_user(user_id, ws)
@@ -0,0 +1,70 @@
+"""
+Bakım komutları (backend/ dizininde):
+
+    PYTHONPATH=src python -m worktracker.cli stats-check    # sayaçlar tasks ile tutarlı mı?
+    PYTHONPATH=src python -m worktracker.cli stats-rebuild  # sayaçları tasks'tan yeniden hesapla
+
+stats-check tutarsızlık bulursa farkları yazar ve 1 ile çıkar (cron/CI'da kullanılabilir).
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from worktracker.core.db import engine
+from worktracker.repositories.counters import (
+    UNASSIGNED,
+    actual_counts_statement,
+    count_drift,
+    counters_statement,
+    rebuild_statements,
+)
+
+
+def stats_check(session: Session) -> int:
+    """Sayaç tablosunu tasks üzerindeki GROUP BY ile karşılaştırır (tam tarama)."""
+    if session.get_bind().dialect.name == "postgresql":
+        # İki okuma aynı snapshot'ı görsün (arada commit olan yazma yanlış alarm üretmesin)
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    stored = session.exec(counters_statement()).all()
+    actual = session.exec(actual_counts_statement()).all()
+    drift = count_drift(stored, actual)
+    for (key, status), (have, want) in sorted(drift.items(), key=lambda kv: (kv[0][0], kv[0][1])):
+        assignee = "unassigned" if key == UNASSIGNED else f"assignee={key}"
+        print(f"{assignee} status={status.value}: counter={have} actual={want}")
+    if drift:
+        print(f"{len(drift)} counter(s) out of sync; run stats-rebuild", file=sys.stderr)
+        return 1
+    print("task counters are consistent")
+    return 0
+
+
+def stats_rebuild(session: Session) -> int:
+    """Sayaçları tek transaction'da tasks'tan baştan yazar."""
+    if session.get_bind().dialect.name == "postgresql":
+        # Yeniden hesap sırasında task yazmaları beklesin (okumalar engellenmez)
+        session.exec(text("LOCK TABLE tasks IN SHARE MODE"))
+    for stmt in rebuild_statements():
+        session.exec(stmt)
+    session.commit()
+    print("task counters rebuilt")
+    return 0
+
+
+COMMANDS = {"stats-check": stats_check, "stats-rebuild": stats_rebuild}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="worktracker.cli")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+    with Session(engine) as session:
+        return COMMANDS[args.command](session)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
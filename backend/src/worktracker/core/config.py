@@ -7,6 +7,77 @@ load_dotenv()
 class Settings:
     # .env'den DATABASE_URL oku; yoksa local hızlı denemeler için sqlite'a düş
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./worktracker.db")
+    # Async engine için URL; boşsa DATABASE_URL'den türetilir
+    # (psycopg2 -> asyncpg, sqlite -> aiosqlite)
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # Bağlantı havuzu (primary ve her replica için ayrı): kalıcı bağlantı sayısı, yoğunlukta
+    # açılabilecek fazladan bağlantı, bağlantının en fazla yaşı (sn; sunucu/LB idle timeout'undan
+    # kısa olmalı) ve havuz doluyken bağlantı bekleme süresi (sn; aşılırsa istek hata alır)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Sorgu başına üst süre (ms; sadece PostgreSQL, 0: sınırsız)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # Havuz canlılık kontrolü: arka planda kaç sn'de bir SELECT 1 (0: kapalı) ve zaman aşımı (sn)
+    DB_HEALTHCHECK_INTERVAL: float = float(os.getenv("DB_HEALTHCHECK_INTERVAL", "30"))
+    DB_HEALTHCHECK_TIMEOUT: float = float(os.getenv("DB_HEALTHCHECK_TIMEOUT", "5"))
+    # Yavaş sorgu günlüğü (opsiyonel): eşik (ms) ve EXPLAIN alınacak yavaş sorgu oranı (0..1;
+    # PostgreSQL'de SELECT'ler için EXPLAIN (ANALYZE, BUFFERS), yani sorgu bir kez daha çalışır)
+    QUERY_PROFILER_ENABLED: bool = os.getenv("QUERY_PROFILER_ENABLED", "false").lower() in ("1", "true", "yes")
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    SLOW_QUERY_EXPLAIN_SAMPLE: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+    # İstek başına sorgu bütçesi: aşan istek uyarı loglar (0: kapalı). QUERY_COUNT_HEADER=true
+    # cevaplara X-Query-Count / X-Query-Time-Ms ekler (testlerde N+1 kontrolü için)
+    QUERY_BUDGET_PER_REQUEST: int = int(os.getenv("QUERY_BUDGET_PER_REQUEST", "0"))
+    QUERY_COUNT_HEADER: bool = os.getenv("QUERY_COUNT_HEADER", "false").lower() in ("1", "true", "yes")
+    # Okuma replica'ları (virgülle ayrılmış URL'ler; boşsa tüm okumalar primary'ye gider).
+    # GET endpoint'leri bunlar arasında round-robin dağılır; bağlanılamayan replica
+    # DATABASE_REPLICA_RETRY_SECONDS boyunca atlanır, hiçbiri yoksa primary kullanılır.
+    DATABASE_REPLICA_URLS: list[str] = [
+        u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()
+    ]
+    DATABASE_REPLICA_RETRY_SECONDS: float = float(os.getenv("DATABASE_REPLICA_RETRY_SECONDS", "30"))
+    # Replica'ya bağlanma zaman aşımı (sn; sadece PostgreSQL): düşmüş replica isteği bekletmesin
+    DATABASE_REPLICA_CONNECT_TIMEOUT: float = float(os.getenv("DATABASE_REPLICA_CONNECT_TIMEOUT", "2"))
+    # Yazan istemcinin okumaları bu kadar sn primary'ye gider (replication lag'e karşı; cookie ile)
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+    # WebSocket hub event kuyruğu: kapasite ve dolunca uygulanacak politika
+    # (drop_oldest: en eskiyi at / drop_newest: yeni geleni at)
+    WS_EVENT_QUEUE_SIZE: int = int(os.getenv("WS_EVENT_QUEUE_SIZE", "1000"))
+    WS_EVENT_OVERFLOW: str = os.getenv("WS_EVENT_OVERFLOW", "drop_oldest")
+    # Bağlantı başına giden buffer, yavaş istemci politikası
+    # (drop_oldest: eski frame'leri at / disconnect: bağlantıyı kopar) ve gönderim zaman aşımı (sn)
+    WS_CLIENT_BUFFER_SIZE: int = int(os.getenv("WS_CLIENT_BUFFER_SIZE", "256"))
+    WS_SLOW_CONSUMER_POLICY: str = os.getenv("WS_SLOW_CONSUMER_POLICY", "drop_oldest")
+    WS_SEND_TIMEOUT: float = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+    # Worker'lar arası event taşıma: none (tek worker) | postgres (LISTEN/NOTIFY) | memory
+    WS_BACKPLANE: str = os.getenv("WS_BACKPLANE", "none")
+    # batch=true ile bağlanan istemciler için toplu frame penceresi (ms; 0 -> kapalı),
+    # en fazla bekleme süresi (ms) ve frame başına en fazla event
+    WS_BATCH_WINDOW_MS: int = int(os.getenv("WS_BATCH_WINDOW_MS", "50"))
+    WS_BATCH_MAX_LATENCY_MS: int = int(os.getenv("WS_BATCH_MAX_LATENCY_MS", "250"))
+    WS_BATCH_MAX_EVENTS: int = int(os.getenv("WS_BATCH_MAX_EVENTS", "100"))
+    # Bir soketin abone olabileceği en fazla konu sayısı (subscribe mesajları)
+    WS_MAX_TOPICS_PER_CONNECTION: int = int(os.getenv("WS_MAX_TOPICS_PER_CONNECTION", "500"))
+    # ?last_seq=N ile yeniden bağlananlara replay için bellekte tutulan son event sayısı (0: kapalı)
+    WS_REPLAY_BUFFER_SIZE: int = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "1000"))
+
+    # GET /metrics (Prometheus metin formatı) ve istek/DB/WS ölçümleri: aç/kapa
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # Cache invalidation'ın worker'lar arası kanalı: none | postgres (LISTEN/NOTIFY) | memory
+    CACHE_BACKPLANE: str = os.getenv("CACHE_BACKPLANE", "none")
+    # Task/User read-through cache (LRU + TTL): aç/kapa, kayıt sayısı üst sınırı (tür başına), TTL (sn).
+    # Varsayılan: sadece CACHE_BACKPLANE=postgres ise açık. none/memory'de cache her worker'da ayrı
+    # tutulur (memory kanalı süreç içidir) ve diğer worker'ların yazmalarını TTL dolana kadar
+    # görmez (bayat okuma / 304).
+    CACHE_ENABLED: bool = os.getenv(
+        "CACHE_ENABLED", "true" if CACHE_BACKPLANE == "postgres" else "false"
+    ).lower() in ("1", "true", "yes")
+    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", "10000"))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "30"))
 
 # Uygulama genelinde import edip kullanacağımız tekil config nesnesi
 settings = Settings()
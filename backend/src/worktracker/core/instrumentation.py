@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .metrics import registry
+
+# SQLAlchemy engine olayları ile sorgu sayısı/süresi. İstek başına toplamlar
+# ContextVar'daki RequestQueries'te birikir (middleware track_queries ile açar);
+# async engine'lerde de sorgu isteğin context'inde (greenlet) çalıştığından görünür.
+
+DB_QUERIES = registry.counter(
+    "worktracker_db_queries_total", "SQL statements executed", ("db",)
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "worktracker_db_query_duration_seconds", "SQL statement execution time", ("db",)
+)
+
+
+@dataclass
+class RequestQueries:
+    """Bir istekte çalışan sorgu sayısı ve toplam DB süresi (sn)."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("worktracker_request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[RequestQueries]:
+    """
+    Blok içinde (aynı context'te) çalışan sorguları sayar. İç içe çağrılırsa dıştaki
+    sayacı paylaşır (metrik ve sorgu bütçesi middleware'leri aynı toplamı görür).
+    """
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+    stats = RequestQueries()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Engine'e sorgu sayacı/süre olaylarını bağlar. Async engine için
+    engine.sync_engine verilir. name metrik etiketidir (primary, replica0, ...).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._wt_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._wt_query_start
+        DB_QUERIES.inc(db=name)
+        DB_QUERY_SECONDS.observe(elapsed, db=name)
+        stats = _current.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
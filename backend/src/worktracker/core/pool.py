@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from .config import settings
+
+# Bağlantı havuzu: Settings'ten boyutlandırma, checkout bekleme ölçümü, açılışta
+# ısıtma ve istek yolundan ayrılmış canlılık kontrolü (pool_pre_ping yerine).
+
+logger = logging.getLogger(__name__)
+
+
+class PoolWaitStats:
+    """Havuzdan bağlantı alma (checkout) süreleri; stats() ile okunur."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+
+class _WaitTimingMixin:
+    """
+    QueuePool._do_get'i sarar: boş bağlantı beklemesi + gerekirse yeni bağlantı açma
+    süresi ölçülür. recreate() (engine.dispose) sayaçları yeni havuza taşır.
+    """
+
+    wait_stats: PoolWaitStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        new = super().recreate()
+        new.wait_stats = self.wait_stats
+        return new
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    create_engine/create_async_engine için havuz ve bağlantı ayarları.
+    Sadece QueuePool kullanan URL'lerde havuz boyutlandırılır; SQLite :memory:
+    (SingletonThreadPool/StaticPool) varsayılanında kalır.
+    statement_timeout sadece PostgreSQL'de, bağlantı açılırken oturuma yazılır.
+    """
+    u = make_url(url)
+    options: Dict[str, Any] = {}
+    default_pool = u.get_dialect().get_pool_class(u)
+    if issubclass(default_pool, QueuePool):
+        async_pool = issubclass(default_pool, AsyncAdaptedQueuePool)
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if async_pool else InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    if u.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if u.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    """Havuzun anlık doluluğu ve checkout bekleme sayaçları (boyutlandırma için)."""
+    if not isinstance(pool, QueuePool):
+        return {"class": type(pool).__name__}
+    stats: Dict[str, Any] = {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # QueuePool.overflow() havuz dolmadan negatiftir; açık fazladan bağlantı sayısı
+        "overflow": max(pool.overflow(), 0),
+    }
+    wait = getattr(pool, "wait_stats", None)
+    if wait is not None:
+        stats.update(
+            checkouts=wait.checkouts,
+            timeouts=wait.timeouts,
+            wait_total_ms=round(wait.wait_total * 1000, 3),
+            wait_avg_ms=round(wait.wait_total * 1000 / wait.checkouts, 3) if wait.checkouts else 0.0,
+            wait_max_ms=round(wait.wait_max * 1000, 3),
+        )
+    return stats
+
+
+async def prewarm(engine: AsyncEngine, size: Optional[int] = None) -> int:
+    """
+    Havuzun asgari bağlantılarını (pool_size) açılışta eşzamanlı açıp geri bırakır;
+    ilk isteklerin bağlantı kurma gecikmesi ödememesi için. Açılan bağlantı sayısını döner.
+    """
+    pool = engine.pool
+    if size is None:
+        size = pool.size() if isinstance(pool, QueuePool) else 1
+    results = await asyncio.gather(*(engine.connect() for _ in range(size)), return_exceptions=True)
+    opened = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning("Pool prewarm connection failed: %s", result)
+            continue
+        opened += 1
+        await result.close()
+    return opened
+
+
+def probe_engine(engine: AsyncEngine) -> AsyncEngine:
+    """
+    engine ile aynı DB'ye havuzsuz (NullPool) engine: canlılık kontrolü her seferinde
+    yeni bağlantı açar. Havuzdan alsaydı, dolu (meşgul) havuzun checkout beklemesi
+    DB'nin düşmesiyle karışırdı.
+    """
+    return create_async_engine(engine.url, poolclass=NullPool)
+
+
+async def ping(engine: AsyncEngine, *, timeout: float) -> bool:
+    """engine'den bir bağlantıyla SELECT 1; zaman aşımı ya da DB hatası False döner."""
+    try:
+        async with asyncio.timeout(timeout):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+    except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+        return False
+    return True
+
+
+class PoolHealthChecker:
+    """
+    Havuzların canlılığını arka planda, interval saniyede bir kontrol eder; böylece
+    her checkout'ta ping (pool_pre_ping) yapılmaz. Ping havuzun dışından, ayrı bir
+    bağlantıyla yapılır (bkz. probe_engine). Kontrol başarısızsa engine.dispose()
+    ile havuzdaki bağlantılar atılır (failover/restart sonrası bayat bağlantılar isteklere
+    dağıtılmasın) ve on_failure çağrılır (ör. replica'yı devreden çıkarmak için).
+    Bağlantıların sunucu/LB tarafında sessizce kapanmasına karşı pool_recycle kullanılır.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        *,
+        interval: float,
+        timeout: float,
+        on_failure=None,
+        on_success=None,
+    ) -> None:
+        self.engines = list(engines)
+        self._probes = [probe_engine(engine) for engine in self.engines]
+        self.interval = interval
+        self.timeout = timeout
+        self._on_failure = on_failure
+        self._on_success = on_success
+        self._task: Optional[asyncio.Task] = None
+        self._healthy = [True] * len(self.engines)
+        # sayaçlar (stats() ile okunur)
+        self._checks = 0
+        self._failures = 0
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0 and self.engines:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def check(self) -> None:
+        for index, engine in enumerate(self.engines):
+            self._checks += 1
+            ok = await ping(self._probes[index], timeout=self.timeout)
+            if ok:
+                if not self._healthy[index]:
+                    logger.info("Database pool %s is reachable again", index)
+                self._healthy[index] = True
+                if self._on_success is not None:
+                    self._on_success(engine)
+                continue
+            self._failures += 1
+            if self._healthy[index]:
+                logger.warning("Database pool %s failed liveness check; disposing connections", index)
+            self._healthy[index] = False
+            await engine.dispose()
+            if self._on_failure is not None:
+                self._on_failure(engine)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:  # kontrol döngüsü ölmesin
+                logger.exception("Database liveness check crashed")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checks": self._checks,
+            "failures": self._failures,
+            "unhealthy": self._healthy.count(False),
+        }
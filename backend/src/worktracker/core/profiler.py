@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Yavaş sorgu günlüğü (QUERY_PROFILER_ENABLED): eşiği aşan ifadeler, parametre
+# değerleri değil şekilleri ile (kişisel veri log'a düşmesin) loglanır; bir örneklemi
+# için aynı bağlantıda, aynı transaction içinde EXPLAIN alınır.
+
+logger = logging.getLogger("worktracker.sql.slow")
+
+_WHITESPACE = re.compile(r"\s+")
+_MAX_STATEMENT_CHARS = 4000
+# EXPLAIN alınabilen ifadeler (DDL, PRAGMA vb. atlanır)
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def _value_shape(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes, list, tuple)):
+        # uzunluk plan için önemli olabilir (IN listeleri, uzun metinler)
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any, *, executemany: bool = False) -> Any:
+    """Bağlı parametrelerin tip/uzunluk özeti: {"id_1": "int", "title": "str[12]"}."""
+    if executemany:
+        rows = list(parameters or ())
+        first = parameter_shape(rows[0]) if rows else None
+        return {"rows": len(rows), "first": first}
+    if isinstance(parameters, dict):
+        return {key: _value_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_value_shape(value) for value in parameters]
+    return _value_shape(parameters)
+
+
+def _is_read(statement: str) -> bool:
+    upper = statement.lstrip().upper()
+    if upper.startswith("SELECT"):
+        return True
+    if upper.startswith("WITH"):
+        # yazan CTE'ler (WITH ... UPDATE/INSERT/DELETE) de yazmadır
+        return not any(word in upper for word in ("INSERT ", "UPDATE ", "DELETE "))
+    return False
+
+
+def _explain_prefix(dialect: str, statement: str) -> Optional[str]:
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    if dialect == "postgresql":
+        # ANALYZE ifadeyi gerçekten çalıştırır: yazmalarda sadece tahmini plan
+        return "EXPLAIN (ANALYZE, BUFFERS) " if _is_read(statement) else "EXPLAIN "
+    if dialect == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return None
+
+
+class QueryProfiler:
+    """
+    threshold saniyeyi aşan ifadeleri loglar; explain_sample olasılıkla planı da ekler.
+    EXPLAIN ayrı bir DBAPI cursor'ı ile aynı bağlantıda çalışır (asıl cursor'ın
+    sonuçlarına dokunmaz). PostgreSQL'de SAVEPOINT içinde çalışır: EXPLAIN hata
+    verirse isteğin transaction'ı bozulmaz.
+    """
+
+    def __init__(self, *, threshold: float, explain_sample: float = 0.0) -> None:
+        self.threshold = threshold
+        self.explain_sample = explain_sample
+        # sayaçlar (stats() ile okunur)
+        self._slow = 0
+        self._explained = 0
+        self._explain_failures = 0
+
+    def attach(self, engine: Engine, name: str) -> None:
+        """Async engine için engine.sync_engine verilir; name log etiketidir."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            context._wt_profile_start = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - context._wt_profile_start
+            if elapsed >= self.threshold:
+                self._on_slow(conn, name, statement, parameters, executemany, elapsed)
+
+    def _on_slow(self, conn, name, statement, parameters, executemany, elapsed) -> None:
+        self._slow += 1
+        plan = None
+        if not executemany and self.explain_sample > 0 and random.random() < self.explain_sample:
+            plan = self._explain(conn, statement, parameters)
+        text = _WHITESPACE.sub(" ", statement).strip()[:_MAX_STATEMENT_CHARS]
+        shape = parameter_shape(parameters, executemany=executemany)
+        logger.warning(
+            "Slow query on %s (%.1f ms): %s params=%s%s",
+            name,
+            elapsed * 1000,
+            text,
+            shape,
+            f"\n{plan}" if plan else "",
+        )
+
+    def _explain(self, conn, statement: str, parameters: Any) -> Optional[str]:
+        dialect = conn.dialect.name
+        prefix = _explain_prefix(dialect, statement)
+        if prefix is None:
+            return None
+        cursor = conn.connection.dbapi_connection.cursor()
+        savepoint = dialect == "postgresql"
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT worktracker_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT worktracker_explain")
+                raise
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT worktracker_explain")
+        except Exception as e:
+            self._explain_failures += 1
+            logger.debug("EXPLAIN failed: %s", e)
+            return None
+        finally:
+            cursor.close()
+        self._explained += 1
+        return "\n".join(_plan_lines(dialect, rows))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "slow_queries": self._slow,
+            "explained": self._explained,
+            "explain_failures": self._explain_failures,
+        }
+
+
+def _plan_lines(dialect: str, rows: List[Any]) -> List[str]:
+    if dialect == "sqlite":
+        # (id, parent, notused, detail)
+        return [str(row[-1]) for row in rows]
+    return [str(row[0]) for row in rows]
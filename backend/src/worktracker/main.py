@@ -1,12 +1,59 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from worktracker.api.consistency import ReadYourWritesMiddleware
+from worktracker.api.deps import get_entity_cache, get_ws_hub
+from worktracker.api.metrics import MetricsMiddleware, hub_collector
+from worktracker.api.profiling import QueryBudgetMiddleware
+from worktracker.core.config import settings
+from worktracker.core.db import db_pool_stats, replicas, start_db, stop_db
+from worktracker.core.metrics import CONTENT_TYPE, registry
 from worktracker.api.routers import tasks, users, ws
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # DB havuzları açılışta ısıtılır, canlılıkları arka planda izlenir; kapanışta kapatılır
+    await start_db()
+    # WS hub'ın event dispatcher'ı uygulama ile birlikte başlar/durur
+    hub = get_ws_hub()
+    await hub.start()
+    # Entity cache'in worker'lar arası invalidation dinleyicisi (cache kapalıysa None)
+    cache = get_entity_cache()
+    if cache is not None:
+        await cache.start()
+    try:
+        yield
+    finally:
+        if cache is not None:
+            await cache.stop()
+        await hub.stop()
+        await stop_db()
+
+
 #FastAPI uygulamasını başlat
-app = FastAPI(title="WorkTracker")
+app = FastAPI(title="WorkTracker", lifespan=lifespan)
+
+# Okuma replica'ları varsa: yazan istemcinin sonraki okumaları kısa süre primary'ye gitsin
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware, seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+# İstek başına sorgu bütçesi uyarısı / X-Query-Count başlığı (opsiyonel)
+if settings.QUERY_BUDGET_PER_REQUEST > 0 or settings.QUERY_COUNT_HEADER:
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        budget=settings.QUERY_BUDGET_PER_REQUEST,
+        header=settings.QUERY_COUNT_HEADER,
+    )
+
+# İstek süresi/DB sorgu metrikleri (en dışta: diğer middleware'lerin süresi de dahil)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    registry.add_collector(hub_collector(get_ws_hub()))
 
 # REST
 app.include_router(users.router)
@@ -17,4 +64,17 @@ app.include_router(ws.router)
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+# async: sayaçlar event loop thread'inde okunur (threadpool'da okunsa hub/havuz sözlükleri
+# okunurken değişebilirdi)
+@app.get("/health/db")
+async def health_db():
+    # Havuz doluluğu ve checkout bekleme süreleri (DB_POOL_SIZE/DB_MAX_OVERFLOW boyutlandırması için)
+    return db_pool_stats()
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # Prometheus scrape hedefi (text exposition 0.0.4)
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
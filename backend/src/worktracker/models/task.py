@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, Optional
 from enum import Enum
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 if TYPE_CHECKING:
@@ -12,11 +13,19 @@ class TaskStatus(str, Enum):
 
 class Task(SQLModel, table=True):
     __tablename__ = "tasks"
+    # Liste/filtre erişim kalıpları için bileşik index'ler (migration: df7a94c613ae)
+    __table_args__ = (
+        Index("ix_tasks_assignee_id_id", "assignee_id", "id"),
+        Index("ix_tasks_status_id", "status", "id"),
+        Index("ix_tasks_assignee_id_status_id", "assignee_id", "status", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
     description: Optional[str] = None
     status: TaskStatus = Field(default=TaskStatus.TODO)
+    # Satır sürümü: her update'te +1 (ETag / If-Match için; migration: 5b1e0c7d9a42)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
 
     # Many-to-One: bir task bir kullanıcıya atanabilir
     assignee_id: Optional[int] = Field(default=None, foreign_key="users.id")
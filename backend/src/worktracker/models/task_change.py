@@ -0,0 +1,23 @@
+from typing import Optional
+from sqlalchemy import BigInteger
+from sqlmodel import SQLModel, Field
+
+
+class TaskChange(SQLModel, table=True):
+    """
+    Task değişiklik günlüğü (GET /tasks/changes?since=<seq>).
+    Her create/update, task yazmasıyla aynı transaction'da buraya bir satır ekler.
+    Sıkıştırılmış tutulur: bir task'ın yeni değişikliği eski satırını siler, böylece
+    tablo en fazla task sayısı kadar büyür ve geride kalan istemci sadece değişen
+    task sayısı kadar satır okur.
+    """
+    __tablename__ = "task_changes"
+    # SQLite: AUTOINCREMENT olmadan silinen en büyük rowid yeniden kullanılabilir (seq geri gider)
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    # Monoton artan değişiklik sırası (istemcinin cursor'u)
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    task_id: int = Field(foreign_key="tasks.id", index=True)
+    # PostgreSQL'de cursor konumu: yazan transaction'ın id'si (+ taban); SQLite'ta boş
+    # (cursor seq'tir). Bkz. repositories/changes.py
+    cursor_pos: Optional[int] = Field(default=None, sa_type=BigInteger, index=True)
@@ -0,0 +1,17 @@
+from sqlmodel import SQLModel, Field
+
+from .task import TaskStatus
+
+
+class TaskCounter(SQLModel, table=True):
+    """
+    (assignee, status) başına task sayısı (GET /tasks/stats).
+    Task create/update'leri, task yazmasıyla aynı transaction'da ilgili satırları
+    artırır/azaltır; böylece istatistik okumak tasks tablosunu taramaz.
+    Atanmamış task'ler assignee_key=0 altında sayılır (PK NULL olamaz).
+    """
+    __tablename__ = "task_counters"
+
+    assignee_key: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    status: TaskStatus = Field(primary_key=True)
+    count: int = Field(default=0)
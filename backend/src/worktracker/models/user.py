@@ -11,6 +11,8 @@ class User(SQLModel, table=True):
     # email'i hem indeksli hem benzersiz yapıyoruz
     email: str = Field(index=True, unique=True)
     full_name: Optional[str] = None
+    # Satır sürümü: her update'te +1 (ETag / If-Match için; migration: 5b1e0c7d9a42)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
 
     # 1 kullanıcının birden çok task'ı olabilir
     tasks: List["Task"] = Relationship(back_populates="assignee")
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Protocol, runtime_checkable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .events import HubEvent
+
+logger = logging.getLogger(__name__)
+
+# Backplane'den gelen event'i hub'a teslim eden callback (loop thread'inde, senkron çağrılır)
+EventHandler = Callable[[HubEvent], None]
+
+BACKPLANE_NONE = "none"          # tek worker: event'ler doğrudan yerel soketlere gider
+BACKPLANE_MEMORY = "memory"      # süreç içi (testler / tek süreçte birden çok hub)
+BACKPLANE_POSTGRES = "postgres"  # Postgres LISTEN/NOTIFY (uvicorn --workers N)
+BACKPLANES = (BACKPLANE_NONE, BACKPLANE_MEMORY, BACKPLANE_POSTGRES)
+
+DEFAULT_CHANNEL = "worktracker_events"
+
+# Postgres NOTIFY payload'ı 8000 byte'tan kısa olmalı (aşarsa pg_notify hata verir)
+MAX_NOTIFY_PAYLOAD = 7999
+# Tek event'in bölünebileceği en fazla parça; aşan event backplane'e basılmaz
+MAX_CHUNKS = 64
+# Dinleyicide aynı anda yarım kalabilecek (parçaları eksik) mesaj sayısı
+MAX_PENDING_CHUNKED = 16
+
+# Parçalı mesaj öneki: "#<mesaj id> <sıra> <toplam> <veri>"; JSON "#" ile başlamaz
+_CHUNK_PREFIX = "#"
+
+
+class PayloadTooLargeError(ValueError):
+    """Event MAX_CHUNKS parçaya da sığmıyor."""
+    pass
+
+
+def encode_notifications(event: HubEvent, *, max_payload: int = MAX_NOTIFY_PAYLOAD) -> List[str]:
+    """
+    Event'i kanal mesajlarına çevirir. Sığıyorsa tek JSON mesajı; sığmıyorsa JSON
+    metni parçalanır ve her parça öneki ile ayrı mesaj olur (hepsi aynı transaction'da
+    gönderilir, dinleyici ChunkAssembler ile birleştirir). json.dumps ASCII üretir:
+    karakter sayısı byte sayısına eşittir.
+    """
+    wire = json.dumps(event.to_wire(), separators=(",", ":"))
+    if len(wire) <= max_payload:
+        return [wire]
+    message_id = uuid.uuid4().hex
+    # önek: "#" + 32 hex + iki sayı + üç boşluk
+    header = len(_CHUNK_PREFIX) + len(message_id) + 2 * len(str(MAX_CHUNKS)) + 3
+    size = max_payload - header
+    total = -(-len(wire) // size)
+    if total > MAX_CHUNKS:
+        raise PayloadTooLargeError(f"Backplane payload of {len(wire)} bytes needs {total} chunks")
+    return [
+        f"{_CHUNK_PREFIX}{message_id} {i} {total} {wire[i * size:(i + 1) * size]}"
+        for i in range(total)
+    ]
+
+
+class ChunkAssembler:
+    """
+    Kanal mesajlarını event'e çevirir; parçalı mesajları tamamlanınca birleştirir.
+    Tamamlanmayan mesajlar (ör. dinleyici arada koptu) sınırlı sayıda tutulur, en eskisi atılır.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_CHUNKED) -> None:
+        self._pending: "OrderedDict[str, Dict[int, str]]" = OrderedDict()
+        self._max_pending = max_pending
+
+    def feed(self, message: str) -> Optional[HubEvent]:
+        """Tam event hazırsa döner; parça bekleniyorsa None. Bozuk mesajda ValueError."""
+        if not message.startswith(_CHUNK_PREFIX):
+            return HubEvent.from_wire(json.loads(message))
+        message_id, raw_index, raw_total, data = message[len(_CHUNK_PREFIX):].split(" ", 3)
+        index, total = int(raw_index), int(raw_total)
+        # Sınır dışı sıra/toplam birleştirmede KeyError'a ya da sınırsız birikmeye yol açar
+        if not 0 <= index < total <= MAX_CHUNKS:
+            raise ValueError(f"Invalid chunk {index}/{total} for message {message_id}")
+        parts = self._pending.setdefault(message_id, {})
+        parts[index] = data
+        if len(parts) < total:
+            while len(self._pending) > self._max_pending:
+                self._pending.popitem(last=False)
+            return None
+        del self._pending[message_id]
+        return HubEvent.from_wire(json.loads("".join(parts[i] for i in range(total))))
+
+
+@runtime_checkable
+class Backplane(Protocol):
+    """
+    Worker'lar arası event taşıyıcısı (sözleşme).
+    - publish(): event'i TÜM worker'lara (kendisi dahil) iletir.
+    - start(on_event): gelen her event için on_event çağrılır; hub bunu
+      kendi yerel soketlerine dağıtır.
+    """
+
+    async def start(self, on_event: EventHandler) -> None: ...
+    async def publish(self, event: HubEvent) -> None: ...
+    async def stop(self) -> None: ...
+
+
+class InMemoryBus:
+    """InMemoryBackplane'lerin paylaştığı süreç içi yayın kanalı."""
+
+    def __init__(self) -> None:
+        self.subscribers: List[EventHandler] = []
+
+
+class InMemoryBackplane:
+    """
+    Süreç içi backplane: aynı InMemoryBus'a bağlı her hub (her "worker")
+    yayınlanan event'i alır. Testlerde çoklu worker davranışını taklit etmek için.
+    """
+
+    def __init__(self, bus: Optional[InMemoryBus] = None, *, max_payload: Optional[int] = None) -> None:
+        self.bus = bus or InMemoryBus()
+        # Verilirse mesajlar Postgres gibi bu boyuta göre parçalanır (ör. MAX_NOTIFY_PAYLOAD)
+        self.max_payload = max_payload
+        self.messages_sent = 0
+        self._handler: Optional[EventHandler] = None
+
+    async def start(self, on_event: EventHandler) -> None:
+        self._handler = on_event
+        self.bus.subscribers.append(on_event)
+
+    async def publish(self, event: HubEvent) -> None:
+        # Gerçek bir kanal gibi tel formatından geçir (payload paylaşımı olmasın)
+        if self.max_payload is None:
+            messages = [json.dumps(event.to_wire())]
+        else:
+            messages = encode_notifications(event, max_payload=self.max_payload)
+        self.messages_sent += len(messages)
+        for handler in list(self.bus.subscribers):
+            assembler = ChunkAssembler()
+            for message in messages:
+                received = assembler.feed(message)
+                if received is not None:
+                    handler(received)
+
+    async def stop(self) -> None:
+        if self._handler is not None and self._handler in self.bus.subscribers:
+            self.bus.subscribers.remove(self._handler)
+        self._handler = None
+
+
+class PostgresBackplane:
+    """
+    Postgres LISTEN/NOTIFY backplane (mevcut async engine üzerinde, asyncpg sürücüsü).
+    - Dinleme için havuzdan bir bağlantı ayrılır ve LISTEN açık tutulur.
+    - publish(): havuzdan bağlantı alıp pg_notify çağırır (NOTIFY commit'te teslim edilir).
+      8000 byte sınırını aşan event parçalara bölünür; parçalar tek transaction'da gider,
+      Postgres aynı transaction'ın bildirimlerini sırayla ve birlikte teslim eder.
+    - Dinleyici bağlantı koparsa arka planda yeniden bağlanır.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        channel: str = DEFAULT_CHANNEL,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        if engine.dialect.name != "postgresql" or engine.dialect.driver != "asyncpg":
+            raise ValueError("PostgresBackplane requires a postgresql+asyncpg engine")
+        self.engine = engine
+        self.channel = channel
+        self._reconnect_delay = reconnect_delay
+        self._handler: Optional[EventHandler] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._driver_conn = None
+        self._reconnector: Optional[asyncio.Task[None]] = None
+        self._stopping = False
+        self._assembler = ChunkAssembler()
+
+    async def start(self, on_event: EventHandler) -> None:
+        self._handler = on_event
+        self._stopping = False
+        await self._listen()
+
+    async def publish(self, event: HubEvent) -> None:
+        messages = encode_notifications(event)
+        async with self.engine.connect() as conn:
+            for payload in messages:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.channel, "payload": payload},
+                )
+            await conn.commit()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnector is not None:
+            self._reconnector.cancel()
+            self._reconnector = None
+        await self._close_listener()
+
+    # ---------- iç işler ----------
+
+    async def _listen(self) -> None:
+        # Kopan dinleyicinin yarım kalan parçaları bir daha tamamlanmaz
+        self._assembler = ChunkAssembler()
+        self._conn = await self.engine.connect()
+        raw = await self._conn.get_raw_connection()
+        self._driver_conn = raw.driver_connection  # asyncpg.Connection
+        await self._driver_conn.add_listener(self.channel, self._on_notify)
+        self._driver_conn.add_termination_listener(self._on_terminated)
+
+    async def _close_listener(self) -> None:
+        conn, self._conn = self._conn, None
+        driver, self._driver_conn = self._driver_conn, None
+        if driver is not None:
+            try:
+                await driver.remove_listener(self.channel, self._on_notify)
+            except Exception:
+                pass
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        if self._handler is None:
+            return
+        try:
+            event = self._assembler.feed(payload)
+        except (ValueError, KeyError):
+            logger.warning("Ignoring malformed backplane payload on %s", channel)
+            return
+        if event is not None:
+            self._handler(event)
+
+    def _on_terminated(self, connection) -> None:
+        if self._stopping or self._reconnector is not None:
+            return
+        logger.warning("Backplane listener connection lost; reconnecting")
+        self._reconnector = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        try:
+            await self._close_listener()
+            while not self._stopping:
+                try:
+                    await self._listen()
+                    return
+                except Exception:
+                    await asyncio.sleep(self._reconnect_delay)
+        finally:
+            self._reconnector = None
+
+
+def create_backplane(
+    kind: str,
+    engine: Optional[AsyncEngine] = None,
+    *,
+    channel: str = DEFAULT_CHANNEL,
+) -> Optional[Backplane]:
+    """Ayar değerinden backplane üretir; "none" için None (yerel dağıtım)."""
+    if kind == BACKPLANE_NONE:
+        return None
+    if kind == BACKPLANE_MEMORY:
+        return InMemoryBackplane()
+    if kind == BACKPLANE_POSTGRES:
+        if engine is None:
+            raise ValueError("Postgres backplane needs an async engine")
+        return PostgresBackplane(engine, channel=channel)
+    raise ValueError(f"Unknown backplane: {kind}")
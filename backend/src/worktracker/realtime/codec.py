@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional, Sequence
+
+# msgpack opsiyonel: kurulu değilse binary subprotocol müzakere edilmez, herkes JSON alır
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# İstemcinin Sec-WebSocket-Protocol başlığında isteyebileceği subprotocol'ler
+JSON_SUBPROTOCOL = "worktracker.json"
+MSGPACK_SUBPROTOCOL = "worktracker.msgpack"
+
+PROTOCOL_JSON = "json"
+PROTOCOL_MSGPACK = "msgpack"
+
+
+class Frame:
+    """
+    Bir event'in tel üstündeki hali; her protokol için en fazla BİR kez encode edilir
+    ve tüm alıcılar aynı str/bytes nesnesini paylaşır (istemci başına send_json yok).
+    """
+
+    __slots__ = ("payload", "_text", "_binary")
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.payload = payload
+        self._text: Optional[str] = None
+        self._binary: Optional[bytes] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            # Starlette'in send_json'u ile aynı biçim
+            self._text = json.dumps(self.payload, separators=(",", ":"), ensure_ascii=False)
+        return self._text
+
+    @property
+    def binary(self) -> bytes:
+        if self._binary is None:
+            self._binary = msgpack.packb(self.payload, use_bin_type=True)
+        return self._binary
+
+
+def negotiate_subprotocol(requested: Sequence[str]) -> tuple[Optional[str], str]:
+    """
+    İstemcinin önerdiği subprotocol listesinden birini seçer.
+    Döner: (accept'e verilecek subprotocol, hub içi protokol adı)
+    """
+    for name in requested:
+        if name == MSGPACK_SUBPROTOCOL and msgpack is not None:
+            return MSGPACK_SUBPROTOCOL, PROTOCOL_MSGPACK
+        if name == JSON_SUBPROTOCOL:
+            return JSON_SUBPROTOCOL, PROTOCOL_JSON
+    return None, PROTOCOL_JSON
+
+
+def decode_client_message(data: str | bytes, protocol: str) -> Any:
+    """
+    İstemciden gelen kontrol mesajını çözer (subscribe/unsubscribe vb.).
+    Text frame her zaman JSON; binary frame msgpack protokolünde MessagePack, değilse UTF-8 JSON.
+    Çözülemezse ValueError.
+    """
+    if isinstance(data, bytes):
+        if protocol == PROTOCOL_MSGPACK and msgpack is not None:
+            try:
+                return msgpack.unpackb(data, raw=False)
+            except Exception as e:
+                raise ValueError("Invalid MessagePack message") from e
+        data = data.decode("utf-8", errors="strict")
+    return json.loads(data)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Optional, Set
+
+from fastapi import WebSocket
+
+from .codec import Frame, PROTOCOL_JSON, PROTOCOL_MSGPACK
+
+# Yavaş tüketici (buffer'ı dolan bağlantı) politikası
+SLOW_CONSUMER_DROP_OLDEST = "drop_oldest"  # en eski frame'i at, bağlantı kalsın
+SLOW_CONSUMER_DISCONNECT = "disconnect"    # bağlantıyı kapat (istemci yeniden bağlanır)
+SLOW_CONSUMER_POLICIES = (SLOW_CONSUMER_DROP_OLDEST, SLOW_CONSUMER_DISCONNECT)
+
+# 1013: "Try Again Later" — yavaş tüketiciyi koparırken kullanılır (gönderim timeout'u dahil)
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+# 1011: "Internal Error" — gönderim hata verdiğinde
+WS_CLOSE_INTERNAL_ERROR = 1011
+
+
+class ClientConnection:
+    """
+    Tek bir WS bağlantısının giden tarafı.
+    - Hub, offer() ile mesajı sınırlı buffer'a koyar ve hemen döner.
+    - Her bağlantının kendi writer task'ı buffer'ı sırayla gönderir;
+      yavaş bir istemci sadece kendi kuyruğunu bekletir, diğerlerini değil.
+    - Gönderim send_timeout içinde bitmezse ya da hata alırsa soket kapatılır
+      (istemci yeniden bağlanıp replay isteyebilsin) ve on_close ile hub'a bildirilir.
+    - Buffer'da önceden encode edilmiş Frame'ler durur; protocol'e göre
+      text (JSON) ya da binary (MessagePack) gönderilir.
+    """
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        *,
+        buffer_size: int,
+        policy: str,
+        send_timeout: float,
+        protocol: str = PROTOCOL_JSON,
+        batched: bool = False,
+        room: Optional[int] = None,
+        on_close: Optional[Callable[["ClientConnection"], None]] = None,
+    ) -> None:
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.ws = ws
+        self.protocol = protocol
+        # batched: istemci toplu frame'e (type=batch) abone; room: kullanıcı odası (public için None)
+        self.batched = batched
+        self.room = room
+        # Konu abonelikleri; filtered=True ise public firehose yerine sadece bunlar gelir
+        self.topics: Set[str] = set()
+        self.filtered = False
+        self._buffer: Deque[Frame] = deque()
+        self._buffer_size = buffer_size
+        self._policy = policy
+        self._send_timeout = send_timeout
+        self._on_close = on_close
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        # Yavaş istemciyi kapatan task (referansı tutulmazsa çalışmadan toplanabilir)
+        self._closer: Optional[asyncio.Task[None]] = None
+
+        # sayaçlar (hub stats'ına toplanır)
+        self.dropped = 0
+        self.send_failures = 0
+        self.slow_disconnect = False
+
+        self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def offer(self, frame: Frame) -> bool:
+        """
+        Mesajı buffer'a ekler (beklemez). Bağlantı kapalıysa ya da
+        disconnect politikasıyla koparıldıysa False döner.
+        """
+        if self._closed:
+            return False
+        if len(self._buffer) >= self._buffer_size:
+            if self._policy == SLOW_CONSUMER_DISCONNECT:
+                self.slow_disconnect = True
+                self._shutdown(close_code=WS_CLOSE_TRY_AGAIN_LATER)
+                return False
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append(frame)
+        self._wakeup.set()
+        return True
+
+    async def aclose(self) -> None:
+        """Writer task'ını durdurur (istemci zaten ayrıldıysa çağrılır)."""
+        self._closed = True
+        self._writer.cancel()
+        try:
+            await self._writer
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    async def _send(self, frame: Frame) -> None:
+        # Frame.text / Frame.binary ilk erişimde bir kez encode edilip cache'lenir
+        if self.protocol == PROTOCOL_MSGPACK:
+            await self.ws.send_bytes(frame.binary)
+        else:
+            await self.ws.send_text(frame.text)
+
+    async def _write_loop(self) -> None:
+        try:
+            while not self._closed:
+                if not self._buffer:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                frame = self._buffer.popleft()
+                # asyncio.timeout (3.11+): wait_for gibi her mesaj için ayrı task açmaz
+                async with asyncio.timeout(self._send_timeout):
+                    await self._send(frame)
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError:
+            # Gönderim send_timeout'u aştı: yavaş istemci gibi kopar
+            self.send_failures += 1
+            self._shutdown(close_code=WS_CLOSE_TRY_AGAIN_LATER)
+        except Exception:
+            # Gönderim hatası: bu soket artık ölü sayılır
+            self.send_failures += 1
+            self._shutdown(close_code=WS_CLOSE_INTERNAL_ERROR)
+
+    def _shutdown(self, *, close_code: int) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._buffer.clear()
+        if asyncio.current_task() is not self._writer:
+            self._writer.cancel()
+        # Soketi kapat ki endpoint'teki hold_connection da sonlansın; açık kalırsa hub'dan
+        # çıkarılmış istemci hiçbir şey almadan bağlı kalır ve yeniden bağlanmaz
+        self._closer = asyncio.get_running_loop().create_task(self._close_ws(close_code))
+        if self._on_close is not None:
+            self._on_close(self)
+
+    async def _close_ws(self, code: int) -> None:
+        try:
+            # Gönderimi takılan sokette close frame'i de takılabilir
+            async with asyncio.timeout(self._send_timeout):
+                await self.ws.close(code=code)
+        except Exception:
+            pass
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class HubEvent:
+    """
+    Hub kuyruğundaki tek bir yayın.
+    - payload: istemciye gidecek JSON gövdesi
+    - rooms: public odaya ek olarak hangi kullanıcı odalarına gideceği
+    - topics: abonelik konuları ("task:5", "assignee:3", "status:DONE"); bu konulara
+      abone soketler de event'i alır (bkz. realtime/topics.py)
+    - relayed: event backplane'den geldiyse True (tekrar backplane'e basılmaz,
+      sadece bu worker'ın soketlerine dağıtılır)
+    """
+    payload: Dict[str, Any]
+    rooms: Tuple[int, ...] = ()
+    topics: Tuple[str, ...] = ()
+    relayed: bool = False
+
+    def to_wire(self) -> Dict[str, Any]:
+        """Backplane üzerinden taşınacak sade sözlük (relayed taşınmaz)."""
+        return {"payload": self.payload, "rooms": list(self.rooms), "topics": list(self.topics)}
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> "HubEvent":
+        return cls(
+            payload=data["payload"],
+            rooms=tuple(data.get("rooms") or ()),
+            topics=tuple(data.get("topics") or ()),
+            relayed=True,
+        )
+
+
+def _coalesce_key(payload: Dict[str, Any]) -> Optional[tuple]:
+    # Aynı kaynağın tekrarlanan "updated" event'leri tek event'e indirgenebilir
+    kind = payload.get("type")
+    if kind == "task_updated":
+        return (kind, payload.get("task_id"))
+    if kind == "user_updated":
+        return (kind, payload.get("user_id"))
+    return None
+
+
+def coalesce(events: List[HubEvent]) -> List[HubEvent]:
+    """
+    Pencere içindeki event'leri sadeleştirir: aynı task_id/user_id için
+    tekrarlanan *_updated event'lerinden sadece SONUNCUSU (kendi sırasında) kalır.
+    Atılan event'lerin oda ve konuları kalan event'e eklenir: ara güncellemede
+    hedeflenen (ör. task'ten sonra ayrılan eski assignee) alıcı son durumu yine alır.
+    Diğer event'ler olduğu gibi korunur.
+    """
+    kept_at: Dict[tuple, int] = {}
+    kept: List[HubEvent] = []
+    for event in reversed(events):
+        key = _coalesce_key(event.payload)
+        if key is None:
+            kept.append(event)
+            continue
+        if key not in kept_at:
+            kept_at[key] = len(kept)
+            kept.append(event)
+            continue
+        i = kept_at[key]
+        later = kept[i]
+        kept[i] = replace(
+            later,
+            rooms=_merge(later.rooms, event.rooms),
+            topics=_merge(later.topics, event.topics),
+        )
+    kept.reverse()
+    return kept
+
+
+def _merge(current: Tuple, extra: Tuple) -> Tuple:
+    # Sırayı koruyarak birleşim (çoğu durumda extra zaten current'ın alt kümesi)
+    return current + tuple(x for x in extra if x not in current)
@@ -1,42 +1,253 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Dict, Set, Optional
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, List, Sequence, Set, Optional, Tuple
 
 import anyio
 from fastapi import WebSocket, WebSocketDisconnect
 
+from worktracker.core.metrics import Histogram
+
+from .backplane import Backplane
+from .codec import Frame, decode_client_message, negotiate_subprotocol
+from .events import HubEvent, coalesce
+from .connection import ClientConnection, SLOW_CONSUMER_DROP_OLDEST, SLOW_CONSUMER_POLICIES
+from .topics import InvalidTopicError, parse_topic, task_topics, user_topics
+
+logger = logging.getLogger(__name__)
+
+# Toplu publish'lerde task başına (task_id, assignee_id, status)
+TaskRef = Tuple[int, Optional[int], Optional[str]]
+
+# Kuyruk dolduğunda uygulanacak politika
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # en eski event'i at, yenisini kuyruğa al
+OVERFLOW_DROP_NEWEST = "drop_newest"  # yeni gelen event'i at
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
 
 class WebSocketHub:
     """
     Basit WS hub:
       - public oda: /ws
       - kullanıcı odası: /ws/users/{user_id}
-    Servis içinden sync çağrılan publish_* metodları,
-    içeride async yayınları güvenle tetikler (anyio.from_thread.run).
+      - konu abonelikleri: {"op": "subscribe", "topics": [...]} (bkz. handle_client_message)
+    publish_* metodları event'i sınırlı bir kuyruğa bırakıp hemen döner; yayını arka
+    plandaki dispatcher, gönderimi bağlantı başına writer task'ları yapar (ClientConnection).
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        queue_size: int = 1000,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+        client_buffer_size: int = 256,
+        slow_consumer_policy: str = SLOW_CONSUMER_DROP_OLDEST,
+        send_timeout: float = 5.0,
+        backplane: Optional[Backplane] = None,
+        batch_window: float = 0.05,
+        batch_max_latency: float = 0.25,
+        batch_max_events: int = 100,
+        max_topics_per_connection: int = 500,
+        replay_buffer_size: int = 1000,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer_policy}")
         self._public_clients: Set[WebSocket] = set()
         self._user_rooms: Dict[int, Set[WebSocket]] = {}
+        self._connections: Dict[WebSocket, ClientConnection] = {}
+        # ters index: konu -> o konuya abone soketler
+        self._topic_index: Dict[str, Set[WebSocket]] = {}
+        self._max_topics = max_topics_per_connection
         self._lock = asyncio.Lock()
 
+        self._client_buffer_size = client_buffer_size
+        self._slow_consumer_policy = slow_consumer_policy
+        self._send_timeout = send_timeout
+        self._backplane = backplane
+
+        # toplu frame penceresi: son event'ten batch_window sonra ya da ilk event'ten
+        # batch_max_latency sonra (hangisi önce) ya da batch_max_events dolunca gönderilir
+        self._batch_window = batch_window
+        self._batch_max_latency = batch_max_latency
+        self._batch_max_events = batch_max_events
+        self._batch_pending: List[HubEvent] = []
+        self._batch_first = 0.0
+        self._batch_last = 0.0
+        self._batch_timer: Optional[asyncio.Task[None]] = None
+
+        # son dağıtılan event'in sırası + yeniden bağlananlar için halka buffer
+        # (seq'ler ardışık olduğundan buffer'daki konum seq'ten hesaplanır)
+        self._seq = 0
+        # seq'in ait olduğu dizi: başka bir hub'ın (worker/süreç) seq'i bununla karşılaştırılamaz
+        self.epoch = uuid.uuid4().hex[:16]
+        self._replay_buffer: Deque[HubEvent] = deque(maxlen=max(replay_buffer_size, 0))
+
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._queue: Optional[asyncio.Queue[HubEvent]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatcher: Optional[asyncio.Task[None]] = None
+        # Arka planda başlatılan flush/eviction task'ları: loop task'lara sadece zayıf
+        # referans tutar; burada tutulmazlarsa çalışmadan toplanabilirler
+        self._background: Set[asyncio.Task[None]] = set()
+
+        # sayaçlar (stats() ile okunur)
+        self._queued = 0
+        self._dropped = 0
+        self._dispatched = 0
+        self._client_frames_dropped = 0
+        self._slow_disconnects = 0
+        self._send_failures = 0
+        self._batches_sent = 0
+        self._events_coalesced = 0
+        self._replays = 0
+        self._events_replayed = 0
+        self._resyncs = 0
+        self._dead_evictions = 0
+        self._backplane_failures = 0
+        self._dispatch_errors = 0
+        # _broadcast_json süresi: frame'in tüm alıcıların buffer'ına bırakılması (GET /metrics)
+        self.fanout_seconds = Histogram(
+            "worktracker_ws_fanout_duration_seconds",
+            "Time to hand one hub frame to all recipient connections",
+            buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+        )
+
+    # ---------- yaşam döngüsü ----------
+
+    async def start(self) -> None:
+        """Dispatcher task'ını (ve varsa backplane dinleyicisini) başlatır (lifespan'de çağrılır)."""
+        self._ensure_dispatcher()
+        if self._backplane is not None:
+            await self._backplane.start(self._on_backplane_event)
+
+    async def stop(self) -> None:
+        """Dispatcher ve arka plan task'larını durdurur; kuyrukta kalan event'ler atılır."""
+        if self._backplane is not None:
+            await self._backplane.stop()
+        timer, self._batch_timer = self._batch_timer, None
+        if timer is not None:
+            timer.cancel()
+        self._batch_pending.clear()
+        background, self._background = self._background, set()
+        for pending in background:
+            pending.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        task, self._dispatcher = self._dispatcher, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._queue = None
+        self._loop = None
+
+    def _ensure_dispatcher(self) -> None:
+        # Event loop içinde çağrılmalı; lifespan yoksa ilk publish'te tembel başlar
+        if self._dispatcher is not None and not self._dispatcher.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._dispatcher = self._loop.create_task(self._dispatch_loop())
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Sayaçlar: kuyruk (queued / dropped / dispatched, anlık derinlik, backplane'e
+        basılamayan ve dağıtımda hata veren event'ler),
+        bağlantı tarafı (yavaş istemcide atılan frame, koparılan istemci, gönderim hatası,
+        kapalı bulunup çıkarılan soket) ve replay (son seq, buffer doluluğu, replay / resync sayıları).
+        """
+        live = list(self._connections.values())
+        return {
+            "queued": self._queued,
+            "dropped": self._dropped,
+            "dispatched": self._dispatched,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "connections": len(live),
+            "client_frames_dropped": self._client_frames_dropped + sum(c.dropped for c in live),
+            "slow_disconnects": self._slow_disconnects,
+            "send_failures": self._send_failures + sum(c.send_failures for c in live),
+            "dead_evictions": self._dead_evictions,
+            "backplane_failures": self._backplane_failures,
+            "dispatch_errors": self._dispatch_errors,
+            "batches_sent": self._batches_sent,
+            "events_coalesced": self._events_coalesced,
+            "seq": self._seq,
+            "replay_buffered": len(self._replay_buffer),
+            "replays": self._replays,
+            "events_replayed": self._events_replayed,
+            "resyncs": self._resyncs,
+        }
+
+    def connection_counts(self) -> Dict[str, int]:
+        """
+        Oda türüne göre bağlı soket: public (firehose), user (kullanıcı odaları) ve
+        topics (sadece konu aboneliği olan, odasız soketler).
+        """
+        return {
+            "public": len(self._public_clients),
+            "user": sum(len(room) for room in self._user_rooms.values()),
+            "topics": sum(
+                1 for c in self._connections.values() if c.filtered and c.room is None
+            ),
+        }
+
+    def user_room_count(self) -> int:
+        return len(self._user_rooms)
+
     # ---------- bağlan/ayrıl ----------
 
-    async def connect_public(self, ws: WebSocket) -> None:
-        await ws.accept()
+    async def connect_public(
+        self,
+        ws: WebSocket,
+        *,
+        batch: bool = False,
+        last_seq: Optional[int] = None,
+        last_epoch: Optional[str] = None,
+    ) -> None:
+        protocol = await self._accept(ws)
         async with self._lock:
+            conn = self._open_connection(ws, protocol, batch=batch)
             self._public_clients.add(ws)
+            if last_seq is not None:
+                self._replay(conn, last_seq, last_epoch)
 
     async def disconnect_public(self, ws: WebSocket) -> None:
         async with self._lock:
             self._public_clients.discard(ws)
+            conn = self._connections.pop(ws, None)
+            if conn is not None:
+                self._unindex(ws, conn.topics)
+        if conn is not None:
+            self._collect(conn)
+            await conn.aclose()
 
-    async def connect_user(self, user_id: int, ws: WebSocket) -> None:
-        await ws.accept()
+    async def connect_user(
+        self,
+        user_id: int,
+        ws: WebSocket,
+        *,
+        batch: bool = False,
+        last_seq: Optional[int] = None,
+        last_epoch: Optional[str] = None,
+    ) -> None:
+        protocol = await self._accept(ws)
         async with self._lock:
+            conn = self._open_connection(ws, protocol, batch=batch, room=user_id)
             room = self._user_rooms.setdefault(user_id, set())
             room.add(ws)
+            if last_seq is not None:
+                self._replay(conn, last_seq, last_epoch)
 
     async def disconnect_user(self, user_id: int, ws: WebSocket) -> None:
         async with self._lock:
@@ -45,83 +256,513 @@ class WebSocketHub:
                 room.discard(ws)
                 if not room:
                     self._user_rooms.pop(user_id, None)
+            conn = self._connections.pop(ws, None)
+            if conn is not None:
+                self._unindex(ws, conn.topics)
+        if conn is not None:
+            self._collect(conn)
+            await conn.aclose()
+
+    async def _accept(self, ws: WebSocket) -> str:
+        # Sec-WebSocket-Protocol müzakeresi: worktracker.msgpack isteyen binary frame alır
+        subprotocol, protocol = negotiate_subprotocol(ws.scope.get("subprotocols") or [])
+        await ws.accept(subprotocol=subprotocol)
+        return protocol
+
+    def _open_connection(
+        self,
+        ws: WebSocket,
+        protocol: str,
+        *,
+        batch: bool = False,
+        room: Optional[int] = None,
+    ) -> ClientConnection:
+        conn = ClientConnection(
+            ws,
+            buffer_size=self._client_buffer_size,
+            policy=self._slow_consumer_policy,
+            send_timeout=self._send_timeout,
+            protocol=protocol,
+            # batch penceresi kapalıysa istemcinin isteği yok sayılır (tekil frame alır)
+            batched=batch and self._batch_window > 0,
+            room=room,
+            on_close=self._on_connection_closed,
+        )
+        self._connections[ws] = conn
+        return conn
+
+    def _replay(self, conn: ClientConnection, last_seq: int, last_epoch: Optional[str]) -> None:
+        """
+        Yeniden bağlanan istemciye seq > last_seq olan event'leri buffer'dan gönderir.
+        last_seq başka bir epoch'a aitse (ya da epoch bilinmiyorsa) karşılaştırılamaz: resync.
+        Lock altında, bağlantı odalara eklendikten hemen sonra çağrılır: buffer'daki her
+        event bu soketi hedeflemeden dağıtılmıştır, sonrakiler zaten canlı gelir; replay
+        frame'leri canlı frame'lerden önce buffer'a girdiği için sıra bozulmaz.
+        Konu abonelikleri bağlantıdan sonra kurulduğundan replay firehose/oda kapsamındadır.
+        """
+        if last_epoch != self.epoch:
+            # Başka worker'ın ya da önceki sürecin seq'i: ne kaçırıldığı bilinemez
+            self._resync(conn)
+            return
+        if last_seq == self._seq:
+            return
+        oldest = self._seq - len(self._replay_buffer) + 1
+        if last_seq > self._seq or last_seq < oldest - 1:
+            # Buffer'dan eski boşluk
+            self._resync(conn)
+            return
+        missed = [
+            e
+            for e in islice(self._replay_buffer, last_seq - oldest + 1, None)
+            if conn.room is None or conn.room in e.rooms
+        ]
+        if not missed:
+            return
+        if conn.batched:
+            # Toplu istemci: kaçırılanlar tek batch frame'i olarak (sadeleştirilmiş)
+            frames = [Frame({"type": "batch", "events": [e.payload for e in coalesce(missed)]})]
+        else:
+            if len(missed) > self._client_buffer_size:
+                # Bağlantı buffer'ına sığmaz; drop_oldest sessizce boşluk bırakırdı
+                self._resync(conn)
+                return
+            frames = [Frame(e.payload) for e in missed]
+        for frame in frames:
+            conn.offer(frame)
+        self._replays += 1
+        self._events_replayed += len(missed)
+
+    def _resync(self, conn: ClientConnection) -> None:
+        self._resyncs += 1
+        conn.offer(Frame({"type": "resync", "seq": self._seq, "epoch": self.epoch}))
+
+    def _on_connection_closed(self, conn: ClientConnection) -> None:
+        # Writer hata/timeout aldı ya da yavaş istemci koparıldı: odalardan çıkar
+        if self._connections.get(conn.ws) is conn:
+            self._spawn(self._evict({conn.ws}))
+
+    def _collect(self, conn: ClientConnection) -> None:
+        # Kapanan bağlantının sayaçlarını hub toplamına aktar (tek sefer)
+        self._client_frames_dropped += conn.dropped
+        self._send_failures += conn.send_failures
+        self._slow_disconnects += int(conn.slow_disconnect)
+        conn.dropped = conn.send_failures = 0
+        conn.slow_disconnect = False
+
+    # ---------- konu abonelikleri ----------
+
+    async def handle_client_message(self, ws: WebSocket, data: str | bytes) -> None:
+        """
+        İstemciden gelen kontrol mesajını işler:
+          {"op": "subscribe",   "topics": ["task:5", "assignee:3", "status:DONE"]}
+          {"op": "unsubscribe", "topics": [...]}
+        Cevap aynı soketten {"type": "subscribed", "topics": [...]} ya da
+        {"type": "error", "detail": "..."} olarak gider.
+        """
+        conn = self._connections.get(ws)
+        if conn is None:
+            return
+        try:
+            message = decode_client_message(data, conn.protocol)
+            op = message.get("op") if isinstance(message, dict) else None
+            raw_topics = message.get("topics") if isinstance(message, dict) else None
+            if op not in ("subscribe", "unsubscribe") or not isinstance(raw_topics, list):
+                raise ValueError("Expected {op: subscribe|unsubscribe, topics: [...]}")
+            topics = {parse_topic(t) for t in raw_topics}
+        except (ValueError, InvalidTopicError) as e:
+            conn.offer(Frame({"type": "error", "detail": str(e)}))
+            return
+
+        async with self._lock:
+            if op == "subscribe":
+                new = topics - conn.topics
+                if len(conn.topics) + len(new) > self._max_topics:
+                    conn.offer(Frame({"type": "error", "detail": "Too many topics"}))
+                    return
+                if not conn.filtered:
+                    # İlk abonelik: firehose'dan çık, sadece abone olunan konular gelsin
+                    conn.filtered = True
+                    self._public_clients.discard(ws)
+                conn.topics |= new
+                self._index(ws, new)
+            else:
+                gone = topics & conn.topics
+                conn.topics -= gone
+                self._unindex(ws, gone)
+            current = sorted(conn.topics)
+        conn.offer(Frame({"type": "subscribed", "topics": current}))
+
+    def _index(self, ws: WebSocket, topics: Iterable[str]) -> None:
+        for topic in topics:
+            self._topic_index.setdefault(topic, set()).add(ws)
+
+    def _unindex(self, ws: WebSocket, topics: Iterable[str]) -> None:
+        for topic in topics:
+            subscribers = self._topic_index.get(topic)
+            if subscribers is not None:
+                subscribers.discard(ws)
+                if not subscribers:
+                    self._topic_index.pop(topic, None)
 
     # ---------- publish (sync entry) ----------
 
-    def publish_task_created(self, task_id: int, assignee_id: Optional[int]) -> None:
-        anyio.from_thread.run(self._publish_task_created_async, task_id, assignee_id)
+    def publish_task_created(
+        self, task_id: int, assignee_id: Optional[int], status: Optional[str] = None
+    ) -> None:
+        self._submit(self._task_created_event(task_id, assignee_id, status))
+
+    def publish_task_updated(
+        self,
+        task_id: int,
+        *,
+        assignee_id: Optional[int] = None,
+        status: Optional[str] = None,
+        previous_assignee_id: Optional[int] = None,
+        previous_status: Optional[str] = None,
+    ) -> None:
+        self._submit(
+            self._task_updated_event(
+                task_id, assignee_id, status, previous_assignee_id, previous_status
+            )
+        )
+
+    def publish_tasks_created(self, tasks: Sequence[TaskRef]) -> None:
+        self._submit(self._tasks_batch_event("tasks_created", tasks))
 
-    def publish_task_updated(self, task_id: int) -> None:
-        anyio.from_thread.run(self._publish_task_updated_async, task_id)
+    def publish_tasks_updated(
+        self, tasks: Sequence[TaskRef], previous: Sequence[TaskRef] = ()
+    ) -> None:
+        self._submit(self._tasks_batch_event("tasks_updated", tasks, previous))
 
     def publish_user_created(self, user_id: int) -> None:
-        anyio.from_thread.run(self._publish_user_created_async, user_id)
+        self._submit(self._user_created_event(user_id))
 
     def publish_user_updated(self, user_id: int) -> None:
-        anyio.from_thread.run(self._publish_user_updated_async, user_id)
+        self._submit(self._user_updated_event(user_id))
+
+    # ---------- publish (async entry) ----------
+
+    async def publish_task_created_async(
+        self, task_id: int, assignee_id: Optional[int], status: Optional[str] = None
+    ) -> None:
+        self._enqueue(self._task_created_event(task_id, assignee_id, status))
+
+    async def publish_task_updated_async(
+        self,
+        task_id: int,
+        *,
+        assignee_id: Optional[int] = None,
+        status: Optional[str] = None,
+        previous_assignee_id: Optional[int] = None,
+        previous_status: Optional[str] = None,
+    ) -> None:
+        self._enqueue(
+            self._task_updated_event(
+                task_id, assignee_id, status, previous_assignee_id, previous_status
+            )
+        )
+
+    async def publish_tasks_created_async(self, tasks: Sequence[TaskRef]) -> None:
+        self._enqueue(self._tasks_batch_event("tasks_created", tasks))
+
+    async def publish_tasks_updated_async(
+        self, tasks: Sequence[TaskRef], previous: Sequence[TaskRef] = ()
+    ) -> None:
+        self._enqueue(self._tasks_batch_event("tasks_updated", tasks, previous))
+
+    async def publish_user_created_async(self, user_id: int) -> None:
+        self._enqueue(self._user_created_event(user_id))
+
+    async def publish_user_updated_async(self, user_id: int) -> None:
+        self._enqueue(self._user_updated_event(user_id))
 
-    # ---------- publish (async core) ----------
+    # ---------- event'ler ----------
 
-    async def _publish_task_created_async(self, task_id: int, assignee_id: Optional[int]) -> None:
+    # assignee_id/status sadece konu eşlemesi içindir; istemci payload'ı değişmez.
+    # Update'lerde previous_* (yazma öncesi hal) da verilir: event eski ve yeni konuların
+    # birleşimine gider, böylece eski assignee'nin odası ve eski status'a abone olanlar
+    # task'in kendilerinden ayrıldığını görür.
+
+    @staticmethod
+    def _task_created_event(
+        task_id: int, assignee_id: Optional[int], status: Optional[str] = None
+    ) -> HubEvent:
         payload = {"type": "task_created", "task_id": task_id, "assignee_id": assignee_id}
-        targets: Set[WebSocket] = set()
-        async with self._lock:
-            targets |= self._public_clients
-            if assignee_id is not None and assignee_id in self._user_rooms:
-                targets |= self._user_rooms[assignee_id]
-        await self._broadcast_json(targets, payload)
+        rooms = (assignee_id,) if assignee_id is not None else ()
+        return HubEvent(payload, rooms=rooms, topics=task_topics(task_id, assignee_id, status))
 
-    async def _publish_task_updated_async(self, task_id: int) -> None:
+    @staticmethod
+    def _task_updated_event(
+        task_id: int,
+        assignee_id: Optional[int] = None,
+        status: Optional[str] = None,
+        previous_assignee_id: Optional[int] = None,
+        previous_status: Optional[str] = None,
+    ) -> HubEvent:
         payload = {"type": "task_updated", "task_id": task_id}
-        async with self._lock:
-            targets = set(self._public_clients)
-        await self._broadcast_json(targets, payload)
+        rooms = tuple(sorted({a for a in (assignee_id, previous_assignee_id) if a is not None}))
+        topics = dict.fromkeys(task_topics(task_id, assignee_id, status))
+        topics.update(dict.fromkeys(task_topics(task_id, previous_assignee_id, previous_status)))
+        return HubEvent(payload, rooms=rooms, topics=tuple(topics))
 
-    async def _publish_user_created_async(self, user_id: int) -> None:
+    @staticmethod
+    def _tasks_batch_event(
+        kind: str, tasks: Sequence[TaskRef], previous: Sequence[TaskRef] = ()
+    ) -> HubEvent:
+        # Toplu yazma: N task için tek event. İlgili tüm assignee odalarına ve
+        # task'lerin düştüğü tüm konulara gider (payload'da bütün id'ler bulunur).
+        # previous: güncellenen task'lerin eski halleri (sadece oda/konu için)
+        payload = {"type": kind, "task_ids": [task_id for task_id, _, _ in tasks]}
+        refs = [*tasks, *previous]
+        rooms = tuple(sorted({a for _, a, _ in refs if a is not None}))
+        topics: Dict[str, None] = {}
+        for task_id, assignee_id, status in refs:
+            topics.update(dict.fromkeys(task_topics(task_id, assignee_id, status)))
+        return HubEvent(payload, rooms=rooms, topics=tuple(topics))
+
+    @staticmethod
+    def _user_created_event(user_id: int) -> HubEvent:
         payload = {"type": "user_created", "user_id": user_id}
-        targets: Set[WebSocket] = set()
-        async with self._lock:
-            targets |= self._public_clients
-            room = self._user_rooms.get(user_id)
-            if room:
-                targets |= room
-        await self._broadcast_json(targets, payload)
+        return HubEvent(payload, rooms=(user_id,), topics=user_topics(user_id))
 
-    async def _publish_user_updated_async(self, user_id: int) -> None:
+    @staticmethod
+    def _user_updated_event(user_id: int) -> HubEvent:
         payload = {"type": "user_updated", "user_id": user_id}
+        return HubEvent(payload, rooms=(user_id,), topics=user_topics(user_id))
+
+    # ---------- kuyruk ----------
+
+    def _submit(self, event: HubEvent) -> None:
+        """
+        Sync (worker thread) çağrılar için: event'i loop thread'ine aktarır, yayını beklemez.
+        Loop thread'inin içinden çağrılırsa doğrudan kuyruğa ekler.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None:
+            self._enqueue(event)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._enqueue, event)
+        else:
+            # Dispatcher henüz hiç başlamadı: loop'a anyio portalı üzerinden ulaş
+            anyio.from_thread.run_sync(self._enqueue, event)
+
+    def _enqueue(self, event: HubEvent) -> None:
+        # Sadece loop thread'inde çağrılır (asyncio.Queue thread-safe değil)
+        self._ensure_dispatcher()
+        assert self._queue is not None
+        if self._queue.full():
+            if self._overflow == OVERFLOW_DROP_NEWEST:
+                self._dropped += 1
+                return
+            # drop_oldest: yer açmak için en eski event'i at
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._dropped += 1
+        self._queue.put_nowait(event)
+        self._queued += 1
+
+    async def _dispatch_loop(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            try:
+                if self._backplane is not None and not event.relayed:
+                    # Yerel publish: önce tüm worker'lara (bu worker dahil) yay
+                    if not await self._publish_to_backplane(event):
+                        # Diğer worker'lar kaçırır ama bu worker'ın istemcileri almalı
+                        await self._dispatch(event)
+                        self._dispatched += 1
+                else:
+                    await self._dispatch(event)
+                    self._dispatched += 1
+            except Exception:
+                # Tek bir event'in hatası dispatcher'ı öldürmesin
+                self._dispatch_errors += 1
+                logger.exception("WebSocket hub failed to dispatch %s", event.payload.get("type"))
+            finally:
+                queue.task_done()
+            # Burst'lerde writer task'larına sıra ver; hızlı istemciler buffer'ı boşaltabilsin
+            await asyncio.sleep(0)
+
+    async def _publish_to_backplane(self, event: HubEvent) -> bool:
+        assert self._backplane is not None
+        try:
+            await self._backplane.publish(event)
+            return True
+        except Exception:
+            self._backplane_failures += 1
+            logger.warning(
+                "Backplane publish failed for %s; delivering to local sockets only",
+                event.payload.get("type"),
+                exc_info=True,
+            )
+            return False
+
+    def _on_backplane_event(self, event: HubEvent) -> None:
+        # Backplane'den gelen (relayed) event: yerel soketlere dağıtılmak üzere kuyruğa
+        self._enqueue(event)
+
+    def _sequence(self, event: HubEvent) -> HubEvent:
+        # Lock altında: sıradaki seq'i (ve epoch'u) payload'a yaz ve replay buffer'ına ekle.
+        # Backplane'den gelen event'ler de burada (her worker'da yerel) numaralanır.
+        self._seq += 1
+        event = replace(event, payload={**event.payload, "seq": self._seq, "epoch": self.epoch})
+        self._replay_buffer.append(event)
+        return event
+
+    async def _dispatch(self, event: HubEvent) -> None:
         targets: Set[WebSocket] = set()
         async with self._lock:
+            event = self._sequence(event)
             targets |= self._public_clients
-            room = self._user_rooms.get(user_id)
-            if room:
-                targets |= room
-        await self._broadcast_json(targets, payload)
+            for user_id in event.rooms:
+                room = self._user_rooms.get(user_id)
+                if room:
+                    targets |= room
+            for topic in event.topics:
+                subscribers = self._topic_index.get(topic)
+                if subscribers:
+                    targets |= subscribers
+        immediate = {ws for ws in targets if not self._is_batched(ws)}
+        if len(immediate) != len(targets):
+            # En az bir alıcı batch modda: event pencereye girer, onlara flush'ta gider
+            self._add_to_batch(event)
+        await self._broadcast_json(immediate, event.payload)
+
+    # ---------- toplu (batch) frame'ler ----------
+
+    def _is_batched(self, ws: WebSocket) -> bool:
+        conn = self._connections.get(ws)
+        return conn is not None and conn.batched
+
+    def _add_to_batch(self, event: HubEvent) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if not self._batch_pending:
+            self._batch_first = now
+        self._batch_last = now
+        self._batch_pending.append(event)
+        if len(self._batch_pending) >= self._batch_max_events:
+            # boyut sınırı: pencereyi beklemeden gönder
+            if self._batch_timer is not None:
+                self._batch_timer.cancel()
+                self._batch_timer = None
+            self._spawn(self._flush_batch())
+        elif self._batch_timer is None:
+            self._batch_timer = loop.create_task(self._batch_timer_loop())
+
+    async def _batch_timer_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            deadline = min(
+                self._batch_last + self._batch_window,
+                self._batch_first + self._batch_max_latency,
+            )
+            delay = deadline - loop.time()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        self._batch_timer = None
+        await self._flush_batch()
+
+    async def _flush_batch(self) -> None:
+        pending, self._batch_pending = self._batch_pending, []
+        if not pending:
+            return
+        events = coalesce(pending)
+        self._events_coalesced += len(pending) - len(events)
+
+        # Aynı event kümesini görecek batch istemcileri grupla: firehose (public) hepsini,
+        # diğerleri kendi kullanıcı odası + abone olduğu konulara düşenleri alır.
+        # Her grup için frame bir kez encode edilir.
+        async with self._lock:
+            groups: Dict[tuple, Set[WebSocket]] = {}
+            for ws, conn in self._connections.items():
+                if not conn.batched:
+                    continue
+                key = (ws in self._public_clients, conn.room, frozenset(conn.topics))
+                groups.setdefault(key, set()).add(ws)
+
+        for (firehose, room_id, topics), clients in groups.items():
+            payloads = [
+                e.payload
+                for e in events
+                if firehose
+                or (room_id is not None and room_id in e.rooms)
+                or not topics.isdisjoint(e.topics)
+            ]
+            if not payloads:
+                continue
+            self._batches_sent += 1
+            await self._broadcast_json(clients, {"type": "batch", "events": payloads})
 
     # ---------- yardımcı ----------
 
+    def _spawn(self, coro) -> None:
+        # Task biter bitmez kümeden çıkar; hatası varsa loglanır (aksi halde hiç okunmazdı)
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task[None]) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("WebSocket hub background task failed", exc_info=task.exception())
+
     async def _broadcast_json(self, clients: Set[WebSocket], message: dict) -> None:
+        # Gönderimi beklemiyoruz: mesaj her bağlantının buffer'ına bırakılır,
+        # writer task'ları paralel gönderir. Fan-out süresi en yavaş istemciye bağlı değil.
+        # Mesaj tek bir Frame'e sarılır: protokol başına bir kez encode edilir, herkes paylaşır.
+        if not clients:
+            return
+        start = time.perf_counter()
+        frame = Frame(message)
         dead: Set[WebSocket] = set()
-        for ws in list(clients):
-            try:
-                await ws.send_json(message)
-            except Exception:
+        for ws in clients:
+            conn = self._connections.get(ws)
+            if conn is None or not conn.offer(frame):
                 dead.add(ws)
         if dead:
-            async with self._lock:
-                for ws in dead:
-                    self._public_clients.discard(ws)
-                for room in self._user_rooms.values():
+            await self._evict(dead)
+        self.fanout_seconds.observe(time.perf_counter() - start)
+
+    async def _evict(self, dead: Set[WebSocket]) -> None:
+        # Hem yayında kapalı bulunan hem de writer'ı hata/timeout ile kapanan soketler buradan geçer;
+        # çoktan çıkarılmış (ör. disconnect_* ile) soket sayılmaz
+        async with self._lock:
+            for ws in dead:
+                self._public_clients.discard(ws)
+                for user_id, room in list(self._user_rooms.items()):
                     room.discard(ws)
+                    if not room:
+                        self._user_rooms.pop(user_id, None)
+                conn = self._connections.pop(ws, None)
+                if conn is not None:
+                    self._dead_evictions += 1
+                    self._unindex(ws, conn.topics)
+                    self._collect(conn)
 
 
-async def hold_connection(ws: WebSocket) -> None:
+async def hold_connection(ws: WebSocket, hub: Optional[WebSocketHub] = None) -> None:
     """
     WS bağlantısını açık tutar. İstemci bir şey göndermezse bile
     receive bekleyerek bağlantının yaşamını uzatır.
+    hub verilirse gelen mesajlar (subscribe/unsubscribe) hub'a iletilir.
     """
     try:
         while True:
-            await ws.receive_text()  # gelen mesajı okumak yeterli
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data: Any = message.get("text")
+            if data is None:
+                data = message.get("bytes")
+            if hub is not None and data is not None:
+                await hub.handle_client_message(ws, data)
     except WebSocketDisconnect:
         pass
     except Exception:
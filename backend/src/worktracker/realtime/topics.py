@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from worktracker.models.task import TaskStatus
+
+# Abone olunabilecek konu türleri: "task:<id>", "assignee:<user_id>", "status:<TaskStatus>"
+TOPIC_TASK = "task"
+TOPIC_ASSIGNEE = "assignee"
+TOPIC_STATUS = "status"
+
+
+class InvalidTopicError(ValueError):
+    """İstemcinin gönderdiği konu biçimi geçersiz."""
+    pass
+
+
+def parse_topic(raw: str) -> str:
+    """
+    Konuyu doğrular ve normalize eder ("task:05" -> "task:5").
+    Geçersizse InvalidTopicError.
+    """
+    if not isinstance(raw, str):
+        raise InvalidTopicError("Topic must be a string")
+    kind, sep, value = raw.partition(":")
+    if not sep or not value:
+        raise InvalidTopicError(f"Invalid topic: {raw}")
+    if kind in (TOPIC_TASK, TOPIC_ASSIGNEE):
+        try:
+            return f"{kind}:{int(value)}"
+        except ValueError:
+            raise InvalidTopicError(f"Invalid topic: {raw}") from None
+    if kind == TOPIC_STATUS:
+        try:
+            return f"{kind}:{TaskStatus(value).value}"
+        except ValueError:
+            raise InvalidTopicError(f"Invalid topic: {raw}") from None
+    raise InvalidTopicError(f"Unknown topic kind: {kind}")
+
+
+def task_topics(
+    task_id: int,
+    assignee_id: Optional[int] = None,
+    status: Optional[TaskStatus | str] = None,
+) -> Tuple[str, ...]:
+    """Bir task event'inin düştüğü konular."""
+    topics = [f"{TOPIC_TASK}:{task_id}"]
+    if assignee_id is not None:
+        topics.append(f"{TOPIC_ASSIGNEE}:{assignee_id}")
+    if status is not None:
+        topics.append(f"{TOPIC_STATUS}:{TaskStatus(status).value}")
+    return tuple(topics)
+
+
+def user_topics(user_id: int) -> Tuple[str, ...]:
+    """Kullanıcı event'leri, o kullanıcının assignee konusuna da düşer."""
+    return (f"{TOPIC_ASSIGNEE}:{user_id}",)
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, List, Sequence, Tuple
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from worktracker.models.task import Task, TaskStatus
+from worktracker.repositories.ports import AsyncTaskRepositoryPort, VersionMismatchError
+from worktracker.repositories.changes import changes_since_statement, record_statements
+from worktracker.repositories.counters import (
+    COUNTED_FIELDS,
+    CountKey,
+    adjust_statements,
+    count_deltas,
+    counted_state_statement,
+    counters_statement,
+)
+from worktracker.repositories.search import search_statement, search_terms
+from worktracker.repositories.returning import enforces_foreign_keys, supports_returning
+
+# Toplu güncellemede yazılan kolonlar
+_UPDATABLE_FIELDS = ("title", "description", "status", "assignee_id")
+
+# Okuma fast path'i ve export'ta seçilen kolonlar (TaskRead alanları; ORM nesnesi kurulmaz)
+_READ_COLUMNS = ("id", "title", "description", "status", "assignee_id", "version")
+
+
+def _filtered(stmt, *, status: Optional[TaskStatus], assignee_id: Optional[int]):
+    # list() ve stream() aynı filtreleri uygulasın
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if assignee_id is not None:
+        stmt = stmt.where(Task.assignee_id == assignee_id)
+    return stmt
+
+class AsyncSQLModelTaskRepository(AsyncTaskRepositoryPort):
+    """
+    SQLModelTaskRepository'nin AsyncSession üzerindeki karşılığı.
+    Davranış sözleşmesi aynı (RETURNING varsa yazma başına tek ifade + tek commit):
+    - Bulunamayan kayıtta update() ValueError atar (service 404'a çevirir).
+    - FK/UNIQUE/NULL ihlallerinde IntegrityError doğal olarak fırlar (service map eder).
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        dialect = session.sync_session.get_bind().dialect
+        self._returning = supports_returning(dialect)
+        self._dialect = dialect.name
+        # True ise service assignee'yi ayrıca SELECT ile doğrulamaz (FK ihlali -> IntegrityError)
+        self.enforces_assignee_fk = enforces_foreign_keys(dialect)
+        # Son update'in eski (assignee_id, status) halleri (bkz. TaskRepositoryPort)
+        self.previous_state: Dict[int, CountKey] = {}
+
+    async def create(
+        self,
+        *,
+        title: str,
+        description: Optional[str] = None,
+        status: TaskStatus = TaskStatus.TODO,
+        assignee_id: Optional[int] = None,
+    ) -> Task:
+        if self._returning:
+            # Core INSERT model default'unu uygulamaz; status None gelebilir
+            stmt = insert(Task).values(
+                title=title,
+                description=description,
+                status=status if status is not None else TaskStatus.TODO,
+                assignee_id=assignee_id,
+            ).returning(Task)
+            task = (await self.session.exec(stmt)).scalar_one()  # INSERT ... RETURNING
+            await self._record_changes([task.id], created=True)
+            await self._count((), [(task.assignee_id, task.status)])
+            await self.session.commit()
+            return task
+
+        task = Task(
+            title=title,
+            description=description,
+            status=status,
+            assignee_id=assignee_id,
+        )
+        self.session.add(task)
+        await self.session.flush()         # INSERT (id için)
+        await self._record_changes([task.id], created=True)
+        await self._count((), [(task.assignee_id, task.status)])
+        await self.session.commit()
+        await self.session.refresh(task)   # DB'nin son halini (id dahil) yükle
+        return task
+
+    async def _record_changes(self, task_ids: List[int], *, created: bool) -> None:
+        # Değişiklik günlüğü task yazmasıyla aynı transaction'da (bkz. repositories/changes.py)
+        for stmt in record_statements(task_ids, created=created, dialect=self._dialect):
+            await self.session.exec(stmt)
+
+    async def _count(self, before: Iterable[CountKey], after: Iterable[CountKey]) -> None:
+        # (assignee, status) sayaçları da aynı transaction'da (bkz. repositories/counters.py)
+        deltas = count_deltas(before, after)
+        for stmt in adjust_statements(deltas, dialect=self._dialect):
+            await self.session.exec(stmt)
+
+    async def get_by_id(self, task_id: int) -> Optional[Task]:
+        return await self.session.get(Task, task_id)
+
+    async def list(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Task]:
+        # Keyset paginasyon (bkz. SQLModelTaskRepository.list)
+        stmt = select(Task)
+        if after_id is not None:
+            stmt = stmt.where(Task.id > after_id)
+        stmt = _filtered(stmt, status=status, assignee_id=assignee_id)
+        stmt = stmt.order_by(Task.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.exec(stmt)
+        return list(result)
+
+    async def list_rows(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Mapping[str, Any]]:
+        # list() ile aynı sorgu, ama sadece kolonlar: ORM entity / identity map maliyeti yok
+        table = Task.__table__
+        stmt = select(*(table.c[name] for name in _READ_COLUMNS))
+        if after_id is not None:
+            stmt = stmt.where(table.c.id > after_id)
+        stmt = _filtered(stmt, status=status, assignee_id=assignee_id).order_by(table.c.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.exec(stmt)
+        return list(result.mappings())
+
+    async def changes_since(self, since: int, *, limit: int) -> List[Mapping[str, Any]]:
+        # task_changes + tasks JOIN; sıkıştırma sayesinde maliyet değişen task sayısıyla orantılı
+        result = await self.session.exec(changes_since_statement(since, limit, dialect=self._dialect))
+        return list(result.mappings())
+
+    async def counters(self, *, assignee_id: Optional[int] = None) -> List[Mapping[str, Any]]:
+        # Sayaç tablosu: (assignee, status) başına tek satır; tasks taranmaz
+        result = await self.session.exec(counters_statement(assignee_id))
+        return list(result.mappings())
+
+    async def search(
+        self, query: str, *, limit: int, after: Optional[Tuple[float, int]] = None
+    ) -> List[Mapping[str, Any]]:
+        # Postgres: GIN'li tsvector kolonu, SQLite: FTS5 tablosu (bkz. repositories/search.py)
+        terms = search_terms(query)
+        if not terms:
+            return []
+        stmt = search_statement(self._dialect, terms, limit=limit, after=after)
+        result = await self.session.exec(stmt)
+        return list(result.mappings())
+
+    async def stream(
+        self,
+        *,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Mapping[str, Any]]]:
+        # Server-side cursor: satırlar batch_size'lık partilerle gelir, bellekte en fazla
+        # bir parti durur. Sadece kolonlar okunur (ORM nesnesi / identity map büyümesi yok).
+        # İstek session'ı yerine kendi bağlantısını açar: StreamingResponse gövdesi,
+        # dependency'lerin session'ı kapattığı andan sonra da akmaya devam eder.
+        table = Task.__table__
+        stmt = _filtered(
+            select(*(table.c[name] for name in _READ_COLUMNS)),
+            status=status,
+            assignee_id=assignee_id,
+        ).order_by(table.c.id)
+        engine = self.session.bind
+        async with engine.connect() as conn:
+            result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+            async for rows in result.mappings().partitions(batch_size):
+                yield rows
+
+    async def update(
+        self,
+        task_id: int,
+        *,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        expected_version: Optional[int] = None,
+    ) -> Task:
+        if self._returning:
+            return await self._update_returning(
+                task_id,
+                expected_version,
+                title=title,
+                description=description,
+                status=status,
+                assignee_id=assignee_id,
+            )
+
+        # FOR UPDATE + taze okuma: sayaç farkı satırın gerçek eski halinden hesaplansın
+        task = await self.session.get(Task, task_id, with_for_update=True, populate_existing=True)
+        if not task:
+            raise ValueError("Task not found")
+        if expected_version is not None and task.version != expected_version:
+            raise VersionMismatchError("Task version mismatch")
+        before = (task.assignee_id, task.status)
+        self.previous_state = {task_id: before}
+
+        if title is not None:
+            task.title = title
+        if description is not None:
+            task.description = description
+        if status is not None:
+            task.status = status
+        if assignee_id is not None:
+            task.assignee_id = assignee_id
+        task.version += 1
+
+        self.session.add(task)
+        await self._record_changes([task.id], created=False)
+        await self._count([before], [(task.assignee_id, task.status)])
+        await self.session.commit()        # UPDATE
+        await self.session.refresh(task)
+        return task
+
+    async def _update_returning(
+        self, task_id: int, expected_version: Optional[int], **fields: Any
+    ) -> Task:
+        self.previous_state = {}
+        values: Dict[str, Any] = {k: v for k, v in fields.items() if v is not None}
+        if not values:
+            # Değişecek alan yok: yazma yok (sürüm de artmaz), sadece mevcut hali döndür
+            task = await self.session.get(Task, task_id)
+            if not task:
+                raise ValueError("Task not found")
+            if expected_version is not None and task.version != expected_version:
+                raise VersionMismatchError("Task version mismatch")
+            return task
+
+        before: List[CountKey] = []
+        if COUNTED_FIELDS & values.keys():
+            # status/assignee değişiyor: sayaç farkı için eski hal (satır kilitlenir)
+            before = list(await self.session.exec(counted_state_statement([task_id])))
+
+        stmt = update(Task).where(Task.id == task_id)
+        if expected_version is not None:
+            # If-Match: koşullu UPDATE, kontrol ve yazma tek ifadede (yarış yok)
+            stmt = stmt.where(Task.version == expected_version)
+        stmt = stmt.values(**values, version=Task.version + 1).returning(Task)
+        task = (await self.session.exec(stmt)).scalar_one_or_none()  # UPDATE ... RETURNING
+        if task is None:
+            await self.session.rollback()
+            # Satır yok mu, yoksa sürüm mü tutmadı? (sadece hata yolunda ek SELECT)
+            if expected_version is not None and await self.session.get(Task, task_id) is not None:
+                raise VersionMismatchError("Task version mismatch")
+            raise ValueError("Task not found")
+        await self._record_changes([task.id], created=False)
+        # Sayılan alan değişmiyorsa eski hal yeni halle aynıdır (ayrıca okunmaz)
+        self.previous_state = {task.id: tuple(before[0])} if before else {}
+        if before:
+            await self._count(before, [(task.assignee_id, task.status)])
+        await self.session.commit()
+        return task
+
+    async def create_many(self, rows: Sequence[Dict[str, Any]]) -> List[Task]:
+        if not rows:
+            return []
+        # ORM bulk INSERT: Postgres'te tüm satırlar tek çok satırlı
+        # INSERT ... RETURNING (insertmanyvalues) olarak gider. Sentinel
+        # desteklemeyen dialect'lerde (SQLite) SQLAlchemy satır satır yürütür;
+        # her iki durumda da dönen sıra parametre sırasıyla aynıdır.
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        result = await self.session.exec(stmt, params=[dict(row) for row in rows])
+        tasks = list(result.scalars())
+        await self._record_changes([t.id for t in tasks], created=True)
+        await self._count((), [(t.assignee_id, t.status) for t in tasks])
+        await self.session.commit()
+        return tasks
+
+    async def update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, Task]:
+        self.previous_state = {}
+        if not changes:
+            return {}
+        # FOR UPDATE + taze okuma: sayaç farkları satırların gerçek eski halinden
+        stmt = (
+            select(Task)
+            .where(Task.id.in_(changes.keys()))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.exec(stmt)
+        tasks = {task.id: task for task in result}
+        if not tasks:
+            return {}
+
+        # Her satırı tam kolon kümesine tamamla (None -> mevcut değer): böylece tüm
+        # satırlar aynı parametre şeklinde olur ve tek bir executemany UPDATE gider.
+        rows = []
+        for task_id, task in tasks.items():
+            row = {"_id": task_id}
+            for field in _UPDATABLE_FIELDS:
+                value = changes[task_id].get(field)
+                row[field] = value if value is not None else getattr(task, field)
+            rows.append(row)
+
+        table = Task.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(
+                {field: bindparam(field) for field in _UPDATABLE_FIELDS}
+                | {"version": table.c.version + 1}
+            )
+        )
+        await self.session.exec(stmt, params=rows)
+        self.previous_state = {t.id: (t.assignee_id, t.status) for t in tasks.values()}
+        await self._record_changes(list(tasks), created=False)
+        await self._count(
+            [(t.assignee_id, t.status) for t in tasks.values()],
+            [(row["assignee_id"], row["status"]) for row in rows],
+        )
+        await self.session.commit()
+
+        # Bellekteki nesneleri DB ile aynı hale getir (dirty işaretlemeden)
+        for row in rows:
+            task = tasks[row["_id"]]
+            for field in _UPDATABLE_FIELDS:
+                set_committed_value(task, field, row[field])
+            # executemany RETURNING döndürmez; aynı transaction'da okunan sürüm + 1
+            set_committed_value(task, "version", task.version + 1)
+        return tasks
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, Set
+from sqlalchemy import insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from worktracker.models.user import User
+from worktracker.repositories.ports import AsyncUserRepositoryPort, VersionMismatchError
+from worktracker.repositories.returning import supports_returning
+
+class AsyncSQLModelUserRepository(AsyncUserRepositoryPort):
+    """
+    SQLModelUserRepository'nin AsyncSession üzerindeki karşılığı.
+    - Bulunamayan kayıtta update() ValueError atar (service 404'a çevirir).
+    - UNIQUE ihlalinde (email) IntegrityError yukarı fırlar (service 409'a çevirir).
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self._returning = supports_returning(session.sync_session.get_bind().dialect)
+
+    async def create(self, *, email: str, full_name: Optional[str] = None) -> User:
+        if self._returning:
+            stmt = insert(User).values(email=email, full_name=full_name).returning(User)
+            user = (await self.session.exec(stmt)).scalar_one()  # INSERT ... RETURNING
+            await self.session.commit()
+            return user
+
+        user = User(email=email, full_name=full_name)
+        self.session.add(user)
+        await self.session.commit()       # INSERT
+        await self.session.refresh(user)  # DB'nin son halini (id dahil) nesneye çeker
+        return user
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.session.get(User, user_id)
+
+    async def existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+        ids = set(user_ids)
+        if not ids:
+            return set()
+        result = await self.session.exec(select(User.id).where(User.id.in_(ids)))
+        return set(result)
+
+    async def update(
+        self,
+        user_id: int,
+        *,
+        email: Optional[str] = None,
+        full_name: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> User:
+        values = {
+            k: v for k, v in (("email", email), ("full_name", full_name)) if v is not None
+        }
+        if self._returning and values:
+            stmt = update(User).where(User.id == user_id)
+            if expected_version is not None:
+                # If-Match: koşullu UPDATE (kontrol + yazma tek ifade)
+                stmt = stmt.where(User.version == expected_version)
+            stmt = stmt.values(**values, version=User.version + 1).returning(User)
+            user = (await self.session.exec(stmt)).scalar_one_or_none()  # UPDATE ... RETURNING
+            if user is None:
+                await self.session.rollback()
+                if expected_version is not None and await self.session.get(User, user_id) is not None:
+                    raise VersionMismatchError("User version mismatch")
+                raise ValueError("User not found")
+            await self.session.commit()
+            return user
+
+        user = await self.session.get(User, user_id)
+        if not user:
+            # Service katmanı NotFoundError'a çevirir
+            raise ValueError("User not found")
+        if expected_version is not None and user.version != expected_version:
+            raise VersionMismatchError("User version mismatch")
+        if not values:
+            return user  # değişecek alan yok: yazma yok, sürüm artmaz
+
+        if email is not None:
+            user.email = email
+        if full_name is not None:
+            user.full_name = full_name
+        user.version += 1
+
+        self.session.add(user)
+        await self.session.commit()       # UPDATE
+        await self.session.refresh(user)
+        return user
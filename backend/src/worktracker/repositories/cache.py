@@ -0,0 +1,539 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from worktracker.models.task import Task, TaskStatus
+from worktracker.models.user import User
+from worktracker.realtime.backplane import Backplane
+from worktracker.realtime.events import HubEvent
+from worktracker.repositories.ports import (
+    AsyncTaskRepositoryPort,
+    AsyncUserRepositoryPort,
+    TaskRepositoryPort,
+    UserRepositoryPort,
+)
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TASK = "task"
+ENTITY_USER = "user"
+
+INVALIDATE_EVENT = "cache_invalidate"
+
+
+class LRUTTLCache:
+    """
+    Sınırlı boyutlu LRU + TTL cache (id -> kolon snapshot'ı).
+    - max_size dolunca en uzun süredir okunmayan kayıt atılır (eviction).
+    - ttl saniyeden eski kayıt okunurken atılır (expiration) ve miss sayılır.
+    - Her invalidation bir "generation" artırır; DB okuması sürerken araya yazma
+      girdiyse put() eski değeri yazmaz (okuma/invalidation yarışı).
+    - write_hold > 0 ise invalidate edilen id'ler bu kadar saniye "tutulur": replica'dan
+      (lagging=True) gelen okuma bu sürede cache'e yazılmaz; replica henüz yazmayı
+      görmemiş olabilir ve eski değer TTL boyunca cache'te kalırdı.
+    Sync repository'ler threadpool'dan da eriştiği için işlemler kısa bir kilitle korunur.
+    """
+
+    def __init__(
+        self, *, max_size: int = 10_000, ttl: float = 30.0, write_hold: float = 0.0
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.write_hold = write_hold
+        self._data: "OrderedDict[int, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # id -> bu ana kadar replica okumaları yazılmaz (ekleme sırası = süre sırası)
+        self._held: Dict[int, float] = {}
+        self.generation = 0
+        self._lock = threading.Lock()
+
+        # sayaçlar (stats() ile okunur)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._held_skips = 0
+
+    def get(self, key: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(
+        self,
+        key: int,
+        value: Dict[str, Any],
+        *,
+        generation: Optional[int] = None,
+        lagging: bool = False,
+    ) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return  # okuma sırasında invalidation oldu; eski olabilecek değeri yazma
+            if lagging and self._held.get(key, 0.0) > time.monotonic():
+                self._held_skips += 1
+                return  # yakın zamanda yazıldı; replica'daki hali eski olabilir
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, keys: Iterable[int]) -> None:
+        with self._lock:
+            self.generation += 1
+            now = time.monotonic()
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self._invalidations += 1
+                if self.write_hold > 0:
+                    self._held.pop(key, None)
+                    self._held[key] = now + self.write_hold
+            # Süresi dolan tutmaları baştan temizle (en eskiler başta)
+            for key, until in list(self._held.items()):
+                if until > now:
+                    break
+                del self._held[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+            "held_skips": self._held_skips,
+        }
+
+
+class EntityCache:
+    """
+    Task/User read-through cache'i + worker'lar arası invalidation kanalı.
+    - Yerel invalidation anında uygulanır (yazan worker kendi cache'inde eski veri görmez).
+    - backplane verilirse invalidation mesajı diğer worker'lara da yayınlanır; her
+      worker gelen mesajla kendi cache'ini temizler. Kanal kayıplı olabileceğinden
+      (ör. dinleyici yeniden bağlanırken) TTL bayatlığı üstten sınırlar.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 10_000,
+        ttl: float = 30.0,
+        backplane: Optional[Backplane] = None,
+        write_hold: float = 0.0,
+    ) -> None:
+        self.tasks = LRUTTLCache(max_size=max_size, ttl=ttl, write_hold=write_hold)
+        self.users = LRUTTLCache(max_size=max_size, ttl=ttl, write_hold=write_hold)
+        self._backplane = backplane
+        # Kendi yayınladığımız mesajı geri aldığımızda tekrar uygulamamak için
+        self._origin = uuid.uuid4().hex
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._remote_invalidations = 0
+        self._broadcasts: Set[asyncio.Task[None]] = set()
+
+    def _store(self, entity: str) -> LRUTTLCache:
+        return self.tasks if entity == ENTITY_TASK else self.users
+
+    # ---------- yaşam döngüsü ----------
+
+    async def start(self) -> None:
+        """Invalidation kanalını dinlemeye başlar (lifespan'de çağrılır)."""
+        self._loop = asyncio.get_running_loop()
+        if self._backplane is not None:
+            await self._backplane.start(self._on_remote_event)
+
+    async def stop(self) -> None:
+        if self._backplane is not None:
+            await self._backplane.stop()
+        self._loop = None
+
+    # ---------- invalidation ----------
+
+    def invalidate(self, entity: str, ids: Iterable[int]) -> None:
+        """Yerel cache'ten düşürür ve (varsa) diğer worker'lara yayınlar."""
+        ids = [i for i in ids if i is not None]
+        if not ids:
+            return
+        self._store(entity).invalidate(ids)
+        if self._backplane is None or self._loop is None:
+            return
+        event = HubEvent(
+            payload={
+                "type": INVALIDATE_EVENT,
+                "entity": entity,
+                "ids": ids,
+                "origin": self._origin,
+            }
+        )
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._spawn_broadcast(event)
+        else:
+            # Sync repository'ler threadpool'dan çağırır
+            self._loop.call_soon_threadsafe(self._spawn_broadcast, event)
+
+    def _spawn_broadcast(self, event: HubEvent) -> None:
+        task = asyncio.get_running_loop().create_task(self._broadcast(event))
+        self._broadcasts.add(task)
+        task.add_done_callback(self._broadcasts.discard)
+
+    async def _broadcast(self, event: HubEvent) -> None:
+        try:
+            await self._backplane.publish(event)
+        except Exception:
+            logger.warning("Cache invalidation broadcast failed", exc_info=True)
+
+    def _on_remote_event(self, event: HubEvent) -> None:
+        payload = event.payload
+        if payload.get("type") != INVALIDATE_EVENT or payload.get("origin") == self._origin:
+            return
+        entity = payload.get("entity")
+        if entity not in (ENTITY_TASK, ENTITY_USER):
+            return
+        self._store(entity).invalidate(int(i) for i in payload.get("ids", ()))
+        self._remote_invalidations += 1
+
+    def clear(self) -> None:
+        self.tasks.clear()
+        self.users.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tasks": self.tasks.stats(),
+            "users": self.users.stats(),
+            "remote_invalidations": self._remote_invalidations,
+        }
+
+
+# ---------- snapshot <-> model ----------
+# Cache ORM nesnesi değil kolon snapshot'ı tutar: her hit yeni (transient) bir nesne
+# döndürür, böylece nesneler session'lar arasında paylaşılmaz ve çağıranın yaptığı
+# değişiklik cache'e sızmaz.
+
+def _task_snapshot(task: Task) -> Dict[str, Any]:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "assignee_id": task.assignee_id,
+        "version": task.version,
+    }
+
+
+def _user_snapshot(user: User) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "version": user.version,
+    }
+
+
+class CachedUserRepository(UserRepositoryPort):
+    """UserRepositoryPort'u saran read-through cache (get_by_id); yazmalar invalidation yapar."""
+
+    def __init__(self, inner: UserRepositoryPort, cache: EntityCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    def create(self, *, email: str, full_name: Optional[str] = None) -> User:
+        return self.inner.create(email=email, full_name=full_name)
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        store = self.cache.users
+        hit = store.get(user_id)
+        if hit is not None:
+            return User(**hit)
+        generation = store.generation
+        user = self.inner.get_by_id(user_id)
+        if user is not None:
+            store.put(user_id, _user_snapshot(user), generation=generation)
+        return user
+
+    def update(
+        self,
+        user_id: int,
+        *,
+        email: Optional[str] = None,
+        full_name: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> User:
+        try:
+            return self.inner.update(
+                user_id, email=email, full_name=full_name, expected_version=expected_version
+            )
+        finally:
+            self.cache.invalidate(ENTITY_USER, [user_id])
+
+
+class CachedTaskRepository(TaskRepositoryPort):
+    """TaskRepositoryPort'u saran read-through cache (get_by_id); list() cache'lenmez."""
+
+    def __init__(self, inner: TaskRepositoryPort, cache: EntityCache) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.enforces_assignee_fk = inner.enforces_assignee_fk
+
+    @property
+    def previous_state(self) -> Dict[int, Tuple[Optional[int], TaskStatus]]:
+        return self.inner.previous_state
+
+    def create(
+        self,
+        *,
+        title: str,
+        description: Optional[str] = None,
+        status: TaskStatus = TaskStatus.TODO,
+        assignee_id: Optional[int] = None,
+    ) -> Task:
+        return self.inner.create(
+            title=title, description=description, status=status, assignee_id=assignee_id
+        )
+
+    def get_by_id(self, task_id: int) -> Optional[Task]:
+        store = self.cache.tasks
+        hit = store.get(task_id)
+        if hit is not None:
+            return Task(**hit)
+        generation = store.generation
+        task = self.inner.get_by_id(task_id)
+        if task is not None:
+            store.put(task_id, _task_snapshot(task), generation=generation)
+        return task
+
+    def list(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Task]:
+        return self.inner.list(limit=limit, after_id=after_id, status=status, assignee_id=assignee_id)
+
+    def update(
+        self,
+        task_id: int,
+        *,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        expected_version: Optional[int] = None,
+    ) -> Task:
+        try:
+            return self.inner.update(
+                task_id,
+                title=title,
+                description=description,
+                status=status,
+                assignee_id=assignee_id,
+                expected_version=expected_version,
+            )
+        finally:
+            self.cache.invalidate(ENTITY_TASK, [task_id])
+
+
+class AsyncCachedUserRepository(AsyncUserRepositoryPort):
+    """
+    CachedUserRepository'nin async karşılığı; existing_ids sadece cache'te olmayanları sorgular.
+    lagging=True: inner bir okuma replica'sında (bkz. LRUTTLCache.write_hold).
+    """
+
+    def __init__(
+        self, inner: AsyncUserRepositoryPort, cache: EntityCache, *, lagging: bool = False
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.lagging = lagging
+
+    async def create(self, *, email: str, full_name: Optional[str] = None) -> User:
+        return await self.inner.create(email=email, full_name=full_name)
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        store = self.cache.users
+        hit = store.get(user_id)
+        if hit is not None:
+            return User(**hit)
+        generation = store.generation
+        user = await self.inner.get_by_id(user_id)
+        if user is not None:
+            store.put(user_id, _user_snapshot(user), generation=generation, lagging=self.lagging)
+        return user
+
+    async def existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+        store = self.cache.users
+        found: Set[int] = set()
+        missing: Set[int] = set()
+        for user_id in set(user_ids):
+            (found if store.get(user_id) is not None else missing).add(user_id)
+        if missing:
+            found |= await self.inner.existing_ids(missing)
+        return found
+
+    async def update(
+        self,
+        user_id: int,
+        *,
+        email: Optional[str] = None,
+        full_name: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> User:
+        try:
+            return await self.inner.update(
+                user_id, email=email, full_name=full_name, expected_version=expected_version
+            )
+        finally:
+            self.cache.invalidate(ENTITY_USER, [user_id])
+
+
+class AsyncCachedTaskRepository(AsyncTaskRepositoryPort):
+    """
+    CachedTaskRepository'nin async karşılığı (toplu yazmalar da invalidation yapar).
+    lagging=True: inner bir okuma replica'sında (bkz. LRUTTLCache.write_hold).
+    """
+
+    def __init__(
+        self, inner: AsyncTaskRepositoryPort, cache: EntityCache, *, lagging: bool = False
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.lagging = lagging
+        self.enforces_assignee_fk = inner.enforces_assignee_fk
+
+    @property
+    def previous_state(self) -> Dict[int, Tuple[Optional[int], TaskStatus]]:
+        return self.inner.previous_state
+
+    async def create(
+        self,
+        *,
+        title: str,
+        description: Optional[str] = None,
+        status: TaskStatus = TaskStatus.TODO,
+        assignee_id: Optional[int] = None,
+    ) -> Task:
+        return await self.inner.create(
+            title=title, description=description, status=status, assignee_id=assignee_id
+        )
+
+    async def get_by_id(self, task_id: int) -> Optional[Task]:
+        store = self.cache.tasks
+        hit = store.get(task_id)
+        if hit is not None:
+            return Task(**hit)
+        generation = store.generation
+        task = await self.inner.get_by_id(task_id)
+        if task is not None:
+            store.put(task_id, _task_snapshot(task), generation=generation, lagging=self.lagging)
+        return task
+
+    async def list(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Task]:
+        return await self.inner.list(
+            limit=limit, after_id=after_id, status=status, assignee_id=assignee_id
+        )
+
+    async def update(
+        self,
+        task_id: int,
+        *,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        expected_version: Optional[int] = None,
+    ) -> Task:
+        try:
+            return await self.inner.update(
+                task_id,
+                title=title,
+                description=description,
+                status=status,
+                assignee_id=assignee_id,
+                expected_version=expected_version,
+            )
+        finally:
+            self.cache.invalidate(ENTITY_TASK, [task_id])
+
+    async def list_rows(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Mapping[str, Any]]:
+        return await self.inner.list_rows(
+            limit=limit, after_id=after_id, status=status, assignee_id=assignee_id
+        )
+
+    async def changes_since(self, since: int, *, limit: int) -> List[Mapping[str, Any]]:
+        return await self.inner.changes_since(since, limit=limit)
+
+    async def counters(self, *, assignee_id: Optional[int] = None) -> List[Mapping[str, Any]]:
+        return await self.inner.counters(assignee_id=assignee_id)
+
+    async def search(
+        self, query: str, *, limit: int, after: Optional[Tuple[float, int]] = None
+    ) -> List[Mapping[str, Any]]:
+        return await self.inner.search(query, limit=limit, after=after)
+
+    def stream(
+        self,
+        *,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Mapping[str, Any]]]:
+        # Export cache'lenmez (cache'i tek seferlik okumalarla doldurmayalım)
+        return self.inner.stream(status=status, assignee_id=assignee_id, batch_size=batch_size)
+
+    async def create_many(self, rows: Sequence[Dict[str, Any]]) -> List[Task]:
+        return await self.inner.create_many(rows)
+
+    async def update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, Task]:
+        try:
+            return await self.inner.update_many(changes)
+        finally:
+            self.cache.invalidate(ENTITY_TASK, changes.keys())
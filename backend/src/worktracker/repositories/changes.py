@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Any, Collection, List
+
+from sqlalchemy import BigInteger, Text, and_, cast, delete, func, insert, select
+
+from worktracker.models.task import Task
+from worktracker.models.task_change import TaskChange
+
+# Değişiklik günlüğü (task_changes) ifadeleri; sync ve async task repository'leri
+# bunları task yazmasıyla aynı transaction'da, commit'ten hemen önce çalıştırır.
+#
+# Okuyucu bir cursor'la ilerler; bu ancak cursor'dan küçük konumlu hiçbir satır daha
+# sonra görünür olmuyorsa güvenlidir (olursa cursor onu çoktan geçmiştir ve satır bir
+# daha dönmez):
+#   - SQLite: aynı anda tek yazma transaction'ı vardır; seq yazma kilidi altında
+#     alınır, seq sırası zaten commit sırasıdır. Cursor = seq.
+#   - PostgreSQL: seq (sequence) commit'ten bağımsız dağıtılır; yazmaları sıraya sokmak
+#     yerine her satıra yazan transaction'ın id'si (pg_current_xact_id) konum olarak
+#     yazılır ve okuyucu sadece snapshot'ının xmin'inden küçük konumları döner. xmin'den
+#     küçük id'li transaction'lar bitmiştir; sonradan görünür olacak her satırın id'si
+#     xmin'e eşit ya da büyüktür. Aynı transaction'ın satırları aynı konumu paylaştığı
+#     için bir transaction sayfalara bölünmez (servis sayfayı transaction sınırında keser).
+
+# PostgreSQL konumu = xid8 + bu taban. Migration öncesi satırların konumu seq'tir (< taban);
+# eski seq cursor'ları da tüm yeni konumlardan küçük kalır. 2**53 altında: JSON'da kayıpsız.
+XID_CURSOR_BASE = 2**52
+
+
+def _xid_position(xid):
+    # xid8 doğrudan bigint'e çevrilemez; metin üzerinden
+    return cast(cast(xid, Text), BigInteger) + XID_CURSOR_BASE
+
+
+_changes = TaskChange.__table__
+_tasks = Task.__table__
+
+# Değişiklik akışında dönen kolonlar: seq + TaskRead alanları
+_FEED_COLUMNS = ("id", "title", "description", "status", "assignee_id", "version")
+
+
+def record_statements(task_ids: Collection[int], *, created: bool, dialect: str) -> List[Any]:
+    """
+    Verilen task'ler için günlük satırı yazan ifadeler.
+    Güncellemede önce task'ın eski satırı silinir (sıkıştırma: task başına tek satır);
+    yeni task'in eski satırı olamayacağından create'te DELETE atlanır.
+    PostgreSQL'de satıra transaction'ın konumu da yazılır (yukarıya bakın); kilit alınmaz.
+    """
+    ids = list(task_ids)
+    stmts: List[Any] = []
+    if not created:
+        stmts.append(delete(_changes).where(_changes.c.task_id.in_(ids)))
+    row: dict = {}
+    if dialect == "postgresql":
+        row["cursor_pos"] = _xid_position(func.pg_current_xact_id())
+    stmts.append(insert(_changes).values([{"task_id": i, **row} for i in ids]))
+    return stmts
+
+
+def changes_since_statement(since: int, limit: int, *, dialect: str):
+    """
+    Konumu since'ten büyük değişiklikler, konum sırasıyla, task'in güncel haliyle (tek JOIN).
+    Her satır "position" (cursor değeri) + TaskRead alanlarını taşır.
+    SQLite'ta en fazla limit satır döner. PostgreSQL'de sadece biten transaction'ların
+    satırları döner ve limit'inci satırın transaction'ı sonuna kadar eklenir (sayfa
+    limit'i bir toplu yazma kadar aşabilir), böylece servis sayfayı transaction sınırında keser.
+    """
+    columns = [_tasks.c[name] for name in _FEED_COLUMNS]
+    if dialect != "postgresql":
+        return (
+            select(_changes.c.seq.label("position"), *columns)
+            .join(_tasks, _tasks.c.id == _changes.c.task_id)
+            .where(_changes.c.seq > since)
+            .order_by(_changes.c.seq)
+            .limit(limit)
+        )
+    position = _changes.c.cursor_pos
+    horizon = _xid_position(func.pg_snapshot_xmin(func.pg_current_snapshot()))
+    visible = and_(position > since, position < horizon)
+    # limit'inci görünür satırın konumu (yoksa NULL: görünenlerin hepsi sığar)
+    bound = (
+        select(position)
+        .where(visible)
+        .order_by(position, _changes.c.seq)
+        .offset(limit - 1)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return (
+        select(position.label("position"), *columns)
+        .join(_tasks, _tasks.c.id == _changes.c.task_id)
+        .where(visible, position <= func.coalesce(bound, horizon))
+        .order_by(position, _changes.c.seq)
+    )
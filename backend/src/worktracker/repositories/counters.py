@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, exists, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from worktracker.models.task import Task, TaskStatus
+from worktracker.models.task_counter import TaskCounter
+
+# Task sayaçları (task_counters) ifadeleri; sync ve async task repository'leri
+# bunları task yazmasıyla aynı transaction'da, commit'ten hemen önce çalıştırır.
+
+_counters = TaskCounter.__table__
+_tasks = Task.__table__
+
+# Atanmamış task'lerin sayıldığı assignee_key (kullanıcı id'leri 1'den başlar)
+UNASSIGNED = 0
+
+# Sayaçları etkileyen task alanları (sadece bunlar değişirse eski hal okunur)
+COUNTED_FIELDS = frozenset({"status", "assignee_id"})
+
+# (assignee_id, status) çifti: bir task'ın sayaçtaki yeri
+CountKey = Tuple[Optional[int], Any]
+
+# ON CONFLICT DO UPDATE destekleyen dialect'ler (tek ifadelik upsert)
+_UPSERT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def assignee_key(assignee_id: Optional[int]) -> int:
+    return assignee_id if assignee_id is not None else UNASSIGNED
+
+
+def count_deltas(
+    before: Iterable[CountKey], after: Iterable[CountKey]
+) -> Dict[Tuple[int, TaskStatus], int]:
+    """Yazmadan önceki ve sonraki (assignee_id, status) listelerinden sıfır olmayan farklar."""
+    deltas: Counter = Counter()
+    for assignee_id, status in before:
+        deltas[(assignee_key(assignee_id), TaskStatus(status))] -= 1
+    for assignee_id, status in after:
+        deltas[(assignee_key(assignee_id), TaskStatus(status))] += 1
+    return {key: n for key, n in deltas.items() if n}
+
+
+def counted_state_statement(task_ids: Collection[int]):
+    """
+    Update öncesi task'lerin (assignee_id, status) hali. FOR UPDATE: eşzamanlı iki
+    update aynı eski hali okuyup sayacı iki kez düşürmesin (SQLite'ta etkisiz).
+    """
+    return (
+        select(_tasks.c.assignee_id, _tasks.c.status)
+        .where(_tasks.c.id.in_(list(task_ids)))
+        .with_for_update()
+    )
+
+
+def adjust_statements(deltas: Mapping[Tuple[int, TaskStatus], int], *, dialect: str) -> List[Any]:
+    """
+    Farkları sayaçlara uygulayan ifadeler. Satırlar anahtar sırasıyla kilitlenir
+    (eşzamanlı yazmalar arasında deadlock olmasın).
+    """
+    if not deltas:
+        return []
+    rows = [
+        {"assignee_key": key, "status": status, "count": n}
+        for (key, status), n in sorted(deltas.items())
+    ]
+    make_insert = _UPSERT_INSERTS.get(dialect)
+    if make_insert is not None:
+        stmt = make_insert(_counters).values(rows)
+        return [
+            stmt.on_conflict_do_update(
+                index_elements=[_counters.c.assignee_key, _counters.c.status],
+                set_={"count": _counters.c.count + stmt.excluded["count"]},
+            )
+        ]
+
+    # Diğer dialect'ler: eksik satırı 0 ile ekle, sonra artır (anahtar başına iki ifade)
+    stmts: List[Any] = []
+    for row in rows:
+        match = (_counters.c.assignee_key == row["assignee_key"]) & (
+            _counters.c.status == row["status"]
+        )
+        stmts.append(
+            insert(_counters).from_select(
+                ["assignee_key", "status", "count"],
+                select(
+                    literal(row["assignee_key"]),
+                    literal(row["status"], _counters.c.status.type),
+                    literal(0),
+                ).where(~exists().where(match)),
+            )
+        )
+        stmts.append(update(_counters).where(match).values(count=_counters.c.count + row["count"]))
+    return stmts
+
+
+def counters_statement(assignee_id: Optional[int] = None):
+    """Sıfır olmayan sayaç satırları (opsiyonel olarak tek bir assignee için)."""
+    stmt = select(_counters.c.assignee_key, _counters.c.status, _counters.c.count).where(
+        _counters.c.count != 0
+    )
+    if assignee_id is not None:
+        stmt = stmt.where(_counters.c.assignee_key == assignee_id)
+    return stmt.order_by(_counters.c.assignee_key, _counters.c.status)
+
+
+def actual_counts_statement():
+    """Sayaçların olması gereken değeri: tasks üzerinde GROUP BY (tam tarama; sadece rebuild/check)."""
+    key = func.coalesce(_tasks.c.assignee_id, UNASSIGNED)
+    return select(key, _tasks.c.status, func.count()).group_by(key, _tasks.c.status)
+
+
+def rebuild_statements() -> List[Any]:
+    """Sayaç tablosunu tasks'tan baştan hesaplar (DELETE + INSERT ... SELECT)."""
+    return [
+        delete(_counters),
+        insert(_counters).from_select(["assignee_key", "status", "count"], actual_counts_statement()),
+    ]
+
+
+def count_drift(
+    stored: Iterable[Tuple[int, Any, int]], actual: Iterable[Tuple[int, Any, int]]
+) -> Dict[Tuple[int, TaskStatus], Tuple[int, int]]:
+    """Tutarsız sayaçlar: {(assignee_key, status): (saklanan, gerçek)}; boşsa tutarlı."""
+    stored_map = {(k, TaskStatus(s)): n for k, s, n in stored}
+    actual_map = {(k, TaskStatus(s)): n for k, s, n in actual}
+    return {
+        key: (stored_map.get(key, 0), actual_map.get(key, 0))
+        for key in stored_map.keys() | actual_map.keys()
+        if stored_map.get(key, 0) != actual_map.get(key, 0)
+    }
@@ -1,9 +1,15 @@
 from __future__ import annotations
-from typing import Protocol, runtime_checkable, Optional, List
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Protocol, runtime_checkable, Optional, List, Sequence, Set, Tuple
 
 from worktracker.models.task import Task, TaskStatus
 from worktracker.models.user import User
 
+
+class VersionMismatchError(Exception):
+    """update(expected_version=...) verilen sürüm kaydın güncel sürümü değil."""
+    pass
+
+
 @runtime_checkable
 class UserRepositoryPort(Protocol):
     """User veri erişimi için repository arayüzü (sözleşme)."""
@@ -16,12 +22,19 @@ class UserRepositoryPort(Protocol):
         *,
         email: Optional[str] = None,
         full_name: Optional[str] = None,
+        expected_version: Optional[int] = None,
     ) -> User: ...
 
 @runtime_checkable
 class TaskRepositoryPort(Protocol):
     """Task veri erişimi için repository arayüzü (sözleşme)."""
 
+    # True: assignee FK'sini DB uygular (ihlal IntegrityError), service ayrı SELECT yapmaz
+    enforces_assignee_fk: bool
+    # Son update'te değişen task'lerin yazma öncesi (assignee_id, status) hali; service
+    # WS event'ini eski konulara da (eski assignee odası, eski status) yayınlamak için okur
+    previous_state: Dict[int, Tuple[Optional[int], TaskStatus]]
+
     def create(
         self,
         *,
@@ -37,8 +50,20 @@ class TaskRepositoryPort(Protocol):
         """ID ile task getir (yoksa None)."""
         ...
 
-    def list(self) -> List[Task]:
-        """Tüm task'leri getir (ileride filtre/paginasyon eklenebilir)."""
+    def list(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Task]:
+        """
+        Task'leri id'ye göre artan sırada getir (keyset paginasyon).
+        - after_id: bu id'den büyük kayıtlar (önceki sayfanın son id'si)
+        - limit: en fazla kaç kayıt (None -> sınırsız)
+        - status / assignee_id: SQL tarafında uygulanan filtreler
+        """
         ...
 
     def update(
@@ -49,6 +74,131 @@ class TaskRepositoryPort(Protocol):
         description: Optional[str] = None,
         status: Optional[TaskStatus] = None,
         assignee_id: Optional[int] = None,
+        expected_version: Optional[int] = None,
     ) -> Task:
-        """Task'ı kısmi alanlarla güncelle ve persisted Task döndür."""
+        """
+        Task'ı kısmi alanlarla güncelle (version +1) ve persisted Task döndür.
+        expected_version verilip güncel sürümle eşleşmezse VersionMismatchError.
+        """
+        ...
+
+
+@runtime_checkable
+class AsyncUserRepositoryPort(Protocol):
+    """UserRepositoryPort'un async karşılığı (AsyncSession üzerinde çalışır)."""
+
+    async def create(self, *, email: str, full_name: Optional[str] = None) -> User: ...
+    async def get_by_id(self, user_id: int) -> Optional[User]: ...
+    async def existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+        """Verilen id'lerden DB'de var olanlar (tek IN sorgusu)."""
+        ...
+    async def update(
+        self,
+        user_id: int,
+        *,
+        email: Optional[str] = None,
+        full_name: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> User: ...
+
+@runtime_checkable
+class AsyncTaskRepositoryPort(Protocol):
+    """TaskRepositoryPort'un async karşılığı (AsyncSession üzerinde çalışır)."""
+
+    enforces_assignee_fk: bool
+    previous_state: Dict[int, Tuple[Optional[int], TaskStatus]]
+
+    async def create(
+        self,
+        *,
+        title: str,
+        description: Optional[str] = None,
+        status: TaskStatus = TaskStatus.TODO,
+        assignee_id: Optional[int] = None,
+    ) -> Task: ...
+
+    async def get_by_id(self, task_id: int) -> Optional[Task]: ...
+
+    async def list(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Task]: ...
+
+    async def update(
+        self,
+        task_id: int,
+        *,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        expected_version: Optional[int] = None,
+    ) -> Task: ...
+
+    async def list_rows(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Mapping[str, Any]]:
+        """list() ile aynı sözleşme; ORM nesnesi yerine TaskRead alanlarını mapping olarak döner."""
+        ...
+
+    async def changes_since(self, since: int, *, limit: int) -> List[Mapping[str, Any]]:
+        """
+        Değişiklik günlüğünde konumu since'ten büyük kayıtlar, konum sırasıyla: her mapping
+        "position" (cursor değeri) + TaskRead alanlarını (task'in güncel hali) içerir.
+        En az limit kayıt döner (varsa); aynı konumu paylaşan kayıtlar (tek transaction)
+        bölünmez, bu yüzden sonuç limit'i aşabilir (bkz. repositories/changes.py).
+        """
+        ...
+
+    async def counters(self, *, assignee_id: Optional[int] = None) -> List[Mapping[str, Any]]:
+        """
+        Sayaç tablosundaki sıfır olmayan satırlar: "assignee_key" (atanmamış için 0),
+        "status", "count". Create/update'ler bu sayaçları aynı transaction'da günceller.
+        """
+        ...
+
+    async def search(
+        self, query: str, *, limit: int, after: Optional[Tuple[float, int]] = None
+    ) -> List[Mapping[str, Any]]:
+        """
+        title/description'da sorgudaki tüm kelimeleri içeren task'ler, tam metin index'i
+        üzerinden: TaskRead alanları + "rank" (büyük = daha alakalı), rank azalan + id
+        artan sırayla. after=(rank, id) bir önceki sayfanın son satırıdır (keyset).
+        """
+        ...
+
+    def stream(
+        self,
+        *,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Mapping[str, Any]]]:
+        """
+        Filtrelenmiş task kolonlarını (id sırasıyla) server-side cursor üzerinden
+        batch_size'lık partiler halinde akıtır (async generator; sabit bellek).
+        """
+        ...
+
+    async def create_many(self, rows: Sequence[Dict[str, Any]]) -> List[Task]:
+        """
+        Çok satırlı INSERT, tek transaction. rows: create() argümanlarıyla aynı anahtarlar.
+        Task'ler rows sırasıyla döner.
+        """
+        ...
+
+    async def update_many(self, changes: Dict[int, Dict[str, Any]]) -> Dict[int, Task]:
+        """
+        {task_id: {alan: değer}} güncellemelerini tek transaction'da uygular (version +1).
+        Bulunamayan id'ler sonuçta yer almaz (servis per-item 404'e çevirir).
+        """
         ...
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sqlalchemy.engine import Dialect
+
+# Tek round-trip yazma yolu için dialect yetenekleri.
+# INSERT ... RETURNING / UPDATE ... RETURNING ile yazılan satır aynı ifadeyle geri
+# okunur; commit sonrası refresh (SELECT) ve update öncesi get (SELECT) gerekmez.
+
+
+def supports_returning(dialect: Dialect) -> bool:
+    """Dialect hem INSERT hem UPDATE için RETURNING destekliyor mu? (PG, SQLite >= 3.35)"""
+    return bool(dialect.insert_returning and dialect.update_returning)
+
+
+def enforces_foreign_keys(dialect: Dialect) -> bool:
+    """
+    FK ihlali DB tarafından IntegrityError olarak raporlanır mı?
+    SQLite FK'leri `PRAGMA foreign_keys=ON` olmadan uygulamaz; orada servis
+    assignee kontrolünü ayrı SELECT ile yapmaya devam eder.
+    """
+    return dialect.name != "sqlite"
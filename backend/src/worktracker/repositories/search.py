@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, table
+
+from worktracker.models.task import Task
+
+# Task tam metin araması (GET /tasks/search). Index'ler modelde değil, migration'da
+# tanımlıdır (bkz. alembic/versions/e71b0d4c5a93_task_search_index.py):
+#   - PostgreSQL: tasks.search_vector (GENERATED tsvector, title ağırlığı A, description B) + GIN index
+#   - SQLite: tasks_fts FTS5 external-content tablosu (trigger'larla tasks'a senkron)
+
+_tasks = Task.__table__
+
+# Migration'daki to_tsvector ile aynı olmalı; 'simple' dil bağımsızdır (kök bulma yok)
+TS_CONFIG = "simple"
+
+# SQLite FTS5 tablosu ve bm25 kolon ağırlıkları (title, description)
+FTS_TABLE = "tasks_fts"
+_FTS_WEIGHTS = (2.0, 1.0)
+_fts = table(FTS_TABLE, column("rowid"))
+
+# Aramada dönen kolonlar (TaskRead alanları) + "rank"
+_SEARCH_COLUMNS = ("id", "title", "description", "status", "assignee_id", "version")
+
+_WORD = re.compile(r"\w+")
+
+
+class SearchNotSupportedError(Exception):
+    """Dialect için tam metin index'i tanımlı değil (sadece PostgreSQL ve SQLite)."""
+    pass
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Sorguyu kelimelere ayırır; noktalama ve operatörler atılır (kullanıcı girdisi
+    tsquery/FTS5 sözdizimine hiç girmez). Tüm kelimeler eşleşmelidir (AND).
+    """
+    return _WORD.findall(query)
+
+
+def search_statement(
+    dialect: str,
+    terms: Sequence[str],
+    *,
+    limit: int,
+    after: Optional[Tuple[float, int]] = None,
+):
+    """
+    Eşleşen task'ler, rank azalan + id artan sırayla (rank büyük = daha alakalı).
+    after=(rank, id): keyset paginasyon, bir önceki sayfanın son satırı.
+    """
+    if dialect == "postgresql":
+        vector = literal_column("tasks.search_vector")
+        tsquery = func.plainto_tsquery(TS_CONFIG, " ".join(terms))
+        rank = func.ts_rank(vector, tsquery)
+        stmt = select(*(_tasks.c[name] for name in _SEARCH_COLUMNS)).where(vector.op("@@")(tsquery))
+    elif dialect == "sqlite":
+        fts = literal_column(FTS_TABLE)
+        # bm25 küçük = daha alakalı; işaret çevrilir ki iki dialect'te de büyük = iyi olsun
+        rank = -func.bm25(fts, *_FTS_WEIGHTS)
+        match = " ".join(f'"{term}"' for term in terms)
+        stmt = (
+            select(*(_tasks.c[name] for name in _SEARCH_COLUMNS))
+            .select_from(_tasks.join(_fts, _fts.c.rowid == _tasks.c.id))
+            .where(fts.op("MATCH")(match))
+        )
+    else:
+        raise SearchNotSupportedError(f"Full-text search is not supported on {dialect}")
+
+    if after is not None:
+        after_rank, after_id = after
+        stmt = stmt.where(or_(rank < after_rank, and_(rank == after_rank, _tasks.c.id > after_id)))
+    # ORDER BY etiketi kullanır: rank satır başına bir kez hesaplanır
+    ranked = rank.label("rank")
+    return stmt.add_columns(ranked).order_by(ranked.desc(), _tasks.c.id).limit(limit)
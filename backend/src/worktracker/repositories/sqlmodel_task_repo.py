@@ -1,22 +1,40 @@
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, List
+from sqlalchemy import insert, update
 from sqlmodel import Session, select
 
 from worktracker.models.task import Task, TaskStatus
-from worktracker.repositories.ports import TaskRepositoryPort
+from worktracker.repositories.ports import TaskRepositoryPort, VersionMismatchError
+from worktracker.repositories.changes import record_statements
+from worktracker.repositories.counters import (
+    COUNTED_FIELDS,
+    CountKey,
+    adjust_statements,
+    count_deltas,
+    counted_state_statement,
+)
+from worktracker.repositories.returning import enforces_foreign_keys, supports_returning
 
 class SQLModelTaskRepository(TaskRepositoryPort):
     """
     Task veri erişimi için SQLModel/PostgreSQL implementasyonu.
     - Sadece DB CRUD yapar.
-    - commit/refresh ile kalıcı nesneyi döndürür.
+    - RETURNING destekleyen DB'lerde her yazma tek ifade + tek commit'tir
+      (INSERT/UPDATE ... RETURNING); desteklemeyenlerde commit/refresh'e düşer.
     - Bulunamayan kayıtta update() ValueError atar (service 404'a çevirir).
     - FK/UNIQUE/NULL ihlallerinde IntegrityError doğal olarak fırlar (service map eder).
     """
 
     def __init__(self, session: Session) -> None:
         self.session = session
+        dialect = session.get_bind().dialect
+        self._returning = supports_returning(dialect)
+        self._dialect = dialect.name
+        # True ise service assignee'yi ayrıca SELECT ile doğrulamaz (FK ihlali -> IntegrityError)
+        self.enforces_assignee_fk = enforces_foreign_keys(dialect)
+        # Son update'in eski (assignee_id, status) halleri (bkz. TaskRepositoryPort)
+        self.previous_state: Dict[int, CountKey] = {}
 
     def create(
         self,
@@ -26,6 +44,20 @@ class SQLModelTaskRepository(TaskRepositoryPort):
         status: TaskStatus = TaskStatus.TODO,
         assignee_id: Optional[int] = None,
     ) -> Task:
+        if self._returning:
+            # Core INSERT model default'unu uygulamaz; status None gelebilir
+            stmt = insert(Task).values(
+                title=title,
+                description=description,
+                status=status if status is not None else TaskStatus.TODO,
+                assignee_id=assignee_id,
+            ).returning(Task)
+            task = self.session.exec(stmt).scalar_one()  # INSERT ... RETURNING
+            self._record_changes([task.id], created=True)
+            self._count((), [(task.assignee_id, task.status)])
+            self.session.commit()
+            return task
+
         task = Task(
             title=title,
             description=description,
@@ -33,16 +65,47 @@ class SQLModelTaskRepository(TaskRepositoryPort):
             assignee_id=assignee_id,
         )
         self.session.add(task)
-        self.session.commit()        # INSERT
+        self.session.flush()         # INSERT (id için)
+        self._record_changes([task.id], created=True)
+        self._count((), [(task.assignee_id, task.status)])
+        self.session.commit()
         self.session.refresh(task)   # DB'nin son halini (id dahil) yükle
         return task
 
+    def _record_changes(self, task_ids: List[int], *, created: bool) -> None:
+        # Değişiklik günlüğü task yazmasıyla aynı transaction'da (bkz. repositories/changes.py)
+        for stmt in record_statements(task_ids, created=created, dialect=self._dialect):
+            self.session.exec(stmt)
+
+    def _count(self, before: Iterable[CountKey], after: Iterable[CountKey]) -> None:
+        # (assignee, status) sayaçları da aynı transaction'da (bkz. repositories/counters.py)
+        deltas = count_deltas(before, after)
+        for stmt in adjust_statements(deltas, dialect=self._dialect):
+            self.session.exec(stmt)
+
     def get_by_id(self, task_id: int) -> Optional[Task]:
         return self.session.get(Task, task_id)
 
-    def list(self) -> List[Task]:
-        # Basit listeleme (ileride filtre/paginasyon eklenebilir)
-        stmt = select(Task)  # istersen .order_by(Task.id.desc()) ekleyebilirsin
+    def list(
+        self,
+        *,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> List[Task]:
+        # Keyset paginasyon: OFFSET yerine "id > son görülen id" kullanıyoruz,
+        # böylece sayfa maliyeti ne kadar derine inilirse inilsin sabit kalır (PK index).
+        stmt = select(Task)
+        if after_id is not None:
+            stmt = stmt.where(Task.id > after_id)
+        if status is not None:
+            stmt = stmt.where(Task.status == status)
+        if assignee_id is not None:
+            stmt = stmt.where(Task.assignee_id == assignee_id)
+        stmt = stmt.order_by(Task.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
         return list(self.session.exec(stmt))
 
     def update(
@@ -53,10 +116,26 @@ class SQLModelTaskRepository(TaskRepositoryPort):
         description: Optional[str] = None,
         status: Optional[TaskStatus] = None,
         assignee_id: Optional[int] = None,
+        expected_version: Optional[int] = None,
     ) -> Task:
-        task = self.session.get(Task, task_id)
+        if self._returning:
+            return self._update_returning(
+                task_id,
+                expected_version,
+                title=title,
+                description=description,
+                status=status,
+                assignee_id=assignee_id,
+            )
+
+        # FOR UPDATE + taze okuma: sayaç farkı satırın gerçek eski halinden hesaplansın
+        task = self.session.get(Task, task_id, with_for_update=True, populate_existing=True)
         if not task:
             raise ValueError("Task not found")
+        if expected_version is not None and task.version != expected_version:
+            raise VersionMismatchError("Task version mismatch")
+        before = (task.assignee_id, task.status)
+        self.previous_state = {task_id: before}
 
         if title is not None:
             task.title = title
@@ -66,8 +145,50 @@ class SQLModelTaskRepository(TaskRepositoryPort):
             task.status = status
         if assignee_id is not None:
             task.assignee_id = assignee_id
+        task.version += 1
 
         self.session.add(task)
+        self._record_changes([task.id], created=False)
+        self._count([before], [(task.assignee_id, task.status)])
         self.session.commit()        # UPDATE
         self.session.refresh(task)
         return task
+
+    def _update_returning(
+        self, task_id: int, expected_version: Optional[int], **fields: Any
+    ) -> Task:
+        self.previous_state = {}
+        values: Dict[str, Any] = {k: v for k, v in fields.items() if v is not None}
+        if not values:
+            # Değişecek alan yok: yazma yok (sürüm de artmaz), sadece mevcut hali döndür
+            task = self.session.get(Task, task_id)
+            if not task:
+                raise ValueError("Task not found")
+            if expected_version is not None and task.version != expected_version:
+                raise VersionMismatchError("Task version mismatch")
+            return task
+
+        before: List[CountKey] = []
+        if COUNTED_FIELDS & values.keys():
+            # status/assignee değişiyor: sayaç farkı için eski hal (satır kilitlenir)
+            before = list(self.session.exec(counted_state_statement([task_id])))
+
+        stmt = update(Task).where(Task.id == task_id)
+        if expected_version is not None:
+            # If-Match: koşullu UPDATE, kontrol ve yazma tek ifadede (yarış yok)
+            stmt = stmt.where(Task.version == expected_version)
+        stmt = stmt.values(**values, version=Task.version + 1).returning(Task)
+        task = self.session.exec(stmt).scalar_one_or_none()  # UPDATE ... RETURNING
+        if task is None:
+            self.session.rollback()
+            # Satır yok mu, yoksa sürüm mü tutmadı? (sadece hata yolunda ek SELECT)
+            if expected_version is not None and self.session.get(Task, task_id) is not None:
+                raise VersionMismatchError("Task version mismatch")
+            raise ValueError("Task not found")
+        self._record_changes([task.id], created=False)
+        # Sayılan alan değişmiyorsa eski hal yeni halle aynıdır (ayrıca okunmaz)
+        self.previous_state = {task.id: tuple(before[0])} if before else {}
+        if before:
+            self._count(before, [(task.assignee_id, task.status)])
+        self.session.commit()
+        return task
@@ -1,24 +1,34 @@
 from __future__ import annotations
 
 from typing import Optional
+from sqlalchemy import insert, update
 from sqlmodel import Session
 
 from worktracker.models.user import User
-from worktracker.repositories.ports import UserRepositoryPort
+from worktracker.repositories.ports import UserRepositoryPort, VersionMismatchError
+from worktracker.repositories.returning import supports_returning
 
 class SQLModelUserRepository(UserRepositoryPort):
     """
     User veri erişimi için SQLModel/PostgreSQL implementasyonu.
     - Sadece DB CRUD yapar.
-    - commit/refresh ile kalıcı nesneyi döndürür.
+    - RETURNING destekleyen DB'lerde her yazma tek ifade + tek commit'tir;
+      desteklemeyenlerde commit/refresh ile kalıcı nesneyi döndürür.
     - Bulunamayan kayıtta update() ValueError atar (service 404'a çevirir).
     - UNIQUE ihlalinde (email) IntegrityError yukarı fırlar (service 409'a çevirir).
     """
 
     def __init__(self, session: Session) -> None:
         self.session = session
+        self._returning = supports_returning(session.get_bind().dialect)
 
     def create(self, *, email: str, full_name: Optional[str] = None) -> User:
+        if self._returning:
+            stmt = insert(User).values(email=email, full_name=full_name).returning(User)
+            user = self.session.exec(stmt).scalar_one()  # INSERT ... RETURNING
+            self.session.commit()
+            return user
+
         user = User(email=email, full_name=full_name)
         self.session.add(user)
         self.session.commit()       # INSERT
@@ -34,16 +44,40 @@ class SQLModelUserRepository(UserRepositoryPort):
         *,
         email: Optional[str] = None,
         full_name: Optional[str] = None,
+        expected_version: Optional[int] = None,
     ) -> User:
+        values = {
+            k: v for k, v in (("email", email), ("full_name", full_name)) if v is not None
+        }
+        if self._returning and values:
+            stmt = update(User).where(User.id == user_id)
+            if expected_version is not None:
+                # If-Match: koşullu UPDATE (kontrol + yazma tek ifade)
+                stmt = stmt.where(User.version == expected_version)
+            stmt = stmt.values(**values, version=User.version + 1).returning(User)
+            user = self.session.exec(stmt).scalar_one_or_none()  # UPDATE ... RETURNING
+            if user is None:
+                self.session.rollback()
+                if expected_version is not None and self.session.get(User, user_id) is not None:
+                    raise VersionMismatchError("User version mismatch")
+                raise ValueError("User not found")
+            self.session.commit()
+            return user
+
         user = self.session.get(User, user_id)
         if not user:
             # Service katmanı NotFoundError'a çevirir
             raise ValueError("User not found")
+        if expected_version is not None and user.version != expected_version:
+            raise VersionMismatchError("User version mismatch")
+        if not values:
+            return user  # değişecek alan yok: yazma yok, sürüm artmaz
 
         if email is not None:
             user.email = email
         if full_name is not None:
             user.full_name = full_name
+        user.version += 1
 
         self.session.add(user)
         self.session.commit()       # UPDATE
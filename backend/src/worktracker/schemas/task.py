@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import Field, constr
+from typing import Dict, Optional, List
+from pydantic import Field, TypeAdapter, constr
 from sqlmodel import SQLModel
 
 from worktracker.models.task import TaskStatus
@@ -28,6 +28,44 @@ class TaskRead(SQLModel):
     description: Optional[str] = None
     status: TaskStatus
     assignee_id: Optional[int] = None
+    # Satır sürümü (ETag'in kaynağı; PATCH'te If-Match ile geri gönderilebilir)
+    version: int
+
+class TaskPage(SQLModel):
+    # Keyset paginasyonlu liste cevabı
+    items: List[TaskRead]
+    # Sonraki sayfa için opak cursor; son sayfadaysak None
+    next_cursor: Optional[str] = None
+
+class TaskChangesPage(SQLModel):
+    # GET /tasks/changes cevabı: since'ten sonra değişen task'lerin güncel hali (cursor sırasıyla)
+    items: List[TaskRead]
+    # Bir sonraki istekte since olarak gönderilecek değer (değişiklik yoksa since'in kendisi)
+    cursor: int
+    # True ise limit doldu; hemen cursor ile tekrar isteyin
+    has_more: bool = False
+
+class TaskSearchHit(TaskRead):
+    # Alaka skoru (büyük = daha alakalı); ölçeği DB'ye göre değişir, sadece sıralama içindir
+    rank: float
+
+class TaskSearchPage(SQLModel):
+    # GET /tasks/search cevabı: rank azalan sırayla, keyset paginasyonlu
+    items: List[TaskSearchHit]
+    next_cursor: Optional[str] = None
+
+class TaskAssigneeStats(SQLModel):
+    # None: atanmamış task'ler
+    assignee_id: Optional[int] = None
+    by_status: Dict[TaskStatus, int]
+    total: int
+
+class TaskStats(SQLModel):
+    # GET /tasks/stats cevabı: sayaç tablosundan (tasks taranmaz)
+    total: int
+    by_status: Dict[TaskStatus, int]
+    # Sadece en az bir task'i olan assignee'ler, assignee_id sırasıyla (atanmamışlar başta)
+    by_assignee: List[TaskAssigneeStats]
 
 class TaskUpdate(SQLModel):
     # title opsiyonel: gönderilirse biçim doğrulansın
@@ -36,3 +74,34 @@ class TaskUpdate(SQLModel):
     description: constr(strip_whitespace=True, min_length=1) | None = None  # type: ignore
     status: Optional[TaskStatus] = None
     assignee_id: Optional[int] = None
+
+# Toplu isteklerde tek seferde kabul edilen en fazla kayıt
+MAX_BATCH_ITEMS = 500
+
+class TaskBatchCreate(SQLModel):
+    items: List[TaskCreate] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+class TaskBatchUpdateItem(TaskUpdate):
+    # Hangi task güncellenecek (diğer alanlar TaskUpdate ile aynı kurallar)
+    id: int
+
+class TaskBatchUpdate(SQLModel):
+    items: List[TaskBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+class TaskBatchItemResult(SQLModel):
+    # İstekteki sıra (0'dan başlar); ok=False ise error dolu, task None
+    index: int
+    ok: bool
+    task: Optional[TaskRead] = None
+    error: Optional[str] = None
+
+class TaskBatchResult(SQLModel):
+    results: List[TaskBatchItemResult]
+
+# Okuma fast path'i için önceden kurulmuş adapter'lar (kurulumları pahalı; modül yüklenirken bir kez).
+# Router cevabı doğrudan bu adapter'larla JSON bytes'a çevirir; sözleşme yine TaskRead/TaskPage.
+TASK_READ_ADAPTER = TypeAdapter(TaskRead)
+TASK_PAGE_ADAPTER = TypeAdapter(TaskPage)
+TASK_CHANGES_ADAPTER = TypeAdapter(TaskChangesPage)
+TASK_STATS_ADAPTER = TypeAdapter(TaskStats)
+TASK_SEARCH_ADAPTER = TypeAdapter(TaskSearchPage)
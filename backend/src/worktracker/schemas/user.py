@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import EmailStr
+from pydantic import EmailStr, TypeAdapter
 from sqlmodel import SQLModel
 
 class UserCreate(SQLModel):
@@ -11,8 +11,13 @@ class UserRead(SQLModel):
     id: int
     email: str
     full_name: Optional[str] = None
+    # Satır sürümü (ETag'in kaynağı; PATCH'te If-Match ile geri gönderilebilir)
+    version: int
 
 class UserUpdate(SQLModel):
     # PATCH için her alan opsiyonel (kısmi güncelleme)
     email: EmailStr | None = None
     full_name: Optional[str] = None
+
+# Okuma fast path'i: router UserRead'i bu adapter ile tek seferde JSON bytes'a çevirir
+USER_READ_ADAPTER = TypeAdapter(UserRead)
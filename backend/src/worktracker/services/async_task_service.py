@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+from typing import Optional, Any, AsyncIterator, Dict, List, Set
+from sqlalchemy.exc import IntegrityError
+
+from worktracker.models.task import TaskStatus
+from worktracker.repositories.counters import UNASSIGNED
+from worktracker.repositories.ports import (
+    AsyncTaskRepositoryPort,
+    AsyncUserRepositoryPort,
+    VersionMismatchError,
+)
+from worktracker.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchItemResult,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskPage,
+    TaskRead,
+    TaskSearchPage,
+    TaskStats,
+    TaskUpdate,
+    TaskChangesPage,
+    TASK_CHANGES_ADAPTER,
+    TASK_PAGE_ADAPTER,
+    TASK_SEARCH_ADAPTER,
+    TASK_STATS_ADAPTER,
+)
+from worktracker.services.etag import (
+    NotModifiedError,
+    PreconditionFailedError,
+    entity_etag,
+    if_match_version,
+    if_none_match as etag_matches,
+    page_etag,
+)
+from worktracker.services.export import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_CSV,
+    EXPORT_FORMATS,
+    csv_chunk,
+    csv_header,
+    ndjson_chunk,
+)
+from worktracker.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+# Router'lar aynı domain hatalarını yakalasın diye sync servisteki sınıfları kullanıyoruz
+from worktracker.services.task_service import NotFoundError, AssigneeNotFoundError
+
+
+# Toplu yazmada tek WS event'indeki en fazla task: MAX_BATCH_ITEMS'lık bir istek birden çok
+# event'e bölünür, her biri Postgres backplane'in NOTIFY sınırının (8000 byte) rahatça altında
+# kalır (50 task: id'ler + en kötü durumda task başına ayrı assignee/status konuları ~4 KB)
+WS_EVENT_MAX_TASKS = 50
+
+
+class AsyncTaskService:
+    """
+    TaskService'in async karşılığı (aynı iş kuralları, aynı domain hataları).
+    - Repository'ler AsyncSession üzerinde çalışır; istek threadpool'a düşmez.
+    - ws_publisher event loop içinde olduğumuz için doğrudan await edilir
+      (anyio.from_thread.run köprüsüne gerek yok). Beklenen imzalar:
+        await ws.publish_task_created_async(task_id: int, assignee_id: int | None, status=...)
+        await ws.publish_task_updated_async(task_id: int, *, assignee_id=..., status=...,
+                                            previous_assignee_id=..., previous_status=...)
+      (assignee_id/status konu aboneliklerinin eşlenmesi için; previous_* yazma öncesi hal)
+    """
+
+    def __init__(
+        self,
+        task_repo: AsyncTaskRepositoryPort,
+        user_repo: AsyncUserRepositoryPort,
+        *,
+        ws_publisher: Optional[Any] = None,
+    ) -> None:
+        self.task_repo = task_repo
+        self.user_repo = user_repo
+        self.ws = ws_publisher
+
+    # -------- helpers --------
+    def _norm_str(self, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return None
+        s = v.strip()
+        return s or None
+
+    async def _ensure_assignee_exists(self, assignee_id: Optional[int]) -> None:
+        if assignee_id is None:
+            return
+        if await self.user_repo.get_by_id(assignee_id) is None:
+            raise AssigneeNotFoundError("Assignee user not found")
+
+    async def _check_assignee_for_write(self, assignee_id: Optional[int]) -> None:
+        # FK'yi DB uyguluyorsa ayrı SELECT yok: yazma tek ifadedir, ihlal
+        # IntegrityError -> AssigneeNotFoundError olarak döner
+        if getattr(self.task_repo, "enforces_assignee_fk", False):
+            return
+        await self._ensure_assignee_exists(assignee_id)
+
+    async def _existing_assignees(self, assignee_ids: Set[int]) -> Set[int]:
+        # Toplu isteklerde tüm assignee'ler tek IN sorgusuyla doğrulanır
+        if not assignee_ids:
+            return set()
+        return await self.user_repo.existing_ids(assignee_ids)
+
+    def _previous_state(self, task: Any) -> tuple:
+        # Repository'nin update öncesi okuduğu (assignee_id, status); yoksa değişmemiştir
+        previous = getattr(self.task_repo, "previous_state", {})
+        return previous.get(task.id, (task.assignee_id, task.status))
+
+    async def _publish_batch(self, kind: str, tasks: List[Any]) -> None:
+        if not self.ws or not tasks:
+            return
+        for start in range(0, len(tasks), WS_EVENT_MAX_TASKS):
+            chunk = tasks[start:start + WS_EVENT_MAX_TASKS]
+            refs = [(t.id, t.assignee_id, t.status) for t in chunk]
+            try:
+                if kind == "created":
+                    await self.ws.publish_tasks_created_async(refs)
+                else:
+                    previous = [(t.id, *self._previous_state(t)) for t in chunk]
+                    await self.ws.publish_tasks_updated_async(refs, previous)
+            except Exception:
+                pass
+
+    # -------- API (ports) --------
+    async def create(self, data: TaskCreate) -> TaskRead:
+        title = self._norm_str(data.title) or ""  # title zorunlu
+        description = self._norm_str(data.description)
+        status = data.status
+        assignee_id = data.assignee_id
+
+        await self._check_assignee_for_write(assignee_id)
+
+        try:
+            task = await self.task_repo.create(
+                title=title,
+                description=description,
+                status=status,
+                assignee_id=assignee_id,
+            )
+        except IntegrityError as e:
+            raise AssigneeNotFoundError("Assignee user not found") from e
+
+        if self.ws:
+            try:
+                await self.ws.publish_task_created_async(
+                    task.id, assignee_id=task.assignee_id, status=task.status
+                )
+            except Exception:
+                # Event yayınında hata olsa bile ana akışı bozmayalım
+                pass
+
+        return TaskRead.model_validate(task, from_attributes=True)
+
+    async def get(self, task_id: int, *, if_none_match: Optional[str] = None) -> TaskRead:
+        task = await self.task_repo.get_by_id(task_id)
+        if not task:
+            raise NotFoundError("Task not found")
+        # Değişmediyse TaskRead kurmadan 304 (router gövdesiz döner)
+        etag = entity_etag("task", task.id, task.version)
+        if etag_matches(if_none_match, etag):
+            raise NotModifiedError(etag)
+        return TaskRead.model_validate(task, from_attributes=True)
+
+    async def list(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+    ) -> TaskPage:
+        after_id = decode_cursor(cursor)
+
+        # Bir fazlasını çekiyoruz: gelirse bir sonraki sayfa var demektir.
+        # Fast path: ORM entity yerine sadece kolonlar (mapping) gelir.
+        rows = await self.task_repo.list_rows(
+            limit=limit + 1,
+            after_id=after_id,
+            status=status,
+            assignee_id=assignee_id,
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if if_none_match:
+            etag = page_etag(((r["id"], r["version"]) for r in rows), has_more)
+            if etag_matches(if_none_match, etag):
+                raise NotModifiedError(etag)
+
+        next_cursor = encode_cursor(rows[-1]["id"]) if has_more else None
+        # Tüm sayfa tek pydantic-core çağrısıyla doğrulanır (satır başına from_attributes yok)
+        return TASK_PAGE_ADAPTER.validate_python({"items": rows, "next_cursor": next_cursor})
+
+    async def list_by_assignee(
+        self,
+        assignee_id: int,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        if_none_match: Optional[str] = None,
+    ) -> TaskPage:
+        await self._ensure_assignee_exists(assignee_id)
+        return await self.list(
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            assignee_id=assignee_id,
+            if_none_match=if_none_match,
+        )
+
+    async def changes(self, since: int = 0, *, limit: int = DEFAULT_PAGE_SIZE) -> TaskChangesPage:
+        """
+        Artımlı değişiklik akışı: since'ten sonra oluşturulan/güncellenen task'ler.
+        İstemci dönen cursor'u saklar ve bir sonraki istekte since olarak gönderir;
+        since=0 tüm task'leri (her biri bir kez) döner.
+        Aynı transaction'da yazılan değişiklikler aynı konumu paylaşır ve sayfalara
+        bölünmez: limit'ten büyük tek bir toplu yazma tek sayfada döner.
+        """
+        rows = await self.task_repo.changes_since(since, limit=limit + 1)
+        has_more = len(rows) > limit
+        if has_more:
+            # Sayfa, bir sonraki satırın transaction'ının ortasında bitmesin
+            boundary = rows[limit]["position"]
+            rows = [r for r in rows[:limit] if r["position"] != boundary] or [
+                r for r in rows if r["position"] == boundary
+            ]
+        cursor = rows[-1]["position"] if rows else since
+        return TASK_CHANGES_ADAPTER.validate_python(
+            {"items": rows, "cursor": cursor, "has_more": has_more}
+        )
+
+    async def search(
+        self, q: str, *, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> TaskSearchPage:
+        """
+        title/description üzerinde tam metin araması (tüm kelimeler eşleşmeli), alakaya göre
+        sıralı. Cursor sayfanın son (rank, id) çiftidir; list() gibi bir fazlası çekilir.
+        """
+        after = decode_rank_cursor(cursor)
+        rows = await self.task_repo.search(q, limit=limit + 1, after=after)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1]["rank"], rows[-1]["id"]) if has_more else None
+        return TASK_SEARCH_ADAPTER.validate_python({"items": rows, "next_cursor": next_cursor})
+
+    async def stats(self, *, assignee_id: Optional[int] = None) -> TaskStats:
+        """
+        Status ve assignee başına task sayıları. Sayaç tablosundan okunur: maliyet
+        task sayısıyla değil, (assignee, status) çifti sayısıyla orantılıdır.
+        """
+        rows = await self.task_repo.counters(assignee_id=assignee_id)
+        by_status = dict.fromkeys(TaskStatus, 0)
+        per_assignee: Dict[int, Dict[TaskStatus, int]] = {}
+        for row in rows:
+            status = TaskStatus(row["status"])
+            counts = per_assignee.setdefault(row["assignee_key"], dict.fromkeys(TaskStatus, 0))
+            counts[status] += row["count"]
+            by_status[status] += row["count"]
+        return TASK_STATS_ADAPTER.validate_python(
+            {
+                "total": sum(by_status.values()),
+                "by_status": by_status,
+                "by_assignee": [
+                    {
+                        "assignee_id": None if key == UNASSIGNED else key,
+                        "by_status": counts,
+                        "total": sum(counts.values()),
+                    }
+                    for key, counts in per_assignee.items()
+                ],
+            }
+        )
+
+    async def export(
+        self,
+        fmt: str,
+        *,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Filtrelenmiş tüm task'leri parti parti encode edip üretir (StreamingResponse gövdesi).
+        Bellekte her an en fazla bir parti (EXPORT_BATCH_SIZE satır) durur; TaskRead kurulmaz.
+        Filtreler list() ile aynıdır.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        encode = csv_chunk if fmt == EXPORT_CSV else ndjson_chunk
+        if fmt == EXPORT_CSV:
+            yield csv_header()
+        async for rows in self.task_repo.stream(
+            status=status, assignee_id=assignee_id, batch_size=EXPORT_BATCH_SIZE
+        ):
+            yield encode(rows)
+
+    async def update(
+        self, task_id: int, data: TaskUpdate, *, if_match: Optional[str] = None
+    ) -> TaskRead:
+        # If-Match: beklenen sürüm UPDATE'in WHERE'ine girer (ayrı okuma yok)
+        expected_version = if_match_version(if_match, "task", task_id)
+        # None gönderilmişse (assignee kaldırma) validasyona gerek yok
+        if data.assignee_id is not None:
+            await self._check_assignee_for_write(data.assignee_id)
+
+        try:
+            task = await self.task_repo.update(
+                task_id,
+                title=self._norm_str(data.title) if data.title is not None else None,
+                description=self._norm_str(data.description) if data.description is not None else None,
+                status=data.status,
+                assignee_id=data.assignee_id,
+                expected_version=expected_version,
+            )
+        except VersionMismatchError as e:
+            raise PreconditionFailedError("Task version mismatch") from e
+        except ValueError:
+            raise NotFoundError("Task not found")
+        except IntegrityError as e:
+            raise AssigneeNotFoundError("Assignee user not found") from e
+
+        if self.ws:
+            try:
+                previous_assignee_id, previous_status = self._previous_state(task)
+                await self.ws.publish_task_updated_async(
+                    task.id,
+                    assignee_id=task.assignee_id,
+                    status=task.status,
+                    previous_assignee_id=previous_assignee_id,
+                    previous_status=previous_status,
+                )
+            except Exception:
+                pass
+
+        return TaskRead.model_validate(task, from_attributes=True)
+
+    async def create_many(self, data: TaskBatchCreate) -> TaskBatchResult:
+        """
+        Toplu oluşturma: assignee'ler tek sorguda doğrulanır, geçerli kayıtlar tek
+        transaction'da çok satırlı INSERT ile yazılır, toplu WS event'leri (en fazla
+        WS_EVENT_MAX_TASKS task'lik) yayınlanır.
+        Geçersiz kalemler sonuçta per-item hata olarak döner; diğerlerini engellemez.
+        """
+        items = data.items
+        existing = await self._existing_assignees(
+            {i.assignee_id for i in items if i.assignee_id is not None}
+        )
+
+        results: Dict[int, TaskBatchItemResult] = {}
+        rows: List[Dict[str, Any]] = []
+        positions: List[int] = []
+        for idx, item in enumerate(items):
+            if item.assignee_id is not None and item.assignee_id not in existing:
+                results[idx] = TaskBatchItemResult(index=idx, ok=False, error="Assignee user not found")
+                continue
+            rows.append(
+                {
+                    "title": self._norm_str(item.title) or "",
+                    "description": self._norm_str(item.description),
+                    "status": item.status or TaskStatus.TODO,
+                    "assignee_id": item.assignee_id,
+                }
+            )
+            positions.append(idx)
+
+        tasks = []
+        if rows:
+            try:
+                tasks = await self.task_repo.create_many(rows)
+            except IntegrityError as e:
+                # Doğrulama ile yazma arasında kullanıcı silindiyse: transaction bütünüyle geri döner
+                raise AssigneeNotFoundError("Assignee user not found") from e
+
+        for idx, task in zip(positions, tasks):
+            results[idx] = TaskBatchItemResult(
+                index=idx, ok=True, task=TaskRead.model_validate(task, from_attributes=True)
+            )
+
+        await self._publish_batch("created", tasks)
+        return TaskBatchResult(results=[results[i] for i in range(len(items))])
+
+    async def update_many(self, data: TaskBatchUpdate) -> TaskBatchResult:
+        """
+        Toplu güncelleme: assignee'ler tek sorguda doğrulanır, task'ler tek SELECT ile
+        yüklenip tek transaction'da güncellenir, toplu WS event'leri (en fazla
+        WS_EVENT_MAX_TASKS task'lik) yayınlanır.
+        """
+        items = data.items
+        existing = await self._existing_assignees(
+            {i.assignee_id for i in items if i.assignee_id is not None}
+        )
+
+        results: Dict[int, TaskBatchItemResult] = {}
+        changes: Dict[int, Dict[str, Any]] = {}
+        positions: Dict[int, int] = {}  # task_id -> istekteki sıra
+        for idx, item in enumerate(items):
+            if item.id in positions:
+                results[idx] = TaskBatchItemResult(index=idx, ok=False, error="Duplicate task id in batch")
+                continue
+            if item.assignee_id is not None and item.assignee_id not in existing:
+                results[idx] = TaskBatchItemResult(index=idx, ok=False, error="Assignee user not found")
+                continue
+            positions[item.id] = idx
+            changes[item.id] = {
+                "title": self._norm_str(item.title) if item.title is not None else None,
+                "description": self._norm_str(item.description) if item.description is not None else None,
+                "status": item.status,
+                "assignee_id": item.assignee_id,
+            }
+
+        updated = {}
+        if changes:
+            try:
+                updated = await self.task_repo.update_many(changes)
+            except IntegrityError as e:
+                raise AssigneeNotFoundError("Assignee user not found") from e
+
+        for task_id, idx in positions.items():
+            task = updated.get(task_id)
+            if task is None:
+                results[idx] = TaskBatchItemResult(index=idx, ok=False, error="Task not found")
+            else:
+                results[idx] = TaskBatchItemResult(
+                    index=idx, ok=True, task=TaskRead.model_validate(task, from_attributes=True)
+                )
+
+        await self._publish_batch("updated", list(updated.values()))
+        return TaskBatchResult(results=[results[i] for i in range(len(items))])
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Optional, Any
+from sqlalchemy.exc import IntegrityError
+
+from worktracker.repositories.ports import AsyncUserRepositoryPort, VersionMismatchError
+from worktracker.schemas.user import UserCreate, UserRead, UserUpdate
+from worktracker.services.etag import (
+    NotModifiedError,
+    PreconditionFailedError,
+    entity_etag,
+    if_match_version,
+    if_none_match as etag_matches,
+)
+# Router'lar aynı domain hatalarını yakalasın diye sync servisteki sınıfları kullanıyoruz
+from worktracker.services.user_service import NotFoundError, DuplicateEmailError
+
+
+class AsyncUserService:
+    """
+    UserService'in async karşılığı (aynı normalizasyon, aynı domain hataları).
+    ws_publisher event loop içinde doğrudan await edilir.
+    """
+
+    def __init__(
+        self,
+        user_repo: AsyncUserRepositoryPort,
+        *,
+        ws_publisher: Optional[Any] = None,
+    ) -> None:
+        self.user_repo = user_repo
+        self.ws = ws_publisher
+
+    # --- Normalizasyon yardımcıları ---
+    def _norm_email(self, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return None
+        s = v.strip().lower()
+        return s or None
+
+    def _norm_name(self, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return None
+        s = v.strip()
+        return s or None
+
+    # --- İşlevler ---
+    async def create(self, data: UserCreate) -> UserRead:
+        email = self._norm_email(str(data.email))
+        full_name = self._norm_name(data.full_name)
+
+        try:
+            user = await self.user_repo.create(email=email, full_name=full_name)
+        except IntegrityError as e:
+            raise DuplicateEmailError("Email already exists") from e
+
+        if self.ws:
+            try:
+                await self.ws.publish_user_created_async(user.id)
+            except Exception:
+                pass
+
+        return UserRead.model_validate(user, from_attributes=True)
+
+    async def get(self, user_id: int, *, if_none_match: Optional[str] = None) -> UserRead:
+        user = await self.user_repo.get_by_id(user_id)
+        if not user:
+            raise NotFoundError("User not found")
+        etag = entity_etag("user", user.id, user.version)
+        if etag_matches(if_none_match, etag):
+            raise NotModifiedError(etag)
+        return UserRead.model_validate(user, from_attributes=True)
+
+    async def update(
+        self, user_id: int, data: UserUpdate, *, if_match: Optional[str] = None
+    ) -> UserRead:
+        expected_version = if_match_version(if_match, "user", user_id)
+        email = self._norm_email(str(data.email)) if data.email is not None else None
+        full_name = self._norm_name(data.full_name) if data.full_name is not None else None
+
+        try:
+            user = await self.user_repo.update(
+                user_id,
+                email=email,
+                full_name=full_name,
+                expected_version=expected_version,
+            )
+        except VersionMismatchError as e:
+            raise PreconditionFailedError("User version mismatch") from e
+        except ValueError:
+            raise NotFoundError("User not found")
+        except IntegrityError as e:
+            raise DuplicateEmailError("Email already exists") from e
+
+        if self.ws:
+            try:
+                await self.ws.publish_user_updated_async(user.id)
+            except Exception:
+                pass
+
+        return UserRead.model_validate(user, from_attributes=True)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+
+class NotModifiedError(Exception):
+    """If-None-Match güncel ETag ile eşleşti (router gövdesiz 304'e çevirir)."""
+
+    def __init__(self, etag: str) -> None:
+        super().__init__("Not modified")
+        self.etag = etag
+
+
+class PreconditionFailedError(Exception):
+    """If-Match'teki sürüm kaydın güncel sürümü değil (router 412'ye çevirir)."""
+    pass
+
+
+def entity_etag(kind: str, entity_id: int, version: int) -> str:
+    """Tekil kaynak için strong ETag: satır sürümünden türetilir, gövde hash'lenmez."""
+    return f'"{kind}-{entity_id}-v{version}"'
+
+
+def page_etag(rows: Iterable[Tuple[int, int]], has_more: bool) -> str:
+    """
+    Liste sayfası için strong ETag: sayfadaki (id, version) çiftleri + sonraki sayfa
+    var mı bilgisi. Satır sürümleri kayıt başına tutulduğundan max(version)/count
+    tek başına yetmez (farklı satırların güncellemesi aynı özeti verebilir).
+    """
+    h = hashlib.blake2b(digest_size=12)
+    for entity_id, version in rows:
+        h.update(f"{entity_id}:{version},".encode())
+    h.update(b"more" if has_more else b"last")
+    return f'"page-{h.hexdigest()}"'
+
+
+def _tags(header: str) -> list[str]:
+    return [t.strip() for t in header.split(",") if t.strip()]
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """If-None-Match eşleşiyor mu? (zayıf karşılaştırma: W/ öneki yok sayılır)"""
+    if not header:
+        return False
+    for tag in _tags(header):
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def if_match_version(header: Optional[str], kind: str, entity_id: int) -> Optional[int]:
+    """
+    If-Match başlığından beklenen sürümü çıkarır (None -> koşulsuz yazma).
+    Kabul edilenler: bu kaydın ETag'i ("task-5-v3") ya da çıplak sürüm (3 / "3").
+    "*" kaydın var olmasını ister, sürüm kontrolü yoktur. Zayıf ETag'ler ve başka
+    kayda ait ETag'ler hiçbir sürümle eşleşmez (412).
+    """
+    if not header:
+        return None
+    tags = _tags(header)
+    if "*" in tags:
+        return None
+    prefix = f"{kind}-{entity_id}-v"
+    for tag in tags:
+        if tag.startswith("W/"):
+            continue
+        value = tag.strip('"')
+        if value.startswith(prefix):
+            value = value[len(prefix):]
+        if value.isdigit():
+            return int(value)
+    raise PreconditionFailedError("Precondition failed")
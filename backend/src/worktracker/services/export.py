@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Iterable, Mapping
+
+# Desteklenen export biçimleri -> (media type, dosya uzantısı)
+EXPORT_NDJSON = "ndjson"
+EXPORT_CSV = "csv"
+EXPORT_FORMATS = {
+    EXPORT_NDJSON: ("application/x-ndjson", "ndjson"),
+    EXPORT_CSV: ("text/csv; charset=utf-8", "csv"),
+}
+
+# Sunucu taraflı cursor'dan tek seferde çekilen satır (ve gönderilen chunk başına satır) sayısı
+EXPORT_BATCH_SIZE = 1000
+
+# Çıktıdaki kolon sırası (TaskRead alanlarıyla aynı)
+EXPORT_FIELDS = ("id", "title", "description", "status", "assignee_id", "version")
+
+
+def _plain(value: Any) -> Any:
+    # Enum (TaskStatus) -> düz değer
+    return getattr(value, "value", value)
+
+
+def ndjson_chunk(rows: Iterable[Mapping[str, Any]]) -> str:
+    """Bir parti satırı NDJSON'a çevirir (satır başına bir JSON nesnesi, boşluksuz ayraçlarla)."""
+    return "".join(
+        json.dumps(
+            {f: _plain(row[f]) for f in EXPORT_FIELDS}, ensure_ascii=False, separators=(",", ":")
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+def csv_header() -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(EXPORT_FIELDS)
+    return buf.getvalue()
+
+
+def csv_chunk(rows: Iterable[Mapping[str, Any]]) -> str:
+    """Bir parti satırı CSV'ye çevirir (None -> boş hücre)."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(["" if row[f] is None else _plain(row[f]) for f in EXPORT_FIELDS])
+    return buf.getvalue()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from typing import Optional, Tuple
+
+# Sayfa boyutu sınırları (router Query doğrulaması da bunları kullanır)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(Exception):
+    """İstemcinin gönderdiği cursor çözülemediğinde fırlatılır (router 400'e çevirir)."""
+    pass
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Keyset cursor üretir: sayfanın son satırının id'si.
+    İstemci için opak olsun diye base64url ile sarıyoruz.
+    """
+    raw = f"id:{last_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """encode_cursor'ın tersi. Cursor yoksa None döner (ilk sayfa)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(value)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def encode_rank_cursor(rank: float, last_id: int) -> str:
+    """
+    Sıralı (arama) sonuçları için keyset cursor: sayfanın son satırının rank'i ve id'si.
+    repr float'ı kayıpsız taşır (bir sonraki sayfanın WHERE'inde birebir karşılaştırılır).
+    """
+    raw = f"rank:{rank!r}:{last_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    """encode_rank_cursor'ın tersi. Cursor yoksa None döner (ilk sayfa)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        prefix, rank, last_id = raw.split(":")
+        if prefix != "rank":
+            raise ValueError(raw)
+        return float(rank), int(last_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable, List
+from typing import AsyncIterator, Protocol, runtime_checkable, Optional
 
-from worktracker.schemas.task import TaskCreate, TaskRead, TaskUpdate
+from worktracker.models.task import TaskStatus
+from worktracker.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchResult,
+    TaskBatchUpdate,
+    TaskChangesPage,
+    TaskCreate,
+    TaskPage,
+    TaskRead,
+    TaskSearchPage,
+    TaskStats,
+    TaskUpdate,
+)
 from worktracker.schemas.user import UserCreate, UserRead, UserUpdate
 
 
@@ -27,5 +39,84 @@ class TaskServicePort(Protocol):
 
     def create(self, data: TaskCreate) -> TaskRead: ...
     def get(self, task_id: int) -> TaskRead: ...
-    def list(self) -> List[TaskRead]: ...
-    def update(self, task_id: int, data: TaskUpdate) -> TaskRead: ...
\ No newline at end of file
+    def list(
+        self,
+        *,
+        limit: int = ...,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> TaskPage: ...
+    def list_by_assignee(
+        self,
+        assignee_id: int,
+        *,
+        limit: int = ...,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+    ) -> TaskPage: ...
+    def update(self, task_id: int, data: TaskUpdate) -> TaskRead: ...
+
+@runtime_checkable
+class AsyncUserServicePort(Protocol):
+    """UserServicePort'un async karşılığı (async router'lar buna bağımlıdır)."""
+
+    async def create(self, data: UserCreate) -> UserRead: ...
+    async def get(self, user_id: int, *, if_none_match: Optional[str] = None) -> UserRead:
+        """if_none_match güncel ETag ile eşleşirse NotModifiedError."""
+        ...
+    async def update(
+        self, user_id: int, data: UserUpdate, *, if_match: Optional[str] = None
+    ) -> UserRead:
+        """if_match sürümü tutmazsa PreconditionFailedError."""
+        ...
+
+@runtime_checkable
+class AsyncTaskServicePort(Protocol):
+    """TaskServicePort'un async karşılığı (async router'lar buna bağımlıdır)."""
+
+    async def create(self, data: TaskCreate) -> TaskRead: ...
+    async def get(self, task_id: int, *, if_none_match: Optional[str] = None) -> TaskRead:
+        """if_none_match güncel ETag ile eşleşirse NotModifiedError."""
+        ...
+    async def list(
+        self,
+        *,
+        limit: int = ...,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+    ) -> TaskPage: ...
+    async def list_by_assignee(
+        self,
+        assignee_id: int,
+        *,
+        limit: int = ...,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        if_none_match: Optional[str] = None,
+    ) -> TaskPage: ...
+    async def update(
+        self, task_id: int, data: TaskUpdate, *, if_match: Optional[str] = None
+    ) -> TaskRead:
+        """if_match sürümü tutmazsa PreconditionFailedError."""
+        ...
+    async def changes(self, since: int = 0, *, limit: int = ...) -> TaskChangesPage: ...
+    async def stats(self, *, assignee_id: Optional[int] = None) -> TaskStats: ...
+    async def search(
+        self, q: str, *, limit: int = ..., cursor: Optional[str] = None
+    ) -> TaskSearchPage:
+        """Tam metin araması; cursor çözülemezse InvalidCursorError."""
+        ...
+    def export(
+        self,
+        fmt: str,
+        *,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """Filtrelenmiş task'leri ndjson/csv parçaları olarak akıtır (async generator)."""
+        ...
+    async def create_many(self, data: TaskBatchCreate) -> TaskBatchResult: ...
+    async def update_many(self, data: TaskBatchUpdate) -> TaskBatchResult: ...
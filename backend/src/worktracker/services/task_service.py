@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional, Any, List
+from typing import Optional, Any
 from sqlalchemy.exc import IntegrityError
 
+from worktracker.models.task import TaskStatus
 from worktracker.repositories.ports import TaskRepositoryPort, UserRepositoryPort
-from worktracker.schemas.task import TaskCreate, TaskRead, TaskUpdate
+from worktracker.schemas.task import TaskCreate, TaskPage, TaskRead, TaskUpdate
+from worktracker.services.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
 
 
 
@@ -25,8 +27,9 @@ class TaskService:
     - assignee doğrulaması servis katmanında yapılır.
     - ws_publisher; WebSocketHub benzeri bir nesne olmalı.
       Beklenen imzalar (senin tasarımına göre):
-        ws.publish_task_created(task_id: int, assignee_id: int | None) -> None
-        ws.publish_task_updated(task_id: int) -> None
+        ws.publish_task_created(task_id: int, assignee_id: int | None, status=...) -> None
+        ws.publish_task_updated(task_id: int, *, assignee_id=..., status=...,
+                                previous_assignee_id=..., previous_status=...) -> None
     """
 
     def __init__(
@@ -53,6 +56,13 @@ class TaskService:
         if self.user_repo.get_by_id(assignee_id) is None:
             raise AssigneeNotFoundError("Assignee user not found")
 
+    def _check_assignee_for_write(self, assignee_id: Optional[int]) -> None:
+        # FK'yi DB uyguluyorsa ayrı SELECT yok: yazma tek ifadedir, ihlal
+        # IntegrityError -> AssigneeNotFoundError olarak döner
+        if getattr(self.task_repo, "enforces_assignee_fk", False):
+            return
+        self._ensure_assignee_exists(assignee_id)
+
     # -------- API (ports) --------
     def create(self, data: TaskCreate) -> TaskRead:
         # Temizlik
@@ -62,7 +72,7 @@ class TaskService:
         assignee_id = data.assignee_id
 
         # İş kuralı: assignee var mı?
-        self._ensure_assignee_exists(assignee_id)
+        self._check_assignee_for_write(assignee_id)
 
         try:
             task = self.task_repo.create(
@@ -78,7 +88,9 @@ class TaskService:
         # WS publish (async tetiklemeyi hub içinde hallediyoruz)
         if self.ws:
             try:
-                self.ws.publish_task_created(task.id, assignee_id=task.assignee_id)
+                self.ws.publish_task_created(
+                    task.id, assignee_id=task.assignee_id, status=task.status
+                )
             except Exception:
                 # Event yayınında hata olsa bile ana akışı bozmayalım
                 pass
@@ -91,16 +103,50 @@ class TaskService:
             raise NotFoundError("Task not found")
         return TaskRead.model_validate(task, from_attributes=True)
 
-    def list(self) -> List[TaskRead]:
-        tasks = self.task_repo.list()
-        return [TaskRead.model_validate(t, from_attributes=True) for t in tasks]
+    def list(
+        self,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        assignee_id: Optional[int] = None,
+    ) -> TaskPage:
+        # Geçersiz cursor -> InvalidCursorError (router 400'e çevirir)
+        after_id = decode_cursor(cursor)
+
+        # Bir fazlasını çekiyoruz: gelirse bir sonraki sayfa var demektir
+        tasks = self.task_repo.list(
+            limit=limit + 1,
+            after_id=after_id,
+            status=status,
+            assignee_id=assignee_id,
+        )
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+
+        items = [TaskRead.model_validate(t, from_attributes=True) for t in tasks]
+        next_cursor = encode_cursor(tasks[-1].id) if has_more else None
+        return TaskPage(items=items, next_cursor=next_cursor)
+
+    def list_by_assignee(
+        self,
+        assignee_id: int,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+    ) -> TaskPage:
+        # Kullanıcı yoksa boş sayfa yerine AssigneeNotFoundError (router 404'e çevirir)
+        self._ensure_assignee_exists(assignee_id)
+        # (assignee_id, id) / (assignee_id, status, id) index'leri bu sorguyu karşılar
+        return self.list(limit=limit, cursor=cursor, status=status, assignee_id=assignee_id)
 
     def update(self, task_id: int, data: TaskUpdate) -> TaskRead:
         # assignee_id alanı gönderildiyse validasyon yap
         if data.assignee_id is not None:
             # None gönderilmişse (assignee kaldırma) validasyona gerek yok
             if data.assignee_id is not None:
-                self._ensure_assignee_exists(data.assignee_id)
+                self._check_assignee_for_write(data.assignee_id)
 
         try:
             task = self.task_repo.update(
@@ -118,7 +164,18 @@ class TaskService:
 
         if self.ws:
             try:
-                self.ws.publish_task_updated(task.id)
+                # Yazma öncesi hal: event eski assignee/status konularına da gitsin
+                previous = getattr(self.task_repo, "previous_state", {})
+                previous_assignee_id, previous_status = previous.get(
+                    task.id, (task.assignee_id, task.status)
+                )
+                self.ws.publish_task_updated(
+                    task.id,
+                    assignee_id=task.assignee_id,
+                    status=task.status,
+                    previous_assignee_id=previous_assignee_id,
+                    previous_status=previous_status,
+                )
             except Exception:
                 pass
 
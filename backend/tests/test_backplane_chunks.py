@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+from worktracker.realtime.backplane import (
+    MAX_CHUNKS,
+    MAX_NOTIFY_PAYLOAD,
+    ChunkAssembler,
+    PayloadTooLargeError,
+    encode_notifications,
+)
+from worktracker.realtime.events import HubEvent
+
+# NOTIFY sınırını aşan event'lerin parçalanıp dinleyicide geri birleştirilmesi.
+
+
+def _event(size: int) -> HubEvent:
+    return HubEvent(
+        payload={"type": "tasks_created", "title": "x" * size},
+        rooms=(1, 2),
+        topics=("task:1", "assignee:2"),
+    )
+
+
+def test_small_event_is_a_single_plain_message():
+    messages = encode_notifications(_event(10))
+    assert len(messages) == 1
+    assert json.loads(messages[0])["payload"]["title"] == "x" * 10
+
+
+def test_chunks_respect_payload_limit_and_reassemble():
+    event = _event(3 * MAX_NOTIFY_PAYLOAD)
+    messages = encode_notifications(event)
+    assert len(messages) > 1
+    assert all(len(m.encode()) <= MAX_NOTIFY_PAYLOAD for m in messages)
+
+    assembler = ChunkAssembler()
+    results = [assembler.feed(m) for m in messages]
+    assert results[:-1] == [None] * (len(messages) - 1)
+    assert results[-1].payload == event.payload
+    assert results[-1].rooms == event.rooms
+    assert results[-1].topics == event.topics
+    assert results[-1].relayed
+
+
+def test_out_of_order_and_duplicate_chunks_reassemble():
+    event = _event(5 * MAX_NOTIFY_PAYLOAD)
+    messages = encode_notifications(event)
+    shuffled = messages[:]
+    random.Random(7).shuffle(shuffled)
+    # Tekrar gelen parça eksik parçanın yerini tutmamalı
+    shuffled.insert(1, shuffled[0])
+
+    assembler = ChunkAssembler()
+    results = [assembler.feed(m) for m in shuffled]
+    completed = [r for r in results if r is not None]
+    assert len(completed) == 1
+    assert completed[0].payload == event.payload
+    assert results[-1] is not None
+
+
+def test_interleaved_messages_reassemble_independently():
+    first, second = _event(2 * MAX_NOTIFY_PAYLOAD), _event(2 * MAX_NOTIFY_PAYLOAD + 1)
+    a, b = encode_notifications(first), encode_notifications(second)
+    assembler = ChunkAssembler()
+    interleaved = [m for pair in zip(a, b) for m in pair]
+    completed = [r for r in map(assembler.feed, interleaved) if r is not None]
+    assert [e.payload for e in completed] == [first.payload, second.payload]
+
+
+def test_event_beyond_max_chunks_is_rejected():
+    with pytest.raises(PayloadTooLargeError):
+        encode_notifications(_event(MAX_CHUNKS * MAX_NOTIFY_PAYLOAD))
+
+
+def test_incomplete_messages_are_bounded():
+    assembler = ChunkAssembler(max_pending=2)
+    for _ in range(3):
+        assert assembler.feed(encode_notifications(_event(2 * MAX_NOTIFY_PAYLOAD))[0]) is None
+    assert len(assembler._pending) == 2
+
+
+@pytest.mark.parametrize("header", ["3 3", "-1 3", "0 0", f"0 {MAX_CHUNKS + 1}"])
+def test_chunk_with_invalid_index_or_total_is_rejected(header):
+    assembler = ChunkAssembler()
+    with pytest.raises(ValueError):
+        assembler.feed(f"#{'a' * 32} {header} {{}}")
+    assert not assembler._pending
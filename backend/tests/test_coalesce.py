@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from worktracker.realtime.events import HubEvent, coalesce
+
+# Batch penceresindeki *_updated tekrarlarının sadeleştirilmesi.
+
+
+def _updated(task_id: int, title: str, rooms=(), topics=()) -> HubEvent:
+    return HubEvent(
+        payload={"type": "task_updated", "task_id": task_id, "title": title},
+        rooms=tuple(rooms),
+        topics=tuple(topics),
+    )
+
+
+def test_repeated_updates_keep_only_the_last_in_its_position():
+    created = HubEvent(payload={"type": "task_created", "task_id": 1})
+    events = [
+        _updated(1, "a"),
+        created,
+        _updated(2, "x"),
+        _updated(1, "b"),
+        _updated(1, "c"),
+    ]
+    result = coalesce(events)
+    assert [e.payload for e in result] == [
+        created.payload,
+        {"type": "task_updated", "task_id": 2, "title": "x"},
+        {"type": "task_updated", "task_id": 1, "title": "c"},
+    ]
+
+
+def test_other_event_types_are_never_merged():
+    events = [
+        HubEvent(payload={"type": "task_deleted", "task_id": 1}),
+        HubEvent(payload={"type": "task_deleted", "task_id": 1}),
+    ]
+    assert coalesce(events) == events
+
+
+def test_users_and_tasks_with_same_id_are_distinct():
+    task = _updated(1, "a")
+    user = HubEvent(payload={"type": "user_updated", "user_id": 1})
+    assert coalesce([task, user]) == [task, user]
+
+
+def test_dropped_update_targets_are_kept():
+    # İlk güncellemede 1 -> 2'ye atanan task'in eski sahibi sonraki güncellemede hedeflenmez
+    events = [
+        _updated(1, "a", rooms=(1, 2), topics=("task:1", "assignee:1", "assignee:2")),
+        _updated(1, "b", rooms=(2,), topics=("task:1", "assignee:2")),
+    ]
+    (merged,) = coalesce(events)
+    assert merged.payload["title"] == "b"
+    assert set(merged.rooms) == {1, 2}
+    assert set(merged.topics) == {"task:1", "assignee:1", "assignee:2"}
+
+
+def test_empty_window():
+    assert coalesce([]) == []
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from worktracker.repositories.cache import LRUTTLCache
+
+# LRU + TTL cache: okuma/invalidation yarışı (generation) ve replica okumaları (write_hold).
+
+
+def test_put_with_stale_generation_is_dropped():
+    cache = LRUTTLCache()
+    generation = cache.generation
+    # DB okuması sürerken yazma oldu
+    cache.invalidate([1])
+    cache.put(1, {"v": "old"}, generation=generation)
+    assert cache.get(1) is None
+
+    cache.put(1, {"v": "new"}, generation=cache.generation)
+    assert cache.get(1) == {"v": "new"}
+
+
+def test_clear_also_invalidates_in_flight_reads():
+    cache = LRUTTLCache()
+    generation = cache.generation
+    cache.clear()
+    cache.put(1, {"v": "old"}, generation=generation)
+    assert len(cache) == 0
+
+
+def test_lagging_read_is_not_cached_during_write_hold(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUTTLCache(write_hold=2.0)
+
+    cache.invalidate([1])
+    cache.put(1, {"v": "replica"}, generation=cache.generation, lagging=True)
+    assert cache.get(1) is None
+    assert cache.stats()["held_skips"] == 1
+
+    # Primary'den okuma tutmadan etkilenmez
+    cache.put(1, {"v": "primary"}, generation=cache.generation)
+    assert cache.get(1) == {"v": "primary"}
+
+    # Tutma bitince replica okuması yine cache'lenir; diğer id'ler hiç tutulmaz
+    now[0] += 2.5
+    cache.put(1, {"v": "replica"}, lagging=True)
+    cache.put(2, {"v": "replica"}, lagging=True)
+    assert cache.get(1) == {"v": "replica"}
+    assert cache.get(2) == {"v": "replica"}
+
+
+def test_repeated_invalidation_extends_hold_and_expired_holds_are_pruned(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUTTLCache(write_hold=2.0)
+
+    cache.invalidate([1, 2])
+    now[0] += 1.5
+    cache.invalidate([1])
+    now[0] += 1.0
+    # 2'nin tutması bitti, 1'inki ikinci yazmayla uzadı
+    cache.put(1, {"v": "replica"}, lagging=True)
+    cache.put(2, {"v": "replica"}, lagging=True)
+    assert cache.get(1) is None
+    assert cache.get(2) == {"v": "replica"}
+
+    now[0] += 5.0
+    cache.invalidate([3])
+    assert list(cache._held) == [3]
+
+
+def test_ttl_expiry_and_lru_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUTTLCache(max_size=2, ttl=10.0)
+
+    cache.put(1, {"v": 1})
+    cache.put(2, {"v": 2})
+    cache.get(1)  # 1 en son okunan: taşmada 2 atılır
+    cache.put(3, {"v": 3})
+    assert cache.get(2) is None
+    assert cache.get(1) == {"v": 1}
+
+    now[0] += 11.0
+    assert cache.get(1) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_max_size_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUTTLCache(max_size=0)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from worktracker.repositories.async_sqlmodel_task_repo import AsyncSQLModelTaskRepository
+from worktracker.repositories.async_sqlmodel_user_repo import AsyncSQLModelUserRepository
+from worktracker.schemas.task import TaskBatchCreate, TaskCreate, TaskUpdate
+from worktracker.services.async_task_service import AsyncTaskService
+
+# GET /tasks/changes: cursor hiçbir değişikliği atlamamalı, sayfa bir transaction'ı bölmemeli.
+
+
+def _row(position: int, task_id: int) -> Dict[str, Any]:
+    return {
+        "position": position,
+        "id": task_id,
+        "title": f"Is {task_id}",
+        "description": None,
+        "status": "TODO",
+        "assignee_id": None,
+        "version": 1,
+    }
+
+
+class FakeChangesRepo:
+    """PostgreSQL gibi: aynı transaction'ın satırları aynı konumda, transaction bölünmeden döner."""
+
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+
+    async def changes_since(self, since: int, *, limit: int) -> List[Dict[str, Any]]:
+        visible = [r for r in self.rows if r["position"] > since]
+        if len(visible) <= limit:
+            return visible
+        bound = visible[limit - 1]["position"]
+        return [r for r in visible if r["position"] <= bound]
+
+
+def _drain(rows: List[Dict[str, Any]], limit: int) -> List[List[int]]:
+    service = AsyncTaskService(FakeChangesRepo(rows), None)
+
+    async def run() -> List[List[int]]:
+        pages, since = [], 0
+        while True:
+            page = await service.changes(since, limit=limit)
+            pages.append([t.id for t in page.items])
+            since = page.cursor
+            if not page.has_more:
+                return pages
+
+    return asyncio.run(run())
+
+
+def test_page_ends_at_transaction_boundary():
+    # 10: tekil yazma, 20: üç task'lik toplu yazma, 30: tekil yazma
+    rows = [_row(10, 1), _row(20, 2), _row(20, 3), _row(20, 4), _row(30, 5)]
+    assert _drain(rows, limit=2) == [[1], [2, 3, 4], [5]]
+
+
+def test_transaction_larger_than_limit_is_returned_whole():
+    rows = [_row(20, i) for i in range(1, 6)] + [_row(30, 6)]
+    assert _drain(rows, limit=2) == [[1, 2, 3, 4, 5], [6]]
+
+
+async def _run_feed(db_url: str) -> None:
+    engine = create_async_engine(db_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            service = AsyncTaskService(
+                AsyncSQLModelTaskRepository(session), AsyncSQLModelUserRepository(session)
+            )
+            created = await service.create_many(
+                TaskBatchCreate(items=[TaskCreate(title="Toplu is") for _ in range(5)])
+            )
+            ids = [r.task.id for r in created.results]
+
+            first = await service.changes(0, limit=3)
+            assert [t.id for t in first.items] == ids[:3]
+            assert first.has_more
+            rest = await service.changes(first.cursor, limit=3)
+            assert [t.id for t in rest.items] == ids[3:]
+            assert not rest.has_more
+
+            # Güncellenen task sıkıştırılır ve cursor'dan sonra güncel haliyle tekrar görünür
+            await service.update(ids[0], TaskUpdate(title="Yeni ad"))
+            latest = await service.changes(rest.cursor, limit=3)
+            assert [(t.id, t.title) for t in latest.items] == [(ids[0], "Yeni ad")]
+            assert latest.cursor > rest.cursor
+            empty = await service.changes(latest.cursor, limit=3)
+            assert empty.items == [] and empty.cursor == latest.cursor
+    finally:
+        await engine.dispose()
+
+
+def test_changes_feed_on_sqlite(tmp_path):
+    asyncio.run(_run_feed(f"sqlite+aiosqlite:///{tmp_path / 'changes.db'}"))
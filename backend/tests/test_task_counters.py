@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from worktracker.models.task import TaskStatus
+from worktracker.repositories.counters import UNASSIGNED, count_deltas
+
+# Task yazmasının (assignee, status) sayaçlarına etkisi.
+
+
+def test_create_counts_new_state():
+    assert count_deltas((), [(3, TaskStatus.TODO), (None, TaskStatus.TODO)]) == {
+        (3, TaskStatus.TODO): 1,
+        (UNASSIGNED, TaskStatus.TODO): 1,
+    }
+
+
+def test_update_moves_count_between_keys():
+    assert count_deltas([(3, TaskStatus.TODO)], [(4, TaskStatus.DONE)]) == {
+        (3, TaskStatus.TODO): -1,
+        (4, TaskStatus.DONE): 1,
+    }
+
+
+def test_unchanged_state_yields_no_delta():
+    assert count_deltas([(3, "TODO"), (None, "DONE")], [(None, "DONE"), (3, "TODO")]) == {}
+
+
+def test_batch_deltas_are_summed_and_raw_status_values_accepted():
+    before = [(1, "TODO"), (1, "TODO"), (2, "IN_PROGRESS")]
+    after = [(1, "DONE"), (1, "TODO"), (1, "DONE")]
+    assert count_deltas(before, after) == {
+        (1, TaskStatus.TODO): -1,
+        (2, TaskStatus.IN_PROGRESS): -1,
+        (1, TaskStatus.DONE): 2,
+    }
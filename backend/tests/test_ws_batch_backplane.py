@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from worktracker.models.user import User
+from worktracker.realtime.backplane import InMemoryBackplane, InMemoryBus, MAX_NOTIFY_PAYLOAD
+from worktracker.realtime.hub import WebSocketHub
+from worktracker.repositories.async_sqlmodel_task_repo import AsyncSQLModelTaskRepository
+from worktracker.repositories.async_sqlmodel_user_repo import AsyncSQLModelUserRepository
+from worktracker.schemas.task import (
+    MAX_BATCH_ITEMS,
+    TaskBatchCreate,
+    TaskBatchUpdate,
+    TaskBatchUpdateItem,
+    TaskCreate,
+)
+from worktracker.services.async_task_service import AsyncTaskService, WS_EVENT_MAX_TASKS
+
+# 500 kalemlik toplu yazma, NOTIFY boyut sınırı uygulanan backplane üzerinden:
+# her event sınıra sığmalı ve diğer worker'ın soketi tüm task'leri almalı.
+
+
+class RecordingSocket:
+    """hub.connect_public'in beklediği kadar WebSocket; gelen frame'leri biriktirir."""
+
+    def __init__(self) -> None:
+        self.scope: Dict[str, Any] = {"type": "websocket", "subprotocols": []}
+        self.frames: List[Dict[str, Any]] = []
+
+    async def accept(self, subprotocol=None) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        self.frames.append(json.loads(data))
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+class SizeCheckingBackplane(InMemoryBackplane):
+    """Postgres gibi max_payload'a göre parçalar; parçalanmadan gitmeyen event'i sayar."""
+
+    def __init__(self, bus: InMemoryBus) -> None:
+        super().__init__(bus, max_payload=MAX_NOTIFY_PAYLOAD)
+        self.events = 0
+
+    async def publish(self, event) -> None:
+        self.events += 1
+        await super().publish(event)
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "timed out waiting for hub"
+        await asyncio.sleep(0.01)
+
+
+async def _run_batch(db_url: str) -> None:
+    engine = create_async_engine(db_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    bus = InMemoryBus()
+    publisher = SizeCheckingBackplane(bus)
+    # İki "worker": yazma birinde olur, soket diğerine bağlıdır
+    writer_hub = WebSocketHub(backplane=publisher, batch_window=0)
+    reader_hub = WebSocketHub(backplane=InMemoryBackplane(bus), batch_window=0)
+    await writer_hub.start()
+    await reader_hub.start()
+    socket = RecordingSocket()
+    await reader_hub.connect_public(socket)
+
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add_all(
+                [User(email=f"user{i}@example.com", full_name=f"User {i}") for i in range(MAX_BATCH_ITEMS)]
+            )
+            await session.commit()
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            service = AsyncTaskService(
+                AsyncSQLModelTaskRepository(session),
+                AsyncSQLModelUserRepository(session),
+                ws_publisher=writer_hub,
+            )
+            # Her task ayrı assignee'de: konu listesi en kötü durumda
+            created = await service.create_many(
+                TaskBatchCreate(
+                    items=[TaskCreate(title="Toplu is", assignee_id=i + 1) for i in range(MAX_BATCH_ITEMS)]
+                )
+            )
+            task_ids = [r.task.id for r in created.results]
+            await service.update_many(
+                TaskBatchUpdate(
+                    items=[
+                        TaskBatchUpdateItem(id=task_id, assignee_id=MAX_BATCH_ITEMS - i)
+                        for i, task_id in enumerate(task_ids)
+                    ]
+                )
+            )
+
+        def received(kind: str) -> List[int]:
+            return [i for f in socket.frames if f["type"] == kind for i in f["task_ids"]]
+
+        await _wait_for(lambda: len(received("tasks_updated")) == MAX_BATCH_ITEMS)
+        assert sorted(received("tasks_created")) == sorted(task_ids)
+        assert sorted(received("tasks_updated")) == sorted(task_ids)
+
+        expected_events = 2 * -(-MAX_BATCH_ITEMS // WS_EVENT_MAX_TASKS)
+        assert publisher.events == expected_events
+        # Her event tek NOTIFY'a sığdı (parçalama gerekmedi)
+        assert publisher.messages_sent == expected_events
+        assert writer_hub.stats()["backplane_failures"] == 0
+    finally:
+        await reader_hub.stop()
+        await writer_hub.stop()
+        await engine.dispose()
+
+
+def test_batch_of_max_items_reaches_other_worker_within_notify_limit(tmp_path):
+    asyncio.run(_run_batch(f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}"))
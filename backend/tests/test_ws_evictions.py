@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from worktracker.realtime.hub import WebSocketHub
+
+# Gönderimi başarısız olan soket hub'dan çıkarılır, kapatılır ve sayılır.
+
+
+class FailingSocket:
+    def __init__(self) -> None:
+        self.scope: Dict[str, Any] = {"type": "websocket", "subprotocols": []}
+        self.closed_with: Optional[int] = None
+
+    async def accept(self, subprotocol=None) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        raise RuntimeError("connection reset")
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "timed out waiting for hub"
+        await asyncio.sleep(0.01)
+
+
+async def _run() -> None:
+    hub = WebSocketHub(batch_window=0)
+    await hub.start()
+    try:
+        socket = FailingSocket()
+        await hub.connect_public(socket)
+        await hub.publish_task_created_async(1, None)
+        await _wait_for(lambda: hub.stats()["dead_evictions"] == 1)
+        stats = hub.stats()
+        assert stats["send_failures"] == 1
+        assert hub.connection_counts()["public"] == 0
+        await _wait_for(lambda: socket.closed_with is not None)
+        assert socket.closed_with == 1011
+        # Sonraki yayın çıkarılmış soketi tekrar saymaz
+        await hub.publish_task_created_async(2, None)
+        await _wait_for(lambda: hub.stats()["dispatched"] == 2)
+        assert hub.stats()["dead_evictions"] == 1
+    finally:
+        await hub.stop()
+
+
+def test_failed_writer_is_evicted_closed_and_counted():
+    asyncio.run(_run())
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from worktracker.realtime.hub import WebSocketHub
+
+# Yeniden bağlanan istemciye kaçırdığı event'lerin (seq/epoch ile) tekrar gönderilmesi.
+
+
+class RecordingSocket:
+    """hub.connect_*'ın beklediği kadar WebSocket; gelen frame'leri biriktirir."""
+
+    def __init__(self) -> None:
+        self.scope: Dict[str, Any] = {"type": "websocket", "subprotocols": []}
+        self.frames: List[Dict[str, Any]] = []
+
+    async def accept(self, subprotocol=None) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        self.frames.append(json.loads(data))
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "timed out waiting for hub"
+        await asyncio.sleep(0.01)
+
+
+async def _published(hub: WebSocketHub, task_ids, *, assignee_id=None) -> None:
+    target = hub.stats()["seq"] + len(task_ids)
+    for task_id in task_ids:
+        await hub.publish_task_created_async(task_id, assignee_id)
+    await _wait_for(lambda: hub.stats()["seq"] == target)
+
+
+def _run(scenario, **hub_options) -> None:
+    async def main() -> None:
+        hub = WebSocketHub(**{"batch_window": 0, **hub_options})
+        await hub.start()
+        try:
+            await scenario(hub)
+        finally:
+            await hub.stop()
+
+    asyncio.run(main())
+
+
+def test_missed_events_are_replayed_in_order():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1, 2, 3, 4])
+        socket = RecordingSocket()
+        await hub.connect_public(socket, last_seq=2, last_epoch=hub.epoch)
+        await _wait_for(lambda: len(socket.frames) == 2)
+        assert [(f["task_id"], f["seq"], f["epoch"]) for f in socket.frames] == [
+            (3, 3, hub.epoch),
+            (4, 4, hub.epoch),
+        ]
+        # Sonraki canlı event replay'den sonra gelir
+        await _published(hub, [5])
+        await _wait_for(lambda: len(socket.frames) == 3)
+        assert socket.frames[-1]["seq"] == 5
+        assert hub.stats()["events_replayed"] == 2
+
+    _run(scenario)
+
+
+def test_up_to_date_client_gets_nothing():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1, 2])
+        socket = RecordingSocket()
+        await hub.connect_public(socket, last_seq=2, last_epoch=hub.epoch)
+        await asyncio.sleep(0.05)
+        assert socket.frames == []
+
+    _run(scenario)
+
+
+def _assert_resync(socket: RecordingSocket, hub: WebSocketHub) -> None:
+    assert socket.frames == [{"type": "resync", "seq": hub.stats()["seq"], "epoch": hub.epoch}]
+
+
+def test_other_or_missing_epoch_resyncs():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1, 2])
+        for epoch in ("baska-bir-worker", None):
+            socket = RecordingSocket()
+            await hub.connect_public(socket, last_seq=1, last_epoch=epoch)
+            await _wait_for(lambda: socket.frames)
+            _assert_resync(socket, hub)
+
+    _run(scenario)
+
+
+def test_gap_older_than_buffer_resyncs():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1, 2, 3, 4, 5])
+        # Buffer'da 3..5 var: 2'den sonrası tam, 1'den sonrası eksik
+        ok = RecordingSocket()
+        await hub.connect_public(ok, last_seq=2, last_epoch=hub.epoch)
+        await _wait_for(lambda: len(ok.frames) == 3)
+        assert [f["seq"] for f in ok.frames] == [3, 4, 5]
+
+        gap = RecordingSocket()
+        await hub.connect_public(gap, last_seq=1, last_epoch=hub.epoch)
+        await _wait_for(lambda: gap.frames)
+        _assert_resync(gap, hub)
+
+    _run(scenario, replay_buffer_size=3)
+
+
+def test_seq_from_the_future_resyncs():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1])
+        socket = RecordingSocket()
+        await hub.connect_public(socket, last_seq=7, last_epoch=hub.epoch)
+        await _wait_for(lambda: socket.frames)
+        _assert_resync(socket, hub)
+
+    _run(scenario)
+
+
+def test_replay_larger_than_client_buffer_resyncs():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1, 2, 3, 4])
+        socket = RecordingSocket()
+        await hub.connect_public(socket, last_seq=0, last_epoch=hub.epoch)
+        await _wait_for(lambda: socket.frames)
+        _assert_resync(socket, hub)
+
+    _run(scenario, client_buffer_size=3)
+
+
+def test_user_room_replays_only_its_events():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1], assignee_id=7)
+        await _published(hub, [2], assignee_id=8)
+        await _published(hub, [3], assignee_id=7)
+        socket = RecordingSocket()
+        await hub.connect_user(7, socket, last_seq=0, last_epoch=hub.epoch)
+        await _wait_for(lambda: len(socket.frames) == 2)
+        assert [f["task_id"] for f in socket.frames] == [1, 3]
+
+    _run(scenario)
+
+
+def test_batched_client_gets_one_batch_frame():
+    async def scenario(hub: WebSocketHub) -> None:
+        await _published(hub, [1, 2, 3])
+        socket = RecordingSocket()
+        await hub.connect_public(socket, batch=True, last_seq=1, last_epoch=hub.epoch)
+        await _wait_for(lambda: socket.frames)
+        assert len(socket.frames) == 1
+        assert socket.frames[0]["type"] == "batch"
+        assert [e["seq"] for e in socket.frames[0]["events"]] == [2, 3]
+
+    # batch_window=0 iken batch isteği yok sayılır
+    _run(scenario, batch_window=0.01)